@@ -0,0 +1,382 @@
+"""
+Rigid-Body Dynamics
+
+Recursive Newton-Euler inverse dynamics for the 6-DOF arm, driven by the
+DH parameters used for kinematics plus per-link inertial parameters.
+"""
+
+import math
+import yaml
+import numpy as np
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+
+from .kinematics import DHParameters, DEFAULT_DH_PARAMS
+
+
+GRAVITY = 9.81  # m/s², along -z of the base frame
+
+
+@dataclass
+class LinkInertia:
+    """Inertial parameters of one link, expressed in its DH frame."""
+    mass: float  # Link mass (kg)
+    com: np.ndarray  # Center of mass in link frame (m)
+    inertia: np.ndarray  # 3x3 inertia tensor about the COM, link-frame axes (kg·m²)
+
+
+# Estimated inertial parameters for the KR150 (to be identified)
+DEFAULT_LINK_INERTIAS = [
+    LinkInertia(250.0, np.array([-0.15, 0.25, 0.0]), np.diag([12.0, 8.0, 12.0])),  # Link 1
+    LinkInertia(200.0, np.array([-0.60, 0.0, 0.10]), np.diag([2.0, 28.0, 28.0])),  # Link 2
+    LinkInertia(150.0, np.array([-0.03, 0.0, 0.25]), np.diag([6.0, 6.0, 2.0])),    # Link 3
+    LinkInertia(50.0, np.array([0.0, -0.35, 0.0]), np.diag([2.5, 0.4, 2.5])),      # Link 4
+    LinkInertia(20.0, np.array([0.0, 0.0, 0.05]), np.diag([0.15, 0.15, 0.1])),     # Link 5
+    LinkInertia(5.0, np.array([0.0, 0.0, -0.02]), np.diag([0.01, 0.01, 0.015])),   # Link 6
+]
+
+
+def load_link_inertias(path: str) -> List[LinkInertia]:
+    """
+    Load per-link inertial parameters from a robot config.
+
+    Args:
+        path: Path to YAML file with a `link_inertias` list of
+            {mass, com, inertia} entries (inertia as a 3x3 nested list)
+
+    Returns:
+        List of LinkInertia
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f)
+
+    return [
+        LinkInertia(
+            mass=float(link["mass"]),
+            com=np.asarray(link["com"], dtype=float),
+            inertia=np.asarray(link["inertia"], dtype=float),
+        )
+        for link in data["link_inertias"]
+    ]
+
+
+class RigidBodyDynamics:
+    """
+    Recursive Newton-Euler (RNEA) inverse dynamics.
+
+    The recursion is written on 3-vector components so that the same code
+    runs on Python floats for a single sample, without allocating arrays,
+    and on (N,) arrays for a batch. The mass matrix is built column by
+    column from unit accelerations at rest. DH lengths are in mm and
+    converted to m; torques are in Nm.
+    """
+
+    def __init__(
+        self,
+        dh_params: Optional[List[DHParameters]] = None,
+        links: Optional[List[LinkInertia]] = None
+    ):
+        """
+        Initialize rigid-body dynamics.
+
+        Args:
+            dh_params: DH parameters for each joint
+            links: Inertial parameters for each link
+        """
+        self.links = links or DEFAULT_LINK_INERTIAS
+        self.payload_mass = 0.0
+        self.payload_com = np.zeros(3)
+        self._payload_inertia = np.zeros((3, 3))
+        self.version = 0
+        self.dh_params = dh_params or DEFAULT_DH_PARAMS
+
+    @property
+    def dh_params(self) -> Tuple[DHParameters, ...]:
+        """DH parameters for each joint (read-only; assign a new list to change)."""
+        return self._dh_params
+
+    @dh_params.setter
+    def dh_params(self, dh_params: List[DHParameters]) -> None:
+        """
+        Replace the DH parameters (e.g. after calibration).
+
+        Rebuilds the per-link geometry constants and bumps `version`.
+        """
+        dh_params = tuple(dh_params)
+        if len(self.links) != len(dh_params):
+            raise ValueError(
+                f"Expected {len(dh_params)} link inertias, got {len(self.links)}"
+            )
+        self._dh_params = dh_params
+        self.num_joints = len(dh_params)
+
+        # Per-link constants as Python floats for the scalar recursion
+        self._geometry = [
+            (
+                dh.theta_offset,
+                math.cos(dh.alpha),
+                math.sin(dh.alpha),
+                (dh.a / 1000.0, dh.d / 1000.0 * math.sin(dh.alpha),
+                 dh.d / 1000.0 * math.cos(dh.alpha)),
+            )
+            for dh in dh_params
+        ]
+        self._update_inertial()
+
+    def set_payload(
+        self,
+        mass: float,
+        com: Optional[np.ndarray] = None,
+        inertia: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Attach a payload rigidly to the last link.
+
+        Bumps `version` so cached torques computed with the previous
+        payload can be detected as stale.
+
+        Args:
+            mass: Payload mass (kg); 0 removes the payload
+            com: Payload COM in the last link's frame (m)
+            inertia: Payload inertia about its COM (kg·m²), point mass if None
+        """
+        self.payload_mass = float(mass)
+        self.payload_com = np.zeros(3) if com is None else np.asarray(com, dtype=float)
+        self._payload_inertia = np.zeros((3, 3)) if inertia is None else np.asarray(inertia)
+        self._update_inertial()
+
+    def _update_inertial(self) -> None:
+        """Rebuild per-link inertial constants, lumping the payload into the last link."""
+        links = list(self.links)
+        if self.payload_mass > 0:
+            links[-1] = _combine_inertia(links[-1], LinkInertia(
+                self.payload_mass, self.payload_com, self._payload_inertia
+            ))
+        self._inertial = [
+            (
+                float(link.mass),
+                tuple(float(c) for c in link.com),
+                tuple(tuple(float(v) for v in row) for row in link.inertia),
+            )
+            for link in links
+        ]
+        # Vector from O_{i-1} to the COM of link i, in frame i
+        self._com_offsets = [
+            (p[0] + r[0], p[1] + r[1], p[2] + r[2])
+            for (_, _, _, p), (_, r, _) in zip(self._geometry, self._inertial)
+        ]
+        self.version += 1
+
+    def inverse_dynamics(
+        self,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        acceleration: np.ndarray,
+        gravity: bool = True,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Joint torques for a motion state: M(q)q̈ + C(q, q̇)q̇ + g(q).
+
+        Args:
+            position: Joint positions (rad)
+            velocity: Joint velocities (rad/s)
+            acceleration: Joint accelerations (rad/s²)
+            gravity: Include gravity torques
+            out: Output buffer of shape (num_joints,). Allocated if None.
+
+        Returns:
+            Joint torques (Nm)
+        """
+        if out is None:
+            out = np.empty(self.num_joints)
+        cos_q, sin_q = self._joint_trig(position.tolist(), math.cos, math.sin)
+        torques = self._rnea(
+            cos_q, sin_q, velocity.tolist(), acceleration.tolist(), GRAVITY if gravity else 0.0
+        )
+        for i, tau in enumerate(torques):
+            out[i] = tau
+        return out
+
+    def gravity_torque(self, position: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Torques holding the arm static against gravity, g(q) (Nm)."""
+        zeros = [0.0] * self.num_joints
+        cos_q, sin_q = self._joint_trig(position.tolist(), math.cos, math.sin)
+        if out is None:
+            out = np.empty(self.num_joints)
+        for i, tau in enumerate(self._rnea(cos_q, sin_q, zeros, zeros, GRAVITY)):
+            out[i] = tau
+        return out
+
+    def coriolis_torque(
+        self,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Coriolis and centrifugal torques, C(q, q̇)q̇ (Nm)."""
+        zeros = [0.0] * self.num_joints
+        cos_q, sin_q = self._joint_trig(position.tolist(), math.cos, math.sin)
+        if out is None:
+            out = np.empty(self.num_joints)
+        for i, tau in enumerate(self._rnea(cos_q, sin_q, velocity.tolist(), zeros, 0.0)):
+            out[i] = tau
+        return out
+
+    def mass_matrix(self, position: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Joint-space mass matrix M(q).
+
+        Args:
+            position: Joint positions (rad)
+            out: Output buffer of shape (num_joints, num_joints). Allocated if None.
+
+        Returns:
+            Symmetric positive-definite mass matrix (kg·m²)
+        """
+        if out is None:
+            out = np.empty((self.num_joints, self.num_joints))
+        cos_q, sin_q = self._joint_trig(position.tolist(), math.cos, math.sin)
+        zeros = [0.0] * self.num_joints
+        # Column j is the torque for unit acceleration of joint j at rest
+        for j in range(self.num_joints):
+            unit = zeros.copy()
+            unit[j] = 1.0
+            for i, tau in enumerate(self._rnea(cos_q, sin_q, zeros, unit, 0.0)):
+                out[i, j] = tau
+        return out
+
+    def inverse_dynamics_batch(
+        self,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        acceleration: np.ndarray,
+        gravity: bool = True
+    ) -> np.ndarray:
+        """
+        Joint torques for many motion states at once.
+
+        Args:
+            position: Joint positions, shape (N, num_joints)
+            velocity: Joint velocities, shape (N, num_joints)
+            acceleration: Joint accelerations, shape (N, num_joints)
+            gravity: Include gravity torques
+
+        Returns:
+            Joint torques, shape (N, num_joints)
+        """
+        position = np.asarray(position, dtype=float)
+        cos_q, sin_q = self._joint_trig(position.T, np.cos, np.sin)
+        torques = self._rnea(
+            cos_q, sin_q,
+            list(np.asarray(velocity, dtype=float).T),
+            list(np.asarray(acceleration, dtype=float).T),
+            GRAVITY if gravity else 0.0,
+        )
+        return np.stack(np.broadcast_arrays(*torques), axis=1)
+
+    def _joint_trig(self, position, cos, sin) -> Tuple[list, list]:
+        """cos/sin of each joint angle including the DH theta offset."""
+        angles = [q + geometry[0] for q, geometry in zip(position, self._geometry)]
+        return [cos(theta) for theta in angles], [sin(theta) for theta in angles]
+
+    def _rnea(self, cos_q: list, sin_q: list, qd: list, qdd: list, g: float) -> list:
+        """
+        Newton-Euler recursion on per-component values.
+
+        Each entry of the inputs is a float or an (N,) array; the outputs
+        follow by broadcasting. The vector algebra is written out per
+        component, which keeps the single-sample path in plain floats.
+
+        Returns:
+            List of joint torques
+        """
+        n = self.num_joints
+        # Base frame at rest, accelerating upwards to model gravity
+        wx = wy = wz = 0.0
+        dwx = dwy = dwz = 0.0
+        ax, ay, az = 0.0, 0.0, g
+
+        rotations, wrenches = [], []
+        for i in range(n):
+            _, ca, sa, (px, py, pz) = self._geometry[i]
+            mass, (rx, ry, rz), inertia = self._inertial[i]
+            (ixx, ixy, ixz), (iyx, iyy, iyz), (izx, izy, izz) = inertia
+            c, s = cos_q[i], sin_q[i]
+            sca, cca, ssa, csa = s * ca, c * ca, s * sa, c * sa
+            rotations.append((c, s, sca, cca, ssa, csa))
+
+            # Parent angular velocity in frame i, plus the joint rate about z_{i-1}
+            tx = c * wx + s * wy
+            ty = -sca * wx + cca * wy + sa * wz
+            tz = ssa * wx - csa * wy + ca * wz
+            zy, zz = sa * qd[i], ca * qd[i]
+            wx, wy, wz = tx, ty + zy, tz + zz
+
+            # Angular acceleration, including the joint-rate spin term
+            ux = c * dwx + s * dwy
+            uy = -sca * dwx + cca * dwy + sa * dwz
+            uz = ssa * dwx - csa * dwy + ca * dwz
+            dwx = ux + ty * zz - tz * zy
+            dwy = uy + sa * qdd[i] - tx * zz
+            dwz = uz + ca * qdd[i] + tx * zy
+
+            # Linear acceleration of the frame origin
+            vx = c * ax + s * ay
+            vy = -sca * ax + cca * ay + sa * az
+            vz = ssa * ax - csa * ay + ca * az
+            cx, cy, cz = wy * pz - wz * py, wz * px - wx * pz, wx * py - wy * px
+            ax = vx + dwy * pz - dwz * py + wy * cz - wz * cy
+            ay = vy + dwz * px - dwx * pz + wz * cx - wx * cz
+            az = vz + dwx * py - dwy * px + wx * cy - wy * cx
+
+            # Inertial force at the COM and moment about it
+            cx, cy, cz = wy * rz - wz * ry, wz * rx - wx * rz, wx * ry - wy * rx
+            fx = mass * (ax + dwy * rz - dwz * ry + wy * cz - wz * cy)
+            fy = mass * (ay + dwz * rx - dwx * rz + wz * cx - wx * cz)
+            fz = mass * (az + dwx * ry - dwy * rx + wx * cy - wy * cx)
+            lx = ixx * wx + ixy * wy + ixz * wz
+            ly = iyx * wx + iyy * wy + iyz * wz
+            lz = izx * wx + izy * wy + izz * wz
+            nx = ixx * dwx + ixy * dwy + ixz * dwz + wy * lz - wz * ly
+            ny = iyx * dwx + iyy * dwy + iyz * dwz + wz * lx - wx * lz
+            nz = izx * dwx + izy * dwy + izz * dwz + wx * ly - wy * lx
+            wrenches.append((fx, fy, fz, nx, ny, nz))
+
+        torques = [0.0] * n
+        fx = fy = fz = 0.0
+        mx = my = mz = 0.0
+        for i in range(n - 1, -1, -1):
+            _, ca, sa, (px, py, pz) = self._geometry[i]
+            ox, oy, oz = self._com_offsets[i]
+            if i + 1 < n:
+                # Child wrench into frame i
+                _, ca1, sa1, _ = self._geometry[i + 1]
+                c, s, sca, cca, ssa, csa = rotations[i + 1]
+                fx, fy, fz = (c * fx - sca * fy + ssa * fz,
+                              s * fx + cca * fy - csa * fz,
+                              sa1 * fy + ca1 * fz)
+                mx, my, mz = (c * mx - sca * my + ssa * mz,
+                              s * mx + cca * my - csa * mz,
+                              sa1 * my + ca1 * mz)
+            lfx, lfy, lfz, lnx, lny, lnz = wrenches[i]
+
+            # Moment about O_{i-1}: child wrench moved from O_i, plus this link
+            mx += py * fz - pz * fy + oy * lfz - oz * lfy + lnx
+            my += pz * fx - px * fz + oz * lfx - ox * lfz + lny
+            mz += px * fy - py * fx + ox * lfy - oy * lfx + lnz
+            fx, fy, fz = fx + lfx, fy + lfy, fz + lfz
+            torques[i] = my * sa + mz * ca
+        return torques
+
+
+def _combine_inertia(a: LinkInertia, b: LinkInertia) -> LinkInertia:
+    """Lump two rigid bodies in the same frame into one (parallel-axis theorem)."""
+    mass = a.mass + b.mass
+    com = (a.mass * np.asarray(a.com) + b.mass * np.asarray(b.com)) / mass
+    inertia = np.zeros((3, 3))
+    for body in (a, b):
+        offset = np.asarray(body.com) - com
+        shift = offset @ offset * np.eye(3) - np.outer(offset, offset)
+        inertia += body.inertia + body.mass * shift
+    return LinkInertia(mass, com, inertia)
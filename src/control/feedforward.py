@@ -4,10 +4,13 @@ Feedforward Compensation
 Implements feedforward compensation for improved trajectory tracking.
 """
 
+import yaml
 import numpy as np
 from typing import Optional
 from dataclasses import dataclass
 
+from .dynamics import RigidBodyDynamics
+
 
 @dataclass
 class DynamicsParams:
@@ -16,6 +19,69 @@ class DynamicsParams:
     friction_coulomb: np.ndarray  # Coulomb friction (Nm)
     friction_viscous: np.ndarray  # Viscous friction (Nm·s/rad)
     gravity_compensation: bool = True
+    friction_static: Optional[np.ndarray] = None  # Breakaway (Stribeck peak) friction (Nm)
+    stribeck_velocity: Optional[np.ndarray] = None  # Stribeck decay velocity (rad/s)
+    friction_smoothing: Optional[float] = None  # tanh transition velocity (rad/s), sign() if None
+
+
+def load_dynamics_params(path: str) -> DynamicsParams:
+    """
+    Load feedforward dynamics parameters from a dynamics.yaml file.
+
+    The shipped config/control/dynamics.yaml has zero friction; identify
+    it with friction_identification.identify_friction and write it back
+    with save_friction_to_config before using friction feedforward.
+
+    Args:
+        path: Path to YAML file with `inertia` and a `friction` section
+
+    Returns:
+        DynamicsParams
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f)
+
+    friction = data["friction"]
+
+    def optional_array(key):
+        return np.asarray(friction[key], dtype=float) if friction.get(key) is not None else None
+
+    return DynamicsParams(
+        inertia=np.asarray(data["inertia"], dtype=float),
+        friction_coulomb=np.asarray(friction["coulomb"], dtype=float),
+        friction_viscous=np.asarray(friction["viscous"], dtype=float),
+        gravity_compensation=data.get("gravity_compensation", True),
+        friction_static=optional_array("static"),
+        stribeck_velocity=optional_array("stribeck_velocity"),
+        friction_smoothing=friction.get("smoothing_velocity"),
+    )
+
+
+def friction_torque(params: DynamicsParams, velocity: np.ndarray) -> np.ndarray:
+    """
+    Friction torque for joint velocities (any leading batch shape).
+
+    τ = (Fc + (Fs - Fc)·exp(-(v/vs)²))·tanh(v/ε) + Fv·v, reducing to the
+    plain Coulomb + viscous model with sign(v) when the Stribeck and
+    smoothing parameters are not set.
+
+    Args:
+        params: Dynamic parameters
+        velocity: Joint velocities (rad/s)
+
+    Returns:
+        Friction torque (Nm), same shape as velocity
+    """
+    if params.friction_smoothing:
+        direction = np.tanh(velocity / params.friction_smoothing)
+    else:
+        direction = np.sign(velocity)
+
+    level = params.friction_coulomb
+    if params.friction_static is not None and params.stribeck_velocity is not None:
+        stribeck = np.exp(-(velocity / params.stribeck_velocity) ** 2)
+        level = level + (params.friction_static - params.friction_coulomb) * stribeck
+    return level * direction + params.friction_viscous * velocity
 
 
 class FeedforwardCompensator:
@@ -26,18 +92,67 @@ class FeedforwardCompensator:
     - Inertia (acceleration feedforward)
     - Friction (velocity feedforward)
     - Gravity (position-dependent)
+
+    With a RigidBodyDynamics model attached, inertia, Coriolis and gravity
+    torques come from full inverse dynamics instead of the per-joint
+    inertia and the simplified gravity model.
+
+    Torque tables precomputed along a trajectory (attach()) are stamped
+    with `cache_key`, which changes whenever the parameters, the payload
+    or the dynamics model change, so stale tables can be recomputed
+    before they reach the control loop.
     """
 
-    def __init__(self, params: DynamicsParams, num_joints: int = 6):
+    def __init__(
+        self,
+        params: DynamicsParams,
+        num_joints: int = 6,
+        dynamics: Optional[RigidBodyDynamics] = None
+    ):
         """
         Initialize feedforward compensator.
 
         Args:
             params: Dynamic parameters
             num_joints: Number of robot joints
+            dynamics: Rigid-body model for inverse dynamics (optional)
         """
+        self._version = 0
         self.params = params
         self.num_joints = num_joints
+        self.dynamics = dynamics
+
+    @property
+    def params(self) -> DynamicsParams:
+        """Dynamic parameters; replacing them invalidates cached torque tables."""
+        return self._params
+
+    @params.setter
+    def params(self, params: DynamicsParams) -> None:
+        self._params = params
+        self.invalidate()
+
+    @property
+    def cache_key(self) -> tuple:
+        """Identifies the model state that precomputed torques were built with."""
+        dynamics_version = self.dynamics.version if self.dynamics is not None else 0
+        return (self._version, dynamics_version)
+
+    def invalidate(self) -> None:
+        """Mark previously precomputed torques stale, e.g. after editing params in place."""
+        self._version += 1
+
+    def set_payload(self, mass: float, com: Optional[np.ndarray] = None) -> None:
+        """
+        Update the payload carried by the rigid-body model.
+
+        Args:
+            mass: Payload mass (kg)
+            com: Payload COM in the flange frame (m)
+        """
+        if self.dynamics is None:
+            raise RuntimeError("Payload compensation requires a dynamics model")
+        self.dynamics.set_payload(mass, com)
 
     def compute(
         self,
@@ -56,16 +171,21 @@ class FeedforwardCompensator:
         Returns:
             Feedforward torque for each joint (Nm)
         """
+        if self.dynamics is not None:
+            # Rigid-body torques: M(q)q̈ + C(q, q̇)q̇ (+ g(q))
+            torque = self.dynamics.inverse_dynamics(
+                position, velocity, acceleration, gravity=self.params.gravity_compensation
+            )
+            torque += friction_torque(self.params, velocity)
+            return torque
+
         torque = np.zeros(self.num_joints)
 
         # Inertia compensation (τ = J * α)
         torque += self.params.inertia * acceleration
 
-        # Friction compensation
-        # Coulomb friction (sign-based)
-        torque += self.params.friction_coulomb * np.sign(velocity)
-        # Viscous friction (linear with velocity)
-        torque += self.params.friction_viscous * velocity
+        # Friction compensation (Coulomb/Stribeck + viscous)
+        torque += friction_torque(self.params, velocity)
 
         # Gravity compensation
         if self.params.gravity_compensation:
@@ -73,31 +193,100 @@ class FeedforwardCompensator:
 
         return torque
 
+    def compute_batch(
+        self,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        acceleration: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute feedforward torque for many samples at once.
+
+        Args:
+            position: Joint positions, shape (N, num_joints)
+            velocity: Joint velocities, shape (N, num_joints)
+            acceleration: Joint accelerations, shape (N, num_joints)
+
+        Returns:
+            Feedforward torques, shape (N, num_joints)
+        """
+        if self.dynamics is not None:
+            torque = self.dynamics.inverse_dynamics_batch(
+                position, velocity, acceleration, gravity=self.params.gravity_compensation
+            )
+        else:
+            torque = self.params.inertia * acceleration
+            if self.params.gravity_compensation:
+                torque += self._compute_gravity_torque(position)
+        torque += friction_torque(self.params, velocity)
+        return torque
+
+    def attach(self, trajectory):
+        """
+        Precompute the feedforward torque table for a planned Trajectory.
+
+        Sets `trajectory.torque` (N, num_joints) and stamps it with
+        `cache_key`.
+
+        Args:
+            trajectory: Trajectory to annotate
+
+        Returns:
+            The same trajectory
+        """
+        trajectory.torque = self.compute_batch(
+            trajectory.position, trajectory.velocity, trajectory.acceleration
+        )
+        trajectory.feedforward_key = self.cache_key
+        return trajectory
+
+    def ensure_current(self, trajectory) -> bool:
+        """
+        Recompute a trajectory's torque table if it is missing or stale.
+
+        Args:
+            trajectory: Trajectory to check
+
+        Returns:
+            True if the table was recomputed
+        """
+        if trajectory.torque is not None and trajectory.feedforward_key == self.cache_key:
+            return False
+        self.attach(trajectory)
+        return True
+
     def _compute_gravity_torque(self, position: np.ndarray) -> np.ndarray:
         """
         Compute gravity compensation torque.
 
-        This is a simplified model. For accurate compensation,
-        use the full robot dynamics model.
+        Uses the rigid-body model when attached; otherwise a simplified
+        model with placeholder link parameters.
 
         Args:
-            position: Joint positions (rad)
+            position: Joint positions (rad), shape (num_joints,) or (N, num_joints)
 
         Returns:
-            Gravity compensation torque (Nm)
+            Gravity compensation torque (Nm), same shape as position
         """
+        if self.dynamics is not None:
+            position = np.asarray(position, dtype=float)
+            if position.ndim == 2:
+                at_rest = np.zeros_like(position)
+                return self.dynamics.inverse_dynamics_batch(position, at_rest, at_rest)
+            return self.dynamics.gravity_torque(position)
+
         # Simplified gravity model (should be replaced with actual model)
         # This assumes a vertical robot with joints 2 and 3 affected by gravity
         g = 9.81  # m/s²
 
-        gravity_torque = np.zeros(self.num_joints)
+        gravity_torque = np.zeros(np.shape(position))
 
         # Joint 2 gravity compensation (simplified)
         # τ₂ = m₂ * g * L₂ * cos(θ₂)
         # Using placeholder values - need actual link masses and lengths
-        gravity_torque[1] = 50.0 * np.cos(position[1])  # Nm
+        gravity_torque[..., 1] = 50.0 * np.cos(position[..., 1])  # Nm
 
         # Joint 3 gravity compensation (simplified)
-        gravity_torque[2] = 30.0 * np.cos(position[1] + position[2])  # Nm
+        gravity_torque[..., 2] = 30.0 * np.cos(position[..., 1] + position[..., 2])  # Nm
 
         return gravity_torque
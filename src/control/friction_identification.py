@@ -0,0 +1,228 @@
+"""
+Friction Identification
+
+Offline fit of joint friction from logged position/velocity/torque data.
+
+Model per joint:
+    τ_f = (Fc + (Fs - Fc)·exp(-(v/vs)²))·tanh(v/ε) + Fv·v
+
+For a fixed Stribeck velocity vs the model is linear in (Fc, Fs - Fc,
+Fv), so identification accumulates least-squares normal equations for a
+grid of vs candidates over any number of logs, solves all (candidate,
+joint) systems in one batch and keeps the best candidate per joint.
+"""
+
+import yaml
+import numpy as np
+from typing import Iterable, Optional, Tuple
+from dataclasses import dataclass, replace
+
+from .dynamics import RigidBodyDynamics
+from .feedforward import DynamicsParams
+
+
+# Candidate Stribeck velocities (rad/s)
+DEFAULT_STRIBECK_VELOCITIES = np.geomspace(0.005, 0.5, 32)
+
+
+@dataclass
+class FrictionFit:
+    """Identified friction parameters per joint."""
+    coulomb: np.ndarray  # Fc (Nm)
+    static: np.ndarray  # Fs, breakaway friction (Nm)
+    viscous: np.ndarray  # Fv (Nm·s/rad)
+    stribeck_velocity: np.ndarray  # vs (rad/s)
+    smoothing_velocity: float  # ε (rad/s)
+    rms_residual: np.ndarray  # RMS torque residual of the fit (Nm)
+    num_samples: int
+
+    def apply(self, params: DynamicsParams) -> DynamicsParams:
+        """Return a copy of `params` with the identified friction."""
+        return replace(
+            params,
+            friction_coulomb=self.coulomb.copy(),
+            friction_viscous=self.viscous.copy(),
+            friction_static=self.static.copy(),
+            stribeck_velocity=self.stribeck_velocity.copy(),
+            friction_smoothing=self.smoothing_velocity,
+        )
+
+
+class FrictionIdentifier:
+    """
+    Batched least-squares friction identification.
+
+    Logs are processed in fixed-size chunks that only update small
+    normal-equation sums, so memory does not grow with log length.
+    """
+
+    def __init__(
+        self,
+        num_joints: int = 6,
+        dynamics: Optional[RigidBodyDynamics] = None,
+        smoothing_velocity: float = 0.01,
+        stribeck_velocities: Optional[np.ndarray] = None,
+        chunk_size: int = 16384
+    ):
+        """
+        Initialize friction identifier.
+
+        Args:
+            num_joints: Number of robot joints
+            dynamics: Rigid-body model whose torques are subtracted from the
+                     logged torque before fitting (None if the logs hold
+                     friction torque only)
+            smoothing_velocity: tanh transition velocity ε (rad/s)
+            stribeck_velocities: Candidate Stribeck velocities (rad/s)
+            chunk_size: Samples processed per batch
+        """
+        self.num_joints = num_joints
+        self.dynamics = dynamics
+        self.smoothing_velocity = smoothing_velocity
+        self.stribeck_velocities = np.asarray(
+            DEFAULT_STRIBECK_VELOCITIES if stribeck_velocities is None else stribeck_velocities,
+            dtype=float,
+        )
+        self.chunk_size = chunk_size
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard accumulated data."""
+        k = len(self.stribeck_velocities)
+        self._normal = np.zeros((k, self.num_joints, 3, 3))  # Σ φφᵀ per candidate and joint
+        self._moment = np.zeros((k, self.num_joints, 3))  # Σ φy
+        self._energy = np.zeros(self.num_joints)  # Σ y²
+        self.num_samples = 0
+
+    def add_log(
+        self,
+        time: np.ndarray,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        torque: np.ndarray
+    ) -> None:
+        """
+        Accumulate one logged run.
+
+        Args:
+            time: Sample times, shape (N,) (s)
+            position: Joint positions, shape (N, num_joints) (rad)
+            velocity: Joint velocities, shape (N, num_joints) (rad/s)
+            torque: Measured joint torques, shape (N, num_joints) (Nm)
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        torque = np.asarray(torque, dtype=float)
+        if self.dynamics is not None:
+            acceleration = np.gradient(velocity, time, axis=0)
+
+        for start in range(0, len(velocity), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            v = velocity[chunk]
+            y = torque[chunk]
+            if self.dynamics is not None:
+                y = y - self.dynamics.inverse_dynamics_batch(
+                    position[chunk], v, acceleration[chunk]
+                )
+            self._accumulate(v, y)
+
+    def solve(self) -> FrictionFit:
+        """
+        Fit the friction model to all accumulated data.
+
+        Returns:
+            Best fit per joint over the Stribeck velocity candidates
+        """
+        if self.num_samples == 0:
+            raise RuntimeError("No data: call add_log() before solve()")
+
+        # Tiny ridge keeps unexcited joints/candidates solvable
+        ridge = 1e-12 * np.trace(self._normal, axis1=2, axis2=3)[..., None, None] * np.eye(3)
+        theta = np.linalg.solve(self._normal + ridge, self._moment[..., None])[..., 0]
+        sse = self._energy - np.sum(theta * self._moment, axis=-1)  # (K, num_joints)
+
+        best = np.argmin(sse, axis=0)
+        joints = np.arange(self.num_joints)
+        coulomb, stribeck_gain, viscous = theta[best, joints].T
+        return FrictionFit(
+            coulomb=coulomb,
+            static=coulomb + stribeck_gain,
+            viscous=viscous,
+            stribeck_velocity=self.stribeck_velocities[best],
+            smoothing_velocity=self.smoothing_velocity,
+            rms_residual=np.sqrt(np.maximum(sse[best, joints], 0.0) / self.num_samples),
+            num_samples=self.num_samples,
+        )
+
+    def _accumulate(self, v: np.ndarray, y: np.ndarray) -> None:
+        """Add one chunk's regressor sums for every Stribeck candidate."""
+        direction = np.tanh(v / self.smoothing_velocity)  # (n, J)
+        vs = self.stribeck_velocities[:, None, None]
+        stribeck = np.exp(-(v / vs) ** 2) * direction  # (K, n, J)
+
+        dd = np.sum(direction * direction, axis=0)
+        dv = np.sum(direction * v, axis=0)
+        vv = np.sum(v * v, axis=0)
+        ds = np.einsum("nj,knj->kj", direction, stribeck)
+        ss = np.einsum("knj,knj->kj", stribeck, stribeck)
+        sv = np.einsum("knj,nj->kj", stribeck, v)
+
+        normal = self._normal
+        normal[:, :, 0, 0] += dd
+        normal[:, :, 0, 1] += ds
+        normal[:, :, 0, 2] += dv
+        normal[:, :, 1, 1] += ss
+        normal[:, :, 1, 2] += sv
+        normal[:, :, 2, 2] += vv
+        normal[:, :, 1, 0] = normal[:, :, 0, 1]
+        normal[:, :, 2, 0] = normal[:, :, 0, 2]
+        normal[:, :, 2, 1] = normal[:, :, 1, 2]
+
+        self._moment[:, :, 0] += np.sum(direction * y, axis=0)
+        self._moment[:, :, 1] += np.einsum("knj,nj->kj", stribeck, y)
+        self._moment[:, :, 2] += np.sum(v * y, axis=0)
+        self._energy += np.sum(y * y, axis=0)
+        self.num_samples += len(v)
+
+
+def identify_friction(
+    logs: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+    **kwargs
+) -> FrictionFit:
+    """
+    Fit friction to a collection of logs.
+
+    Args:
+        logs: Iterable of (time, position, velocity, torque) tuples
+        **kwargs: Passed to FrictionIdentifier
+
+    Returns:
+        FrictionFit
+    """
+    identifier = FrictionIdentifier(**kwargs)
+    for log in logs:
+        identifier.add_log(*log)
+    return identifier.solve()
+
+
+def save_friction_to_config(fit: FrictionFit, path: str) -> None:
+    """
+    Write identified friction into the `friction` section of a dynamics.yaml file.
+
+    Other sections of the file are preserved.
+
+    Args:
+        fit: Identified friction
+        path: Path to dynamics config
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+
+    data["friction"] = {
+        "coulomb": np.round(fit.coulomb, 4).tolist(),
+        "static": np.round(fit.static, 4).tolist(),
+        "viscous": np.round(fit.viscous, 4).tolist(),
+        "stribeck_velocity": np.round(fit.stribeck_velocity, 5).tolist(),
+        "smoothing_velocity": float(fit.smoothing_velocity),
+    }
+    with open(path, "w") as f:
+        yaml.dump(data, f, default_flow_style=None, sort_keys=False)
@@ -0,0 +1,158 @@
+"""
+Gain Scheduling
+
+Interpolates PID gains from a precomputed table indexed by the joint 2
+and joint 3 angles and the payload mass, so bandwidth can follow the
+arm's effective inertia instead of being tuned for the worst case.
+"""
+
+import yaml
+import numpy as np
+from typing import Tuple
+from dataclasses import dataclass
+
+
+@dataclass
+class GridAxis:
+    """Uniformly spaced table axis."""
+    minimum: float
+    maximum: float
+    points: int
+
+    @property
+    def step(self) -> float:
+        """Spacing between grid points."""
+        return (self.maximum - self.minimum) / (self.points - 1)
+
+
+@dataclass
+class GainSchedule:
+    """
+    PID gain table over (joint 2 angle, joint 3 angle, payload).
+
+    `gains` has shape (n_joint_2, n_joint_3, n_payload, 3, num_joints)
+    with kp, ki, kd stacked along the fourth axis.
+    """
+    joint_2: GridAxis
+    joint_3: GridAxis
+    payload: GridAxis
+    gains: np.ndarray
+
+    def __post_init__(self):
+        self.gains = np.asarray(self.gains, dtype=float)
+        expected = (self.joint_2.points, self.joint_3.points, self.payload.points, 3)
+        if self.gains.ndim != 5 or self.gains.shape[:4] != expected:
+            raise ValueError(
+                f"Gain table shape {self.gains.shape} does not match axes "
+                f"{expected} + (num_joints,)"
+            )
+
+    @property
+    def num_joints(self) -> int:
+        """Number of joints covered by the table."""
+        return self.gains.shape[-1]
+
+
+def load_gain_schedule(path: str) -> GainSchedule:
+    """
+    Load a gain schedule from YAML.
+
+    The file has an `axes` section with `joint_2`, `joint_3` and `payload`
+    entries (min, max, points) and a `gains` section with `kp`, `ki` and
+    `kd` tables nested as [joint_2][joint_3][payload][joint].
+
+    Args:
+        path: Path to gain schedule YAML file
+
+    Returns:
+        GainSchedule
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f)
+
+    axes = {
+        name: GridAxis(float(axis["min"]), float(axis["max"]), int(axis["points"]))
+        for name, axis in data["axes"].items()
+    }
+    tables = [np.asarray(data["gains"][name], dtype=float) for name in ("kp", "ki", "kd")]
+    gains = np.stack(tables, axis=3)
+    return GainSchedule(axes["joint_2"], axes["joint_3"], axes["payload"], gains)
+
+
+class GainScheduler:
+    """
+    Trilinear gain lookup on a uniform grid.
+
+    A lookup computes the enclosing cell by arithmetic and blends its 8
+    corners, so the cost is constant regardless of table size. Results
+    are written into a preallocated (3, num_joints) buffer. Queries
+    outside the table are clamped to its edges; every axis needs at least
+    two points.
+    """
+
+    def __init__(self, schedule: GainSchedule):
+        """
+        Initialize gain scheduler.
+
+        Args:
+            schedule: Gain table
+        """
+        for axis in (schedule.joint_2, schedule.joint_3, schedule.payload):
+            if axis.points < 2:
+                raise ValueError("Gain schedule axes need at least 2 points")
+        self.schedule = schedule
+        self._gains = np.zeros((3, schedule.num_joints))
+        self._weights = np.zeros((2, 2, 2))
+
+    def lookup(self, joint_2: float, joint_3: float, payload: float) -> np.ndarray:
+        """
+        Interpolate gains at an operating point.
+
+        Args:
+            joint_2: Joint 2 angle (rad)
+            joint_3: Joint 3 angle (rad)
+            payload: Payload mass (kg)
+
+        Returns:
+            (3, num_joints) array of kp, ki, kd rows. This is an internal
+            buffer that is overwritten by the next lookup.
+        """
+        i, fi = _cell(self.schedule.joint_2, joint_2)
+        j, fj = _cell(self.schedule.joint_3, joint_3)
+        k, fk = _cell(self.schedule.payload, payload)
+        # Corner weights of the enclosing cell, blended in one contraction
+        w = self._weights
+        w[0, 0, 0] = (1.0 - fi) * (1.0 - fj) * (1.0 - fk)
+        w[0, 0, 1] = (1.0 - fi) * (1.0 - fj) * fk
+        w[0, 1, 0] = (1.0 - fi) * fj * (1.0 - fk)
+        w[0, 1, 1] = (1.0 - fi) * fj * fk
+        w[1, 0, 0] = fi * (1.0 - fj) * (1.0 - fk)
+        w[1, 0, 1] = fi * (1.0 - fj) * fk
+        w[1, 1, 0] = fi * fj * (1.0 - fk)
+        w[1, 1, 1] = fi * fj * fk
+        cell = self.schedule.gains[i:i + 2, j:j + 2, k:k + 2]
+        return np.einsum("abc,abcgj->gj", w, cell, out=self._gains)
+
+    def apply(self, controller, positions: np.ndarray, payload: float) -> None:
+        """
+        Look up gains for the current configuration and load them into a controller.
+
+        Args:
+            controller: MultiJointPIDController or VectorizedPIDController
+            positions: Current joint positions (rad)
+            payload: Payload mass (kg)
+        """
+        gains = self.lookup(positions[1], positions[2], payload)
+        controller.set_pid_gains(gains[0], gains[1], gains[2])
+
+
+def _cell(axis: GridAxis, value: float) -> Tuple[int, float]:
+    """
+    Lower grid index and fractional position of `value` along an axis.
+
+    Returns (index, fraction) with index clamped to the last full cell.
+    """
+    position = (value - axis.minimum) / axis.step
+    position = min(max(position, 0.0), axis.points - 1.0)
+    index = min(int(position), axis.points - 2)
+    return index, position - index
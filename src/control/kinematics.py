@@ -5,13 +5,20 @@ Forward and inverse kinematics for Kuka robot arm using DH parameters.
 """
 
 import numpy as np
+from collections import OrderedDict
 from typing import Optional, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class DHParameters:
-    """Denavit-Hartenberg parameters for a joint."""
+    """
+    Denavit-Hartenberg parameters for a joint.
+
+    Immutable, so a calibration change always goes through assigning a
+    new parameter list to `ForwardKinematics.dh_params`, which rebuilds
+    every cache derived from it.
+    """
     a: float  # Link length (mm)
     d: float  # Link offset (mm)
     alpha: float  # Link twist (rad)
@@ -52,6 +59,28 @@ def dh_matrix(theta: float, dh: DHParameters) -> np.ndarray:
     ])
 
 
+def _geometric_jacobian(frames: np.ndarray) -> np.ndarray:
+    """
+    Geometric Jacobian from cumulative DH frames.
+
+    Args:
+        frames: Base-frame transforms of frames 0..n, shape (..., n + 1, 4, 4)
+
+    Returns:
+        Jacobian, shape (..., 6, n)
+    """
+    # Work on (..., 3, n) views so each row of J is written directly
+    z = np.swapaxes(frames[..., :-1, :3, 2], -1, -2)
+    r = frames[..., -1:, :3, 3].swapaxes(-1, -2) - np.swapaxes(frames[..., :-1, :3, 3], -1, -2)
+
+    J = np.empty(frames.shape[:-3] + (6, z.shape[-1]))
+    J[..., 0, :] = z[..., 1, :] * r[..., 2, :] - z[..., 2, :] * r[..., 1, :]
+    J[..., 1, :] = z[..., 2, :] * r[..., 0, :] - z[..., 0, :] * r[..., 2, :]
+    J[..., 2, :] = z[..., 0, :] * r[..., 1, :] - z[..., 1, :] * r[..., 0, :]
+    J[..., 3:, :] = z
+    return J
+
+
 class ForwardKinematics:
     """
     Forward kinematics solver.
@@ -67,8 +96,37 @@ class ForwardKinematics:
             dh_params: List of DHParameters for each joint.
                       Uses default Kuka params if None.
         """
+        self.dh_version = 0
         self.dh_params = dh_params or DEFAULT_DH_PARAMS
-        self.num_joints = len(self.dh_params)
+
+    @property
+    def dh_params(self) -> Tuple[DHParameters, ...]:
+        """DH parameters for each joint (read-only; assign a new list to change)."""
+        return self._dh_params
+
+    @dh_params.setter
+    def dh_params(self, dh_params: list) -> None:
+        """
+        Replace the DH parameters (e.g. after calibration).
+
+        Rebuilds the cached per-joint terms and bumps `dh_version` so that
+        dependent caches can invalidate themselves. The parameters are
+        stored as a tuple of frozen entries, so this setter is the only
+        way to change them.
+        """
+        self._dh_params = tuple(dh_params)
+        self.num_joints = len(self._dh_params)
+
+        # Constant per-joint DH terms for the batched path
+        self._a = np.array([dh.a for dh in self._dh_params], dtype=float)
+        self._d = np.array([dh.d for dh in self._dh_params], dtype=float)
+        self._theta_offset = np.array(
+            [dh.theta_offset for dh in self._dh_params], dtype=float
+        )
+        alpha = np.array([dh.alpha for dh in self._dh_params], dtype=float)
+        self._cos_alpha = np.cos(alpha)
+        self._sin_alpha = np.sin(alpha)
+        self.dh_version += 1
 
     def compute(self, joint_angles: np.ndarray) -> np.ndarray:
         """
@@ -88,6 +146,127 @@ class ForwardKinematics:
             T = T @ dh_matrix(theta, dh)
         return T
 
+    def compute_batch(self, joint_angles: np.ndarray) -> np.ndarray:
+        """
+        Compute forward kinematics for many configurations at once.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (N, num_joints)
+
+        Returns:
+            Homogeneous transforms (base to end-effector), shape (N, 4, 4)
+        """
+        joint_angles = np.asarray(joint_angles, dtype=float)
+        if joint_angles.ndim != 2 or joint_angles.shape[1] != self.num_joints:
+            raise ValueError(
+                f"Expected shape (N, {self.num_joints}), got {joint_angles.shape}"
+            )
+
+        A = self._link_transforms(joint_angles)
+        T = A[:, 0]
+        for i in range(1, self.num_joints):
+            T = T @ A[:, i]
+        return T
+
+    def compute_frames(self, joint_angles: np.ndarray) -> np.ndarray:
+        """
+        Compute every intermediate DH frame along the chain.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (num_joints,)
+
+        Returns:
+            Frames 0..num_joints expressed in the base, shape (num_joints + 1, 4, 4).
+            Frame 0 is the base and the last frame is the end-effector.
+        """
+        if len(joint_angles) != self.num_joints:
+            raise ValueError(f"Expected {self.num_joints} joints, got {len(joint_angles)}")
+        return self._frames_batch(np.asarray(joint_angles, dtype=float)[None])[0]
+
+    def compute_frames_batch(self, joint_angles: np.ndarray) -> np.ndarray:
+        """
+        Compute every intermediate DH frame for many configurations at once.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (N, num_joints)
+
+        Returns:
+            Frames 0..num_joints expressed in the base, shape (N, num_joints + 1, 4, 4)
+        """
+        joint_angles = np.asarray(joint_angles, dtype=float)
+        if joint_angles.ndim != 2 or joint_angles.shape[1] != self.num_joints:
+            raise ValueError(
+                f"Expected shape (N, {self.num_joints}), got {joint_angles.shape}"
+            )
+        return self._frames_batch(joint_angles)
+
+    def jacobian(self, joint_angles: np.ndarray) -> np.ndarray:
+        """
+        Compute the analytic geometric Jacobian.
+
+        Built from the intermediate frames of a single FK pass:
+        column i is [z_i x (p_e - p_i); z_i] for revolute joint i.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (num_joints,)
+
+        Returns:
+            6xN Jacobian mapping joint rates to [linear (mm/s); angular (rad/s)]
+        """
+        if len(joint_angles) != self.num_joints:
+            raise ValueError(f"Expected {self.num_joints} joints, got {len(joint_angles)}")
+        return self.jacobian_batch(np.asarray(joint_angles, dtype=float)[None])[0]
+
+    def jacobian_batch(self, joint_angles: np.ndarray) -> np.ndarray:
+        """
+        Compute geometric Jacobians for many configurations at once.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (N, num_joints)
+
+        Returns:
+            Jacobians, shape (N, 6, num_joints)
+        """
+        return _geometric_jacobian(self._frames_batch(joint_angles))
+
+    def _frames_batch(self, joint_angles: np.ndarray) -> np.ndarray:
+        """Cumulative base-frame transforms, shape (N, num_joints + 1, 4, 4)."""
+        A = self._link_transforms(joint_angles)
+        frames = np.empty((A.shape[0], self.num_joints + 1, 4, 4))
+        frames[:, 0] = np.eye(4)
+        for i in range(self.num_joints):
+            frames[:, i + 1] = frames[:, i] @ A[:, i]
+        return frames
+
+    def _link_transforms(self, joint_angles: np.ndarray) -> np.ndarray:
+        """
+        Build every per-joint DH matrix for a batch of configurations.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (N, num_joints)
+
+        Returns:
+            Link transforms, shape (N, num_joints, 4, 4)
+        """
+        theta = joint_angles + self._theta_offset
+        ct, st = np.cos(theta), np.sin(theta)
+        ca, sa = self._cos_alpha, self._sin_alpha
+
+        A = np.zeros(theta.shape + (4, 4))
+        A[..., 0, 0] = ct
+        A[..., 0, 1] = -st * ca
+        A[..., 0, 2] = st * sa
+        A[..., 0, 3] = self._a * ct
+        A[..., 1, 0] = st
+        A[..., 1, 1] = ct * ca
+        A[..., 1, 2] = -ct * sa
+        A[..., 1, 3] = self._a * st
+        A[..., 2, 1] = sa
+        A[..., 2, 2] = ca
+        A[..., 2, 3] = self._d
+        A[..., 3, 3] = 1.0
+        return A
+
     def get_position(self, joint_angles: np.ndarray) -> np.ndarray:
         """Get end-effector position (x, y, z) in mm."""
         T = self.compute(joint_angles)
@@ -99,11 +278,101 @@ class ForwardKinematics:
         return T[:3, :3]
 
 
+class IKCache:
+    """
+    LRU cache of IK solutions.
+
+    Entries are keyed on the target pose quantized to a configurable
+    tolerance plus the configuration branch of the seed, so repeated
+    production poses skip the solver entirely. A cached solution may
+    differ from an exact solve by up to the quantization tolerance.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        position_tolerance: float = 0.01,
+        orientation_tolerance: float = 1e-5
+    ):
+        """
+        Initialize IK cache.
+
+        Args:
+            max_size: Maximum number of entries before LRU eviction
+            position_tolerance: Position quantization step (mm)
+            orientation_tolerance: Rotation matrix element quantization step
+        """
+        self.max_size = max_size
+        self.position_tolerance = position_tolerance
+        self.orientation_tolerance = orientation_tolerance
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._dh_version: Optional[int] = None
+
+        self._scale = np.full((3, 4), 1.0 / orientation_tolerance)
+        self._scale[:, 3] = 1.0 / position_tolerance
+
+    def make_key(self, target_pose: np.ndarray, branch: int, position_only: bool) -> tuple:
+        """Build the lookup key for a target pose and seed branch."""
+        quantized = np.rint(target_pose[:3, :4] * self._scale).astype(np.int64)
+        if position_only:
+            quantized = quantized[:, 3]
+        return (branch, position_only, quantized.tobytes())
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        """Look up a solution, marking it most recently used."""
+        joint_angles = self._entries.get(key)
+        if joint_angles is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return joint_angles.copy()
+
+    def put(self, key: tuple, joint_angles: np.ndarray) -> None:
+        """Store a solution, evicting the least recently used entry if full."""
+        self._entries[key] = np.array(joint_angles, dtype=float)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def validate(self, dh_version: int) -> None:
+        """Drop all entries if the DH parameters changed since they were stored."""
+        if dh_version != self._dh_version:
+            self._entries.clear()
+            self._dh_version = dh_version
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class InverseKinematics:
     """
-    Inverse kinematics solver using numerical methods.
+    Inverse kinematics solver.
 
-    Computes joint angles from desired end-effector pose.
+    Computes joint angles from desired end-effector pose. Full-pose
+    requests on a 6R arm with a spherical wrist (the default KR150 DH set)
+    are solved in closed form; everything else uses damped numerical
+    iteration on the analytic Jacobian.
     """
 
     def __init__(
@@ -111,7 +380,10 @@ class InverseKinematics:
         dh_params: Optional[list] = None,
         max_iterations: int = 100,
         tolerance: float = 1e-6,
-        learning_rate: float = 0.1
+        learning_rate: float = 0.1,
+        orientation_tolerance: float = 1e-6,
+        use_analytic: bool = True,
+        cache: Optional[IKCache] = None
     ):
         """
         Initialize inverse kinematics solver.
@@ -121,45 +393,135 @@ class InverseKinematics:
             max_iterations: Maximum iterations for convergence
             tolerance: Position error tolerance (mm)
             learning_rate: Step size for Jacobian pseudo-inverse method
+            orientation_tolerance: Orientation error tolerance (rad), used
+                                  for full-pose solves
+            use_analytic: Use the closed-form solver for full-pose requests
+                         when the DH set has a spherical wrist
+            cache: Optional solution cache consulted by compute(); cleared
+                  automatically when `fk.dh_params` is replaced
         """
         self.fk = ForwardKinematics(dh_params)
         self.max_iterations = max_iterations
         self.tolerance = tolerance
         self.learning_rate = learning_rate
+        self.orientation_tolerance = orientation_tolerance
+        self.use_analytic = use_analytic
+        self.cache = cache
+        self._wrist_dh_version: Optional[int] = None
+        self._has_spherical_wrist = False
+
+    @property
+    def has_spherical_wrist(self) -> bool:
+        """Whether the current DH set allows the closed-form solver."""
+        if self._wrist_dh_version != self.fk.dh_version:
+            self._has_spherical_wrist = _is_spherical_wrist(self.fk.dh_params)
+            self._wrist_dh_version = self.fk.dh_version
+        return self._has_spherical_wrist
 
     def compute(
         self,
         target_pose: np.ndarray,
-        initial_guess: Optional[np.ndarray] = None
+        initial_guess: Optional[np.ndarray] = None,
+        position_only: bool = True
     ) -> Tuple[np.ndarray, bool]:
         """
-        Compute inverse kinematics using Jacobian pseudo-inverse.
+        Compute inverse kinematics.
+
+        Full-pose requests go through the closed-form solver when
+        available (branch nearest to `initial_guess`); otherwise the
+        Jacobian pseudo-inverse iteration is used. If a cache is attached,
+        successful solutions are stored and reused for targets that
+        quantize to the same key from a seed on the same branch; each
+        joint of a reused solution is shifted by multiples of 2*pi to lie
+        closest to the seed.
 
         Args:
             target_pose: 4x4 target transformation matrix
             initial_guess: Initial joint angles (uses zeros if None)
+            position_only: Solve for position only (3 DOF). When False,
+                          orientation is also matched (6 DOF); the
+                          orientation error (rad) must also fall below
+                          `orientation_tolerance`.
 
         Returns:
             Tuple of (joint_angles, success)
         """
         if initial_guess is None:
             initial_guess = np.zeros(self.fk.num_joints)
+        initial_guess = np.asarray(initial_guess, dtype=float)
+
+        if self.cache is None:
+            return self._compute_uncached(target_pose, initial_guess, position_only)
+
+        self.cache.validate(self.fk.dh_version)
+        key = self.cache.make_key(
+            target_pose, self.configuration_branch(initial_guess), position_only
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            # The key ignores full turns; take the 2*pi copy nearest the seed
+            return initial_guess + _wrap_angle(cached - initial_guess), True
+
+        joint_angles, success = self._compute_uncached(
+            target_pose, initial_guess, position_only
+        )
+        if success:
+            self.cache.put(key, joint_angles)
+        return joint_angles, success
+
+    def configuration_branch(self, joint_angles: np.ndarray) -> int:
+        """
+        Classify a configuration into one of the 8 arm branches.
 
-        joint_angles = initial_guess.copy()
+        Returns:
+            Bit field: 1 = shoulder back, 2 = elbow down, 4 = wrist flipped
+        """
+        dh = self.fk.dh_params
+        theta = np.asarray(joint_angles, dtype=float) + self.fk._theta_offset
+        a3, b = dh[2].a, -np.sin(dh[2].alpha) * dh[3].d
+        psi = theta[2] + np.arctan2(b, a3)
+        reach = (
+            dh[0].a + dh[1].a * np.cos(theta[1]) + np.hypot(a3, b) * np.cos(theta[1] + psi)
+        )
+        return int(reach < 0) | (int(np.sin(psi) < 0) << 1) | (int(np.sin(theta[4]) < 0) << 2)
+
+    def _compute_uncached(
+        self,
+        target_pose: np.ndarray,
+        initial_guess: np.ndarray,
+        position_only: bool
+    ) -> Tuple[np.ndarray, bool]:
+        """Solve IK without consulting the cache (see compute)."""
+        if not position_only and self.use_analytic and self.has_spherical_wrist:
+            return self.compute_analytic(target_pose, initial_guess)
+
+        joint_angles = np.array(initial_guess, dtype=float)
         target_position = target_pose[:3, 3]
+        target_rotation = target_pose[:3, :3]
 
         for iteration in range(self.max_iterations):
-            current_pose = self.fk.compute(joint_angles)
-            current_position = current_pose[:3, 3]
-
-            error = target_position - current_position
-            error_norm = np.linalg.norm(error)
-
-            if error_norm < self.tolerance:
+            frames = self.fk.compute_frames(joint_angles)
+            current_pose = frames[-1]
+
+            position_error = target_position - current_pose[:3, 3]
+            converged = np.linalg.norm(position_error) < self.tolerance
+
+            if position_only:
+                error = position_error
+            else:
+                orientation_error = _orientation_error(current_pose[:3, :3], target_rotation)
+                converged = converged and (
+                    np.linalg.norm(orientation_error) < self.orientation_tolerance
+                )
+                error = np.concatenate([position_error, orientation_error])
+
+            if converged:
                 return joint_angles, True
 
-            # Compute Jacobian numerically
-            J = self._compute_jacobian(joint_angles)
+            # Analytic Jacobian from the frames already computed above
+            J = _geometric_jacobian(frames)
+            if position_only:
+                J = J[:3]
 
             # Pseudo-inverse update
             J_pinv = np.linalg.pinv(J)
@@ -168,17 +530,281 @@ class InverseKinematics:
 
         return joint_angles, False
 
-    def _compute_jacobian(self, joint_angles: np.ndarray, delta: float = 1e-6) -> np.ndarray:
-        """Compute Jacobian numerically using finite differences."""
-        n = len(joint_angles)
-        J = np.zeros((3, n))
+    def compute_batch(
+        self,
+        target_poses: np.ndarray,
+        initial_guess: Optional[np.ndarray] = None,
+        position_only: bool = False,
+        orientation_weight: float = 1000.0,
+        block_size: int = 256
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Solve IK for a whole path with vectorized Levenberg-Marquardt.
+
+        The path is processed in consecutive blocks; every point of a block
+        is solved simultaneously and warm-started from the last solution of
+        the previous block (the first block starts from `initial_guess`).
+        Each point keeps its own damping factor and stops iterating as soon
+        as it meets the position (and orientation) tolerance.
 
-        base_pos = self.fk.get_position(joint_angles)
+        Args:
+            target_poses: Target transformation matrices, shape (N, 4, 4)
+            initial_guess: Joint angles to start the first block from
+                          (uses zeros if None)
+            position_only: Match position only (3 DOF) instead of full pose
+            orientation_weight: Scale (mm/rad) applied to orientation
+                               residuals so they are commensurate with
+                               position residuals in the least-squares step
+            block_size: Number of points solved together per block
 
-        for i in range(n):
-            perturbed = joint_angles.copy()
-            perturbed[i] += delta
-            perturbed_pos = self.fk.get_position(perturbed)
-            J[:, i] = (perturbed_pos - base_pos) / delta
+        Returns:
+            Tuple of (joint_angles (N, num_joints), converged (N,) bool,
+            iterations (N,) int)
+        """
+        target_poses = np.asarray(target_poses, dtype=float)
+        if target_poses.ndim != 3 or target_poses.shape[1:] != (4, 4):
+            raise ValueError(f"Expected shape (N, 4, 4), got {target_poses.shape}")
+        if initial_guess is None:
+            initial_guess = np.zeros(self.fk.num_joints)
 
-        return J
+        num_points = len(target_poses)
+        joint_angles = np.empty((num_points, self.fk.num_joints))
+        converged = np.zeros(num_points, dtype=bool)
+        iterations = np.zeros(num_points, dtype=int)
+
+        seed = np.asarray(initial_guess, dtype=float)
+        for start in range(0, num_points, block_size):
+            block = slice(start, min(start + block_size, num_points))
+            q, ok, its = self._solve_block_lm(
+                target_poses[block], seed, position_only, orientation_weight
+            )
+            joint_angles[block] = q
+            converged[block] = ok
+            iterations[block] = its
+            seed = q[-1]
+
+        return joint_angles, converged, iterations
+
+    def _solve_block_lm(
+        self,
+        targets: np.ndarray,
+        seed: np.ndarray,
+        position_only: bool,
+        orientation_weight: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Damped least squares over one block of targets (see compute_batch)."""
+        n = len(targets)
+        q = np.tile(seed, (n, 1))
+        damping = np.full(n, 1e-3)
+        converged = np.zeros(n, dtype=bool)
+        iterations = np.full(n, self.max_iterations)
+        rows = 3 if position_only else 6
+
+        def residual(poses, idx):
+            e = np.empty((len(idx), rows))
+            e[:, :3] = targets[idx, :3, 3] - poses[:, :3, 3]
+            if not position_only:
+                e[:, 3:] = _orientation_error(poses[:, :3, :3], targets[idx, :3, :3])
+            return e
+
+        def is_converged(e):
+            ok = np.linalg.norm(e[:, :3], axis=1) < self.tolerance
+            if not position_only:
+                ok &= np.linalg.norm(e[:, 3:], axis=1) < self.orientation_tolerance
+            return ok
+
+        weights = np.ones(rows)
+        weights[3:] = orientation_weight
+        eye = np.eye(self.fk.num_joints)
+
+        for iteration in range(self.max_iterations + 1):
+            active = np.flatnonzero(~converged)
+            if len(active) == 0:
+                break
+
+            frames = self.fk._frames_batch(q[active])
+            e = residual(frames[:, -1], active)
+
+            done = is_converged(e)
+            converged[active[done]] = True
+            iterations[active[done]] = iteration
+            if iteration == self.max_iterations:
+                break
+            active, frames, e = active[~done], frames[~done], e[~done]
+            if len(active) == 0:
+                break
+
+            # Weighted LM step: (J^T J + lambda I) dq = J^T e
+            J = _geometric_jacobian(frames)[:, :rows] * weights[:, None]
+            e_w = e * weights
+            JT = np.swapaxes(J, -1, -2)
+            H = JT @ J + damping[active, None, None] * eye
+            dq = np.linalg.solve(H, (JT @ e_w[..., None]))[..., 0]
+
+            # Accept steps that reduce the weighted residual
+            trial = q[active] + dq
+            e_trial = residual(self.fk.compute_batch(trial), active) * weights
+            accept = np.sum(e_trial ** 2, axis=1) < np.sum(e_w ** 2, axis=1)
+            q[active[accept]] = trial[accept]
+            damping[active] = np.where(
+                accept, np.maximum(damping[active] * 0.3, 1e-9), damping[active] * 4.0
+            )
+
+        return q, converged, iterations
+
+    def compute_analytic(
+        self,
+        target_pose: np.ndarray,
+        seed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Closed-form full-pose IK, choosing the branch nearest to a seed.
+
+        Each joint of the chosen branch is shifted by multiples of 2*pi to
+        lie closest to the seed, so consecutive calls along a path stay
+        continuous.
+
+        Args:
+            target_pose: 4x4 target transformation matrix
+            seed: Reference joint angles (uses zeros if None)
+
+        Returns:
+            Tuple of (joint_angles, success). On failure (target out of
+            reach) the seed is returned unchanged.
+        """
+        if seed is None:
+            seed = np.zeros(self.fk.num_joints)
+        seed = np.asarray(seed, dtype=float)
+
+        branches = self.compute_all_branches(target_pose)
+        if len(branches) == 0:
+            return seed.copy(), False
+
+        # Wrap each joint to the 2*pi copy nearest the seed
+        branches = seed + _wrap_angle(branches - seed)
+        best = np.argmin(np.sum((branches - seed) ** 2, axis=1))
+        return branches[best], True
+
+    def compute_all_branches(self, target_pose: np.ndarray) -> np.ndarray:
+        """
+        Solve IK in closed form for every configuration branch.
+
+        Enumerates shoulder (front/back), elbow (up/down) and wrist
+        (flip/no-flip) for up to 8 solutions in constant time.
+
+        Args:
+            target_pose: 4x4 target transformation matrix
+
+        Returns:
+            Joint angles for every reachable branch, shape (k, 6) with
+            k <= 8, wrapped to [-pi, pi]
+
+        Raises:
+            ValueError: If the DH parameters do not describe a 6R arm with
+                        a spherical wrist
+        """
+        if not self.has_spherical_wrist:
+            raise ValueError("Closed-form IK requires a 6R arm with a spherical wrist")
+
+        dh = self.fk.dh_params
+        R = target_pose[:3, :3]
+        wrist = target_pose[:3, 3] - dh[5].d * R[:, 2]
+
+        # Shoulder: joint 1 points the arm plane at the wrist center
+        rho = np.hypot(wrist[0], wrist[1])
+        phi = np.arctan2(wrist[1], wrist[0])
+        sa1 = np.sin(dh[0].alpha)
+        a2 = dh[1].a
+        a3, b = dh[2].a, -np.sin(dh[2].alpha) * dh[3].d
+        link = np.hypot(a3, b)
+        link_angle = np.arctan2(b, a3)
+
+        arm = []
+        for theta1, reach in ((phi, rho), (phi + np.pi, -rho)):
+            # Wrist center in the joint-2 plane
+            px = reach - dh[0].a
+            py = (wrist[2] - dh[0].d) / sa1
+            cos_elbow = (px * px + py * py - a2 * a2 - link * link) / (2 * a2 * link)
+            if abs(cos_elbow) > 1.0 + 1e-9:
+                continue
+            elbow = np.arccos(np.clip(cos_elbow, -1.0, 1.0))
+            for psi in (elbow, -elbow):
+                theta2 = np.arctan2(py, px) - np.arctan2(
+                    link * np.sin(psi), a2 + link * np.cos(psi)
+                )
+                arm.append((theta1, theta2, psi - link_angle))
+
+        if not arm:
+            return np.empty((0, self.fk.num_joints))
+
+        q = np.zeros((2 * len(arm), self.fk.num_joints))
+        q[:, :3] = np.repeat(np.array(arm), 2, axis=0) - self.fk._theta_offset[:3]
+
+        # Wrist: joints 4/5 from the third column of R_3^6
+        frames = self.fk._frames_batch(q)
+        R36 = np.swapaxes(frames[:, 3, :3, :3], -1, -2) @ R
+        sa4, sa5 = np.sin(dh[3].alpha), np.sin(dh[4].alpha)
+        r13, r23, r33 = R36[:, 0, 2], R36[:, 1, 2], R36[:, 2, 2]
+        theta5 = np.arctan2(np.hypot(r13, r23), -sa4 * sa5 * r33)
+        theta4 = np.arctan2(sa5 * r23, sa5 * r13)
+        # Odd rows are the flipped wrist
+        theta4[1::2] += np.pi
+        theta5[1::2] *= -1
+        q[:, 3] = theta4 - self.fk._theta_offset[3]
+        q[:, 4] = theta5 - self.fk._theta_offset[4]
+
+        # Joint 6 from the residual rotation R_5^6 = Rz(theta6)
+        frames = self.fk._frames_batch(q)
+        R56 = np.swapaxes(frames[:, 5, :3, :3], -1, -2) @ R
+        q[:, 5] = np.arctan2(R56[:, 1, 0], R56[:, 0, 0]) - self.fk._theta_offset[5]
+
+        return _wrap_angle(q)
+
+    def _compute_jacobian(self, joint_angles: np.ndarray) -> np.ndarray:
+        """Compute the 3xN position Jacobian analytically."""
+        return self.fk.jacobian(joint_angles)[:3]
+
+
+def _orientation_error(current: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """
+    Orientation error between two rotation matrices (rad).
+
+    Uses the small-angle form 0.5 * sum_i(c_i x t_i) over matching columns,
+    which is exact in direction and well behaved for an IK step. Accepts
+    stacked matrices of shape (..., 3, 3).
+    """
+    return 0.5 * (
+        np.cross(current[..., :, 0], target[..., :, 0])
+        + np.cross(current[..., :, 1], target[..., :, 1])
+        + np.cross(current[..., :, 2], target[..., :, 2])
+    )
+
+
+def _wrap_angle(angle: np.ndarray) -> np.ndarray:
+    """Wrap angles to [-pi, pi)."""
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def _is_spherical_wrist(dh_params: list, tol: float = 1e-9) -> bool:
+    """
+    Check whether a DH set matches the closed-form solver's geometry.
+
+    Requires 6 joints, a shoulder twist of +/-90 deg, parallel joints 2/3
+    with no lateral offsets, and three wrist axes intersecting in one
+    point (a4 = a5 = a6 = d5 = 0, alpha6 = 0).
+    """
+    if len(dh_params) != 6:
+        return False
+    d1, d2, d3, d4, d5, d6 = dh_params
+    return (
+        abs(np.cos(d1.alpha)) < tol
+        and abs(np.sin(d2.alpha)) < tol and np.cos(d2.alpha) > 0
+        and abs(np.cos(d3.alpha)) < tol
+        and abs(np.cos(d4.alpha)) < tol
+        and abs(np.cos(d5.alpha)) < tol
+        and abs(np.sin(d6.alpha)) < tol and np.cos(d6.alpha) > 0
+        and abs(d2.d) < tol and abs(d3.d) < tol
+        and abs(d4.a) < tol and abs(d5.a) < tol and abs(d5.d) < tol
+        and abs(d6.a) < tol
+        and abs(d2.a) > tol
+    )
@@ -0,0 +1,394 @@
+"""
+Loop Timing
+
+Absolute-deadline scheduling, always-on timing histograms and per-stage
+timing probes for the realtime control loop.
+"""
+
+import time
+import threading
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+
+
+class DeadlineScheduler:
+    """
+    Fixed-rate scheduler on absolute deadlines.
+
+    Each wait advances the deadline by exactly one period from the previous
+    deadline (not from "now"), so lateness in one cycle does not shift every
+    later cycle. The wait sleeps until `spin_ns` before the deadline and
+    busy-waits the rest, because sleep wake-up latency is far coarser than
+    a 1 ms period needs. If the loop falls more than a period behind, the
+    missed deadlines are skipped instead of run back to back.
+    """
+
+    def __init__(self, period_ns: int, spin_ns: int = 200_000):
+        """
+        Initialize scheduler.
+
+        Args:
+            period_ns: Loop period (ns)
+            spin_ns: Busy-wait window before each deadline (ns)
+        """
+        self.period_ns = period_ns
+        self.spin_ns = spin_ns
+        self.next_deadline: Optional[int] = None
+        self.missed_deadlines = 0
+
+    def start(self) -> int:
+        """Anchor the schedule at the current time; returns the first deadline (ns)."""
+        self.next_deadline = time.perf_counter_ns() + self.period_ns
+        self.missed_deadlines = 0
+        return self.next_deadline
+
+    def wait(self) -> bool:
+        """
+        Block until the next deadline, then advance it by one period.
+
+        Returns:
+            True if the deadline had already passed (overrun)
+        """
+        if self.next_deadline is None:
+            self.start()
+        deadline = self.next_deadline
+        now = time.perf_counter_ns()
+
+        if now >= deadline:
+            # Overrun: skip whole periods we cannot make up, keep the phase
+            missed = (now - deadline) // self.period_ns
+            self.missed_deadlines += missed
+            self.next_deadline = deadline + (missed + 1) * self.period_ns
+            return True
+
+        remaining = deadline - now
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while time.perf_counter_ns() < deadline:
+            pass
+        self.next_deadline = deadline + self.period_ns
+        return False
+
+
+class LatencyHistogram:
+    """
+    Fixed-bin histogram of durations.
+
+    Recording is a single counter increment into a preallocated array, so
+    it can run every cycle. There is one writer (the control loop);
+    readers copy the counts without locking and may see a snapshot that
+    is at most one sample out of date.
+    """
+
+    def __init__(self, bin_width_ns: int = 1000, max_ns: int = 20_000_000):
+        """
+        Initialize histogram.
+
+        Args:
+            bin_width_ns: Bin width (ns)
+            max_ns: Upper edge of the last regular bin; longer samples go to
+                   an overflow bin
+        """
+        self.bin_width_ns = bin_width_ns
+        self._last_bin = max_ns // bin_width_ns
+        self._counts = np.zeros(self._last_bin + 1, dtype=np.int64)
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        """Add one sample."""
+        self._counts[min(duration_ns // self.bin_width_ns, self._last_bin)] += 1
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def reset(self) -> None:
+        """Clear all samples."""
+        self._counts.fill(0)
+        self.max_ns = 0
+
+    @property
+    def count(self) -> int:
+        """Number of samples recorded."""
+        return int(self._counts.sum())
+
+    def percentiles(self, percents) -> np.ndarray:
+        """
+        Approximate percentiles (ns), resolved to the bin width.
+
+        Each percentile is reported as the upper edge of the bin that
+        contains it, so it never under-states a latency.
+
+        Args:
+            percents: Percentiles in [0, 100]
+
+        Returns:
+            Array of durations (ns); zeros if empty
+        """
+        counts = self._counts.copy()
+        cumulative = np.cumsum(counts)
+        total = cumulative[-1]
+        if total == 0:
+            return np.zeros(len(percents))
+        ranks = np.ceil(np.asarray(percents, dtype=float) / 100.0 * total).clip(1, total)
+        bins = np.searchsorted(cumulative, ranks)
+        # The overflow bin has no upper edge; the largest sample bounds it
+        edges = np.where(bins == self._last_bin, self.max_ns, (bins + 1) * self.bin_width_ns)
+        return np.minimum(edges, max(self.max_ns, 1))
+
+
+@dataclass
+class LoopTimingStats:
+    """Snapshot of control-loop timing (µs unless noted)."""
+    cycles: int
+    overruns: int  # Cycles that finished after their deadline
+    missed_deadlines: int  # Whole periods skipped after overruns
+    period_p50_us: float
+    period_p99_us: float
+    period_p999_us: float
+    period_max_us: float
+    compute_p50_us: float
+    compute_p99_us: float
+    compute_p999_us: float
+    compute_max_us: float
+
+
+class LoopTimingMonitor:
+    """
+    Always-on loop period / compute time / overrun statistics.
+
+    The loop calls record() once per cycle; stats() may be called from
+    any thread.
+    """
+
+    def __init__(self, bin_width_ns: int = 1000, max_ns: int = 20_000_000):
+        """
+        Initialize monitor.
+
+        Args:
+            bin_width_ns: Histogram resolution (ns)
+            max_ns: Histogram range (ns)
+        """
+        self.period = LatencyHistogram(bin_width_ns, max_ns)
+        self.compute = LatencyHistogram(bin_width_ns, max_ns)
+        self.overruns = 0
+        self.missed_deadlines = 0
+
+    def record(self, period_ns: Optional[int], compute_ns: int, overrun: bool) -> None:
+        """
+        Record one cycle.
+
+        Args:
+            period_ns: Time since the previous cycle started (None on the first)
+            compute_ns: Time spent in the cycle's work
+            overrun: Whether the cycle missed its deadline
+        """
+        if period_ns is not None:
+            self.period.record(period_ns)
+        self.compute.record(compute_ns)
+        if overrun:
+            self.overruns += 1
+
+    def reset(self) -> None:
+        """Clear all statistics."""
+        self.period.reset()
+        self.compute.reset()
+        self.overruns = 0
+        self.missed_deadlines = 0
+
+    def stats(self) -> LoopTimingStats:
+        """Current percentiles and counters."""
+        period = self.period.percentiles([50, 99, 99.9]) / 1000.0
+        compute = self.compute.percentiles([50, 99, 99.9]) / 1000.0
+        return LoopTimingStats(
+            cycles=self.compute.count,
+            overruns=self.overruns,
+            missed_deadlines=self.missed_deadlines,
+            period_p50_us=float(period[0]),
+            period_p99_us=float(period[1]),
+            period_p999_us=float(period[2]),
+            period_max_us=self.period.max_ns / 1000.0,
+            compute_p50_us=float(compute[0]),
+            compute_p99_us=float(compute[1]),
+            compute_p999_us=float(compute[2]),
+            compute_max_us=self.compute.max_ns / 1000.0,
+        )
+
+
+class StageTimer:
+    """
+    Per-stage timestamp probes for the control cycle.
+
+    Every cycle fills one row of a preallocated (capacity, num_stages + 1)
+    int64 ring: the cycle start and the end of each stage. The loop only
+    stores integers into existing rows and bumps a cycle counter, so it
+    never allocates. A reader (see StageTimingExporter) copies recent rows
+    without locking; it takes at most the newest half of the ring, so the
+    rows it reads stay at least half a ring clear of the row being
+    written next.
+    """
+
+    def __init__(self, stages: Tuple[str, ...], capacity: int = 4096):
+        """
+        Initialize stage timer.
+
+        Args:
+            stages: Stage names in execution order
+            capacity: Number of cycles kept
+        """
+        self.stages = tuple(stages)
+        self.capacity = capacity
+        self._timestamps = np.zeros((capacity, len(self.stages) + 1), dtype=np.int64)
+        self._row = self._timestamps[0]
+        self.cycles = 0
+
+    def begin(self, start_ns: int) -> None:
+        """Start a cycle at `start_ns` (perf_counter_ns)."""
+        self._row = self._timestamps[self.cycles % self.capacity]
+        self._row[0] = start_ns
+
+    def mark(self, stage: int) -> None:
+        """Record the end of stage number `stage` (index into `stages`)."""
+        self._row[stage + 1] = time.perf_counter_ns()
+
+    def end(self) -> None:
+        """Publish the current cycle."""
+        self.cycles += 1
+
+    def reset(self) -> None:
+        """Discard all recorded cycles."""
+        self.cycles = 0
+
+    def durations(self, since_cycle: int = 0) -> Tuple[np.ndarray, int]:
+        """
+        Stage durations of the cycles completed since `since_cycle`.
+
+        Args:
+            since_cycle: Cycle count returned by a previous call
+
+        Returns:
+            Tuple of ((num_cycles, num_stages) durations in ns, cycle count to
+            pass as `since_cycle` next time). At most capacity // 2 of the
+            newest cycles are returned.
+        """
+        end = self.cycles
+        start = max(since_cycle, end - self.capacity // 2, 0)
+        rows = np.arange(start, end) % self.capacity
+        return np.diff(self._timestamps[rows], axis=1), end
+
+
+@dataclass
+class StageTimingStats:
+    """Duration statistics for one control-cycle stage (µs)."""
+    p50_us: float
+    p99_us: float
+    max_us: float
+    budget_share: float  # p99 as a fraction of the loop period
+    over_budget: bool
+
+
+@dataclass
+class StageTimingReport:
+    """Per-stage timing over one export window."""
+    cycles: int
+    stages: Dict[str, StageTimingStats]
+
+    @property
+    def flagged(self) -> List[str]:
+        """Stages whose p99 exceeded their budget share."""
+        return [name for name, stats in self.stages.items() if stats.over_budget]
+
+
+class StageTimingExporter:
+    """
+    Background aggregation of StageTimer samples.
+
+    Every `interval_s` it reads the cycles recorded since the previous
+    export, computes p50/p99/max per stage and flags stages whose p99
+    takes more than `budget_share` of the loop period. The work happens on
+    its own thread, off the control loop.
+    """
+
+    def __init__(
+        self,
+        timer: StageTimer,
+        period_ns: int,
+        budget_share: Union[float, Dict[str, float]] = 0.5,
+        interval_s: float = 1.0,
+        callback: Optional[Callable[[StageTimingReport], None]] = None
+    ):
+        """
+        Initialize exporter.
+
+        Args:
+            timer: Stage timer written by the control loop
+            period_ns: Loop period (ns)
+            budget_share: Allowed fraction of the period per stage, either one
+                         value for all stages or a mapping by stage name
+            interval_s: Export interval (s)
+            callback: Called with each report (optional)
+        """
+        self.timer = timer
+        self.period_ns = period_ns
+        if isinstance(budget_share, dict):
+            self._budget = np.array([budget_share.get(name, 1.0) for name in timer.stages])
+        else:
+            self._budget = np.full(len(timer.stages), float(budget_share))
+        self.interval_s = interval_s
+        self.callback = callback
+        self.latest: Optional[StageTimingReport] = None
+        self._since_cycle = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self) -> Optional[StageTimingReport]:
+        """
+        Aggregate the cycles recorded since the last export.
+
+        Returns:
+            The new report, or None if no cycles completed
+        """
+        durations, self._since_cycle = self.timer.durations(self._since_cycle)
+        if len(durations) == 0:
+            return None
+
+        p50, p99 = np.percentile(durations, [50, 99], axis=0) / 1000.0
+        maximum = durations.max(axis=0) / 1000.0
+        share = p99 * 1000.0 / self.period_ns
+        stages = {
+            name: StageTimingStats(
+                p50_us=float(p50[i]),
+                p99_us=float(p99[i]),
+                max_us=float(maximum[i]),
+                budget_share=float(share[i]),
+                over_budget=bool(share[i] > self._budget[i]),
+            )
+            for i, name in enumerate(self.timer.stages)
+        }
+        self.latest = StageTimingReport(cycles=len(durations), stages=stages)
+        if self.callback is not None:
+            self.callback(self.latest)
+        return self.latest
+
+    def start(self) -> None:
+        """Start exporting on a background thread."""
+        self._stop.clear()
+        self._since_cycle = self.timer.cycles
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name="StageTimingExporter"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after a final export."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Export loop."""
+        while not self._stop.wait(self.interval_s):
+            self.export()
+        self.export()
@@ -0,0 +1,257 @@
+"""
+Online Trajectory Generation
+
+Jerk-limited re-planning from the current motion state to a new target,
+in the style of Reflexxes/Ruckig, for targets that change at 10-50 Hz.
+"""
+
+import math
+import numpy as np
+from typing import Tuple
+from dataclasses import dataclass
+
+from .trajectory_planner import TrajectoryLimits, TrajectoryPoint
+
+
+# Root-finding budget for the peak velocity; bounds the worst-case latency
+MAX_ROOT_ITERATIONS = 30
+
+
+@dataclass
+class OnlineTrajectory:
+    """
+    Per-joint jerk-limited continuation towards a target.
+
+    Every joint has 7 constant-jerk segments (accelerate, cruise,
+    decelerate) stacked into (num_joints, 7) arrays so that evaluation is
+    a handful of vectorized operations. Joints are time-optimal
+    individually and may arrive at different times.
+    """
+    t_start: np.ndarray  # (num_joints, 7) segment start times (s)
+    position: np.ndarray  # (num_joints, 7) position at segment start (rad)
+    velocity: np.ndarray  # (num_joints, 7) velocity at segment start (rad/s)
+    acceleration: np.ndarray  # (num_joints, 7) acceleration at segment start (rad/s²)
+    jerk: np.ndarray  # (num_joints, 7) jerk within segment (rad/s³)
+    durations: np.ndarray  # (num_joints,) time for each joint to reach the target (s)
+    target: np.ndarray  # (num_joints,) target positions (rad)
+
+    @property
+    def duration(self) -> float:
+        """Time until every joint has reached the target (s)."""
+        return float(np.max(self.durations))
+
+    def evaluate(self, t: float) -> TrajectoryPoint:
+        """
+        Evaluate the continuation at time `t` after re-planning.
+
+        Joints that have finished hold the target at rest.
+        """
+        rows = np.arange(len(self.durations))
+        t_joint = np.minimum(t, self.durations)
+        k = np.count_nonzero(self.t_start <= t_joint[:, None], axis=1) - 1
+        dt = t_joint - self.t_start[rows, k]
+        j, a, v = self.jerk[rows, k], self.acceleration[rows, k], self.velocity[rows, k]
+
+        done = t >= self.durations
+        position = self.position[rows, k] + v * dt + a * dt * dt / 2 + j * dt ** 3 / 6
+        velocity = v + a * dt + j * dt * dt / 2
+        acceleration = a + j * dt
+        return TrajectoryPoint(
+            position=np.where(done, self.target, position),
+            velocity=np.where(done, 0.0, velocity),
+            acceleration=np.where(done, 0.0, acceleration),
+            time=t,
+        )
+
+
+class OnlineTrajectoryGenerator:
+    """
+    Online trajectory generator.
+
+    Computes, for each joint independently, the time-optimal jerk-limited
+    motion from an arbitrary (position, velocity, acceleration) state to a
+    target at rest. The run time per call is bounded by a fixed
+    root-finding budget (MAX_ROOT_ITERATIONS per joint), so it can be
+    called every control cycle; see tests/performance/benchmark_trajectory.py.
+    """
+
+    def __init__(self, limits: TrajectoryLimits):
+        """
+        Initialize online trajectory generator.
+
+        Args:
+            limits: Velocity, acceleration and jerk limits (max_jerk required)
+        """
+        if limits.max_jerk is None:
+            raise ValueError("Online trajectory generation requires limits.max_jerk")
+        self.limits = limits
+        self.num_joints = len(limits.max_velocity)
+
+    def update(
+        self,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        acceleration: np.ndarray,
+        target: np.ndarray
+    ) -> OnlineTrajectory:
+        """
+        Re-plan from the current state to a new target.
+
+        Args:
+            position: Current joint positions (rad)
+            velocity: Current joint velocities (rad/s)
+            acceleration: Current joint accelerations (rad/s²)
+            target: New target positions (rad), reached at rest
+
+        Returns:
+            Continuation starting at t = 0 from the given state
+        """
+        # Plain Python floats: the per-joint math is scalar and short
+        v_max, a_max = self.limits.max_velocity.tolist(), self.limits.max_acceleration.tolist()
+        j_max = self.limits.max_jerk.tolist()
+        p0s, v0s, a0s = np.asarray(position).tolist(), np.asarray(velocity).tolist(), \
+            np.asarray(acceleration).tolist()
+        targets = np.asarray(target, dtype=float)
+
+        # Rows of [t_start, position, velocity, acceleration, jerk] per segment
+        segments = []
+        durations = []
+        for i in range(self.num_joints):
+            seg_durations, seg_jerks = _plan_joint(
+                p0s[i], v0s[i], a0s[i], float(targets[i]), v_max[i], a_max[i], j_max[i]
+            )
+            t, p, v, a = 0.0, p0s[i], v0s[i], _clamp(a0s[i], a_max[i])
+            for T, j in zip(seg_durations, seg_jerks):
+                segments.append((t, p, v, a, j))
+                p += v * T + a * T * T / 2 + j * T * T * T / 6
+                v += a * T + j * T * T / 2
+                a += j * T
+                t += T
+            durations.append(t)
+
+        table = np.array(segments).reshape(self.num_joints, 7, 5)
+        return OnlineTrajectory(
+            t_start=table[..., 0],
+            position=table[..., 1],
+            velocity=table[..., 2],
+            acceleration=table[..., 3],
+            jerk=table[..., 4],
+            durations=np.array(durations),
+            target=targets.copy(),
+        )
+
+
+def _clamp(value: float, limit: float) -> float:
+    """Clamp a scalar to [-limit, limit]."""
+    return max(-limit, min(limit, value))
+
+
+def _velocity_change(
+    v0: float,
+    a0: float,
+    v1: float,
+    a_max: float,
+    j_max: float
+) -> Tuple[float, float, float, float, float]:
+    """
+    Minimum-time change from (v0, a0) to (v1, 0).
+
+    Ramps acceleration to a peak, optionally holds it, then ramps it back
+    to zero.
+
+    Returns:
+        Tuple of (direction, t_ramp_up, t_hold, t_ramp_down, distance)
+    """
+    # Velocity reached by bringing the acceleration straight to zero
+    v_settle = v0 + a0 * abs(a0) / (2 * j_max)
+    s = 1.0 if v1 >= v_settle else -1.0
+    dv = v1 - v0
+
+    peak_sq = (2 * j_max * s * dv + a0 * a0) / 2
+    if peak_sq <= a_max * a_max:
+        peak = s * math.sqrt(max(peak_sq, 0.0))
+        t_hold = 0.0
+    else:
+        peak = s * a_max
+        t_hold = (dv - s * (2 * a_max * a_max - a0 * a0) / (2 * j_max)) / peak
+    t_up = (peak - a0) / (s * j_max)
+    t_down = abs(peak) / j_max
+
+    # Distance over the three segments
+    jerk = s * j_max
+    d = v0 * t_up + a0 * t_up * t_up / 2 + jerk * t_up ** 3 / 6
+    v = v0 + a0 * t_up + jerk * t_up * t_up / 2
+    d += v * t_hold + peak * t_hold * t_hold / 2
+    v += peak * t_hold
+    d += v * t_down + peak * t_down * t_down / 2 - jerk * t_down ** 3 / 6
+    return s, t_up, t_hold, t_down, d
+
+
+def _stop_distance(v0: float, a_max: float, j_max: float) -> float:
+    """Distance to brake from (v0, 0) to rest; the profile is symmetric."""
+    speed = abs(v0)
+    if speed * j_max > a_max * a_max:
+        return v0 * (speed / a_max + a_max / j_max) / 2
+    return v0 * math.sqrt(speed / j_max)
+
+
+def _plan_joint(
+    p0: float,
+    v0: float,
+    a0: float,
+    target: float,
+    v_max: float,
+    a_max: float,
+    j_max: float
+) -> Tuple[list, list]:
+    """
+    Time-optimal jerk-limited motion for one joint.
+
+    Finds the peak velocity vp such that accelerating from (v0, a0) to
+    (vp, 0), cruising, and decelerating from (vp, 0) to rest covers the
+    remaining distance exactly. Cruise only happens at |vp| = v_max.
+
+    Returns:
+        Tuple of (durations, jerks) for 7 constant-jerk segments
+    """
+    a0 = _clamp(a0, a_max)
+    distance = target - p0
+
+    def travel(vp: float) -> float:
+        return _velocity_change(v0, a0, vp, a_max, j_max)[4] + _stop_distance(vp, a_max, j_max)
+
+    cruise = 0.0
+    d_high, d_low = travel(v_max), travel(-v_max)
+    if distance >= d_high:
+        vp = v_max
+        cruise = (distance - d_high) / v_max
+    elif distance <= d_low:
+        vp = -v_max
+        cruise = (d_low - distance) / v_max
+    else:
+        # Illinois regula falsi on the monotone travel(vp) - distance
+        lo, hi = -v_max, v_max
+        f_lo, f_hi = d_low - distance, d_high - distance
+        side = 0
+        vp = 0.0
+        for _ in range(MAX_ROOT_ITERATIONS):
+            vp = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+            f = travel(vp) - distance
+            if abs(f) < 1e-10:
+                break
+            if f * f_hi > 0:
+                hi, f_hi = vp, f
+                if side == 1:
+                    f_lo /= 2
+                side = 1
+            else:
+                lo, f_lo = vp, f
+                if side == -1:
+                    f_hi /= 2
+                side = -1
+
+    s1, t1, t2, t3, _ = _velocity_change(v0, a0, vp, a_max, j_max)
+    s2, t5, t6, t7, _ = _velocity_change(vp, 0.0, 0.0, a_max, j_max)
+    durations = [t1, t2, t3, cruise, t5, t6, t7]
+    jerks = [s1 * j_max, 0.0, -s1 * j_max, 0.0, s2 * j_max, 0.0, -s2 * j_max]
+    return durations, jerks
@@ -4,9 +4,25 @@ PID Controller
 Implementation of PID control with feedforward for each joint.
 """
 
+import math
+import yaml
 import numpy as np
-from typing import Optional
-from dataclasses import dataclass
+from typing import Optional, Tuple
+from dataclasses import dataclass, replace
+from enum import Enum
+
+
+class DerivativeFilter(Enum):
+    """Low-pass filter applied to the derivative path."""
+    NONE = "none"
+    FIRST_ORDER = "first_order"
+    BIQUAD = "biquad"  # 2nd-order Butterworth
+
+
+class AntiWindup(Enum):
+    """Integrator anti-windup strategy."""
+    CLAMP = "clamp"  # Clamp the integral to ±integral_limit
+    BACK_CALCULATION = "back_calculation"  # Bleed off the integral while saturated
 
 
 @dataclass
@@ -19,6 +35,77 @@ class PIDGains:
     kff_acc: float = 0.0  # Acceleration feedforward gain
     integral_limit: float = 100.0  # Anti-windup limit
     output_limit: float = 1000.0  # Output saturation
+    derivative_on_measurement: bool = False  # Differentiate -actual instead of error
+    derivative_filter: DerivativeFilter = DerivativeFilter.NONE
+    derivative_cutoff_hz: float = 100.0  # Derivative filter cutoff
+    anti_windup: AntiWindup = AntiWindup.CLAMP
+    tracking_gain: Optional[float] = None  # Back-calculation gain (1/s), ki/kp if None
+
+
+def load_pid_gains(path: str) -> list:
+    """
+    Load per-joint gains from a pid_gains.yaml file.
+
+    Args:
+        path: Path to YAML file with a `joints` section
+
+    Returns:
+        List of PIDGains in file order
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f)
+
+    gains_list = []
+    for values in data["joints"].values():
+        values = dict(values)
+        if "derivative_filter" in values:
+            values["derivative_filter"] = DerivativeFilter(values["derivative_filter"])
+        if "anti_windup" in values:
+            values["anti_windup"] = AntiWindup(values["anti_windup"])
+        gains_list.append(PIDGains(**values))
+    return gains_list
+
+
+def _derivative_filter_coefficients(
+    gains: PIDGains,
+    dt: float
+) -> Tuple[float, float, float, float, float]:
+    """
+    Discrete biquad coefficients (b0, b1, b2, a1, a2) for the D-path filter.
+
+    All filter types share the biquad form so they can be mixed across
+    joints; NONE is the identity and FIRST_ORDER uses only b0 and a1. The
+    cutoff is capped just below Nyquist.
+    """
+    if gains.derivative_filter == DerivativeFilter.NONE:
+        return 1.0, 0.0, 0.0, 0.0, 0.0
+
+    cutoff = min(gains.derivative_cutoff_hz, 0.45 / dt)
+    if gains.derivative_filter == DerivativeFilter.FIRST_ORDER:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        alpha = dt / (tau + dt)
+        return alpha, 0.0, 0.0, alpha - 1.0, 0.0
+
+    # Butterworth low-pass via bilinear transform with prewarping
+    k = math.tan(math.pi * cutoff * dt)
+    q = 1.0 / math.sqrt(2.0)
+    norm = 1.0 / (1.0 + k / q + k * k)
+    b0 = k * k * norm
+    return b0, 2 * b0, b0, 2 * (k * k - 1.0) * norm, (1.0 - k / q + k * k) * norm
+
+
+def _tracking_ratio(gains: PIDGains, kp: float, ki: float) -> float:
+    """
+    Back-calculation gain expressed in integral-of-error units (kt / ki).
+
+    `kp` and `ki` are passed separately so scheduled gains can be used.
+    Zero for joints that clamp or have no integral action.
+    """
+    if gains.anti_windup != AntiWindup.BACK_CALCULATION or ki == 0:
+        return 0.0
+    if gains.tracking_gain is not None:
+        return gains.tracking_gain / ki
+    return 1.0 / kp if kp != 0 else 0.0
 
 
 class PIDController:
@@ -28,7 +115,8 @@ class PIDController:
     Features:
     - Per-joint PID control
     - Velocity and acceleration feedforward
-    - Anti-windup with integral clamping
+    - Derivative on error or on measurement, with optional low-pass filter
+    - Anti-windup by integral clamping or back-calculation
     - Output saturation
     """
 
@@ -42,13 +130,21 @@ class PIDController:
         self.gains = gains
         self._integral = 0.0
         self._prev_error = 0.0
+        self._prev_actual: Optional[float] = None
         self._prev_time: Optional[float] = None
 
+        # Derivative filter state and coefficients for the last dt seen
+        self._filter_state = (0.0, 0.0)
+        self._filter_dt: Optional[float] = None
+        self._filter_coefficients = (1.0, 0.0, 0.0, 0.0, 0.0)
+
     def reset(self) -> None:
         """Reset controller state."""
         self._integral = 0.0
         self._prev_error = 0.0
+        self._prev_actual = None
         self._prev_time = None
+        self._filter_state = (0.0, 0.0)
 
     def compute(
         self,
@@ -72,36 +168,63 @@ class PIDController:
             Control output (torque command)
         """
         error = target - actual
+        back_calculation = self.gains.anti_windup == AntiWindup.BACK_CALCULATION
 
         # Proportional term
         p_term = self.gains.kp * error
 
-        # Integral term with anti-windup
-        self._integral += error * dt
-        self._integral = np.clip(
-            self._integral,
-            -self.gains.integral_limit,
-            self.gains.integral_limit
-        )
+        # Integral term; clamping updates before the output is formed
+        if not back_calculation:
+            self._integral += error * dt
+            self._integral = np.clip(
+                self._integral,
+                -self.gains.integral_limit,
+                self.gains.integral_limit
+            )
         i_term = self.gains.ki * self._integral
 
         # Derivative term
-        d_error = (error - self._prev_error) / dt if dt > 0 else 0.0
-        d_term = self.gains.kd * d_error
+        d_term = 0.0
+        if self._prev_actual is None:
+            self._prev_actual = actual
+        if dt > 0:
+            if self.gains.derivative_on_measurement:
+                d_input = (self._prev_actual - actual) / dt
+            else:
+                d_input = (error - self._prev_error) / dt
+            d_term = self.gains.kd * self._filter_derivative(d_input, dt)
 
         # Feedforward terms
         ff_vel = self.gains.kff_vel * target_velocity
         ff_acc = self.gains.kff_acc * target_acceleration
 
         # Total output with saturation
-        output = p_term + i_term + d_term + ff_vel + ff_acc
-        output = np.clip(output, -self.gains.output_limit, self.gains.output_limit)
+        unsaturated = p_term + i_term + d_term + ff_vel + ff_acc
+        output = np.clip(unsaturated, -self.gains.output_limit, self.gains.output_limit)
+
+        # Back-calculation: integrate error plus the saturation excess
+        if back_calculation:
+            ratio = _tracking_ratio(self.gains, self.gains.kp, self.gains.ki)
+            self._integral += (error + ratio * (output - unsaturated)) * dt
 
         # Store for next iteration
         self._prev_error = error
+        self._prev_actual = actual
 
         return output
 
+    def _filter_derivative(self, x: float, dt: float) -> float:
+        """Run one sample through the D-path filter (transposed direct form II)."""
+        if dt != self._filter_dt:
+            self._filter_coefficients = _derivative_filter_coefficients(self.gains, dt)
+            self._filter_dt = dt
+        b0, b1, b2, a1, a2 = self._filter_coefficients
+        z1, z2 = self._filter_state
+
+        y = b0 * x + z1
+        self._filter_state = (b1 * x - a1 * y + z2, b2 * x - a2 * y)
+        return y
+
 
 class MultiJointPIDController:
     """PID controller for multiple joints."""
@@ -121,6 +244,20 @@ class MultiJointPIDController:
         for controller in self.controllers:
             controller.reset()
 
+    def set_pid_gains(self, kp: np.ndarray, ki: np.ndarray, kd: np.ndarray) -> None:
+        """
+        Replace the kp/ki/kd gains of every joint, keeping the other settings.
+
+        Args:
+            kp: Proportional gains for all joints
+            ki: Integral gains for all joints
+            kd: Derivative gains for all joints
+        """
+        for i, controller in enumerate(self.controllers):
+            controller.gains = replace(
+                controller.gains, kp=float(kp[i]), ki=float(ki[i]), kd=float(kd[i])
+            )
+
     def compute(
         self,
         targets: np.ndarray,
@@ -158,3 +295,206 @@ class MultiJointPIDController:
             )
 
         return outputs
+
+
+class VectorizedPIDController:
+    """
+    Multi-joint PID controller operating on (num_joints,) arrays.
+
+    Produces the same outputs as MultiJointPIDController, but keeps gains,
+    integrals and previous errors in preallocated arrays and evaluates all
+    joints with in-place NumPy operations. With `out=` supplied, compute()
+    does not allocate. Derivative and anti-windup modes may differ per
+    joint; they are applied through masks and per-joint filter
+    coefficients rather than branches.
+    """
+
+    def __init__(self, gains_list: list):
+        """
+        Initialize vectorized PID controller.
+
+        Args:
+            gains_list: List of PIDGains for each joint
+        """
+        n = len(gains_list)
+        self.num_joints = n
+        self.gains_list = list(gains_list)
+        self.kp = np.zeros(n)
+        self.ki = np.zeros(n)
+        self.kd = np.zeros(n)
+        self.kff_vel = np.zeros(n)
+        self.kff_acc = np.zeros(n)
+        self.integral_limit = np.zeros(n)
+        self.output_limit = np.zeros(n)
+
+        # Derived per-joint arrays, refreshed by set_gains()
+        self._integral_lower = np.zeros(n)
+        self._integral_upper = np.zeros(n)
+        self._output_lower = np.zeros(n)
+        self._on_measurement = np.zeros(n, dtype=bool)
+        self._clamp_mask = np.zeros(n)
+        self._back_calc_mask = np.zeros(n)
+        self._tracking_ratio = np.zeros(n)
+        self._filter_coefficients = np.zeros((5, n))
+        self._filter_dt: Optional[float] = None
+        self.set_gains(gains_list)
+
+        self._integral = np.zeros(n)
+        self._prev_error = np.zeros(n)
+        self._prev_actual = np.zeros(n)
+        self._has_prev_actual = False
+        self._filter_z1 = np.zeros(n)
+        self._filter_z2 = np.zeros(n)
+        self._error = np.zeros(n)
+        self._term = np.zeros(n)
+        self._scratch = np.zeros(n)
+        self._filtered = np.zeros(n)
+        self._unsaturated = np.zeros(n)
+
+    def set_gains(self, gains_list: list) -> None:
+        """Copy per-joint gains into the gain arrays (in place)."""
+        if len(gains_list) != self.num_joints:
+            raise ValueError(f"Expected {self.num_joints} gains, got {len(gains_list)}")
+        self.gains_list = list(gains_list)
+        for i, gains in enumerate(gains_list):
+            self.kp[i] = gains.kp
+            self.ki[i] = gains.ki
+            self.kd[i] = gains.kd
+            self.kff_vel[i] = gains.kff_vel
+            self.kff_acc[i] = gains.kff_acc
+            self.integral_limit[i] = gains.integral_limit
+            self.output_limit[i] = gains.output_limit
+            self._on_measurement[i] = gains.derivative_on_measurement
+            back_calculation = gains.anti_windup == AntiWindup.BACK_CALCULATION
+            self._back_calc_mask[i] = float(back_calculation)
+            self._clamp_mask[i] = float(not back_calculation)
+            self._tracking_ratio[i] = _tracking_ratio(gains, gains.kp, gains.ki)
+
+        # Back-calculating joints are never clamped
+        self._integral_upper[:] = np.where(self._back_calc_mask > 0, np.inf, self.integral_limit)
+        np.negative(self._integral_upper, out=self._integral_lower)
+        np.negative(self.output_limit, out=self._output_lower)
+        self._filter_dt = None
+
+    def set_pid_gains(self, kp: np.ndarray, ki: np.ndarray, kd: np.ndarray) -> None:
+        """
+        Overwrite the kp/ki/kd arrays in place, e.g. from a gain schedule.
+
+        Args:
+            kp: Proportional gains for all joints
+            ki: Integral gains for all joints
+            kd: Derivative gains for all joints
+        """
+        self.kp[:] = kp
+        self.ki[:] = ki
+        self.kd[:] = kd
+        for i, gains in enumerate(self.gains_list):
+            self._tracking_ratio[i] = _tracking_ratio(gains, self.kp[i], self.ki[i])
+
+    def reset(self) -> None:
+        """Reset controller state."""
+        self._integral.fill(0.0)
+        self._prev_error.fill(0.0)
+        self._has_prev_actual = False
+        self._filter_z1.fill(0.0)
+        self._filter_z2.fill(0.0)
+
+    def compute(
+        self,
+        targets: np.ndarray,
+        actuals: np.ndarray,
+        dt: float,
+        target_velocities: Optional[np.ndarray] = None,
+        target_accelerations: Optional[np.ndarray] = None,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Compute PID outputs for all joints.
+
+        Args:
+            targets: Target positions for all joints
+            actuals: Actual positions for all joints
+            dt: Time step (s)
+            target_velocities: Target velocities (optional)
+            target_accelerations: Target accelerations (optional)
+            out: Output buffer of shape (num_joints,). Allocated if None.
+
+        Returns:
+            Control outputs for all joints (`out` if given)
+        """
+        if out is None:
+            out = np.empty(self.num_joints)
+        error, term, scratch = self._error, self._term, self._scratch
+
+        np.subtract(targets, actuals, out=error)
+        if not self._has_prev_actual:
+            self._prev_actual[:] = actuals
+            self._has_prev_actual = True
+
+        # Proportional term
+        np.multiply(self.kp, error, out=out)
+
+        # Integral term; clamping joints update before the output is formed
+        np.multiply(error, dt, out=term)
+        term *= self._clamp_mask
+        self._integral += term
+        np.clip(self._integral, self._integral_lower, self._integral_upper, out=self._integral)
+        np.multiply(self.ki, self._integral, out=term)
+        out += term
+
+        # Derivative term
+        if dt > 0:
+            np.subtract(error, self._prev_error, out=term)
+            np.subtract(self._prev_actual, actuals, out=scratch)
+            np.copyto(term, scratch, where=self._on_measurement)
+            term /= dt
+            self._filter_derivative(term, dt)
+            np.multiply(self.kd, self._filtered, out=term)
+            out += term
+
+        # Feedforward terms
+        if target_velocities is not None:
+            np.multiply(self.kff_vel, target_velocities, out=term)
+            out += term
+        if target_accelerations is not None:
+            np.multiply(self.kff_acc, target_accelerations, out=term)
+            out += term
+
+        # Output saturation
+        self._unsaturated[:] = out
+        np.clip(out, self._output_lower, self.output_limit, out=out)
+
+        # Back-calculation: integrate error plus the saturation excess
+        np.subtract(out, self._unsaturated, out=term)
+        term *= self._tracking_ratio
+        term += error
+        term *= dt
+        term *= self._back_calc_mask
+        self._integral += term
+
+        # Store for next iteration
+        self._prev_error[:] = error
+        self._prev_actual[:] = actuals
+
+        return out
+
+    def _filter_derivative(self, x: np.ndarray, dt: float) -> None:
+        """Run one sample through the per-joint D-path biquads into self._filtered."""
+        if dt != self._filter_dt:
+            for i, gains in enumerate(self.gains_list):
+                self._filter_coefficients[:, i] = _derivative_filter_coefficients(gains, dt)
+            self._filter_dt = dt
+        b0, b1, b2, a1, a2 = self._filter_coefficients
+        y, z1, z2, scratch = self._filtered, self._filter_z1, self._filter_z2, self._unsaturated
+
+        np.multiply(b0, x, out=y)
+        y += z1
+
+        np.multiply(b1, x, out=z1)
+        np.multiply(a1, y, out=scratch)
+        z1 -= scratch
+        z1 += z2
+
+        np.multiply(b2, x, out=z2)
+        np.multiply(a2, y, out=scratch)
+        z2 -= scratch
@@ -7,10 +7,27 @@ Requires PREEMPT_RT kernel for deterministic timing.
 
 import time
 import threading
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, Tuple
 from dataclasses import dataclass
 import numpy as np
 
+from .feedforward import FeedforwardCompensator
+from .loop_timing import (
+    DeadlineScheduler,
+    LoopTimingMonitor,
+    LoopTimingStats,
+    StageTimer,
+    StageTimingExporter,
+    StageTimingReport,
+)
+from .setpoint_mailbox import HAS_ACCELERATION, HAS_TORQUE, HAS_VELOCITY, SetpointMailbox
+from .state_history import StateHistory
+from .trajectory_planner import Trajectory, TrajectoryPoint
+
+
+# Control-cycle stages, in order, as probed by RealtimeController.stage_timer
+CONTROL_STAGES = ("read_sensors", "safety_check", "compute_control", "send_commands")
+
 
 @dataclass
 class ControllerConfig:
@@ -19,6 +36,9 @@ class ControllerConfig:
     watchdog_timeout_ms: float = 100.0
     enable_feedforward: bool = True
     safety_check_enabled: bool = True
+    busy_wait_us: float = 200.0  # Spin this long before each deadline instead of sleeping
+    stage_budget_share: float = 0.5  # Flag stages whose p99 exceeds this fraction of the period
+    timing_export_interval_s: float = 1.0
 
 
 @dataclass
@@ -28,6 +48,22 @@ class JointState:
     velocities: np.ndarray  # Joint velocities (rad/s)
     torques: np.ndarray  # Joint torques (Nm)
     timestamp: float
+    timing: Optional[LoopTimingStats] = None  # Control-loop timing when the state was read
+
+    @classmethod
+    def from_record(
+        cls,
+        record: np.ndarray,
+        timing: Optional[LoopTimingStats] = None
+    ) -> "JointState":
+        """Wrap a StateHistory record; the arrays are views into it."""
+        return cls(
+            positions=record["positions"],
+            velocities=record["velocities"],
+            torques=record["torques"],
+            timestamp=float(record["timestamp"]),
+            timing=timing,
+        )
 
 
 class RealtimeController:
@@ -39,31 +75,61 @@ class RealtimeController:
     - Safety monitoring
     - PID control with feedforward
     - EtherCAT communication
+    - Absolute-deadline scheduling with period/compute/overrun histograms
+    - Per-stage timing probes aggregated by a background exporter
 
     Attributes:
         config: Controller configuration
         running: Whether the control loop is running
-        current_state: Current joint state
+        current_state: Current joint state (latest entry of state_history)
+        state_history: Ring buffer of joint states, written in place every cycle
+        timing: Loop timing histograms, recorded every cycle
+        stage_timer: Per-stage timestamps, recorded every cycle
+        stage_exporter: Background p50/p99/max aggregation of stage_timer
     """
 
-    def __init__(self, config: Optional[ControllerConfig] = None):
+    def __init__(
+        self,
+        config: Optional[ControllerConfig] = None,
+        feedforward: Optional[FeedforwardCompensator] = None
+    ):
         """
         Initialize the real-time controller.
 
         Args:
             config: Controller configuration. Uses defaults if None.
+            feedforward: Compensator whose precomputed torque tables are
+                        checked for staleness in set_trajectory (optional)
         """
         self.config = config or ControllerConfig()
         self.running = False
-        self.current_state: Optional[JointState] = None
+        self.state_history = StateHistory()
+        self.timing = LoopTimingMonitor()
+        self.stage_timer = StageTimer(CONTROL_STAGES)
+        self.stage_exporter = StageTimingExporter(
+            self.stage_timer,
+            int(1e9 / self.config.loop_frequency_hz),
+            budget_share=self.config.stage_budget_share,
+            interval_s=self.config.timing_export_interval_s,
+        )
         self._control_thread: Optional[threading.Thread] = None
         self._target_joints: Optional[np.ndarray] = None
+        self._target_velocity: Optional[np.ndarray] = None
+        self._target_acceleration: Optional[np.ndarray] = None
+        self._target_torque: Optional[np.ndarray] = None
+        self._setpoint_stream: Optional[Iterator[TrajectoryPoint]] = None
+        self._setpoints = SetpointMailbox()
+        self._stream_sequence = 0  # Mailbox sequence superseded by the active stream
+        # Trajectory handed over by set_trajectory, adopted by the loop
+        self._pending_trajectory: Optional[Tuple[Iterator[TrajectoryPoint], int]] = None
+        self._trajectory_lock = threading.Lock()
 
         # Initialize subsystems (lazy loading)
         self._kinematics = None
         self._pid_controllers = None
         self._safety_monitor = None
         self._ethercat_master = None
+        self._feedforward = feedforward
 
     def start(self) -> None:
         """Start the real-time control loop."""
@@ -71,6 +137,9 @@ class RealtimeController:
             raise RuntimeError("Controller is already running")
 
         self.running = True
+        self.timing.reset()
+        self.stage_timer.reset()
+        self.stage_exporter.start()
         self._control_thread = threading.Thread(
             target=self._control_loop,
             daemon=True,
@@ -83,6 +152,7 @@ class RealtimeController:
         self.running = False
         if self._control_thread is not None:
             self._control_thread.join(timeout=1.0)
+        self.stage_exporter.stop()
 
     def set_target(self, target_joints: np.ndarray) -> None:
         """
@@ -91,48 +161,218 @@ class RealtimeController:
         Args:
             target_joints: Target joint positions (rad)
         """
-        self._target_joints = target_joints.copy()
+        self.set_setpoint(target_joints)
+
+    def set_setpoint(
+        self,
+        position: np.ndarray,
+        velocity: Optional[np.ndarray] = None,
+        acceleration: Optional[np.ndarray] = None,
+        torque_ff: Optional[np.ndarray] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Hand a complete setpoint to the control loop.
+
+        Safe to call from any thread. The loop picks up the whole setpoint
+        atomically at the start of its next compute stage and cancels any
+        active trajectory; the caller never blocks the loop.
+
+        Args:
+            position: Target joint positions (rad)
+            velocity: Target joint velocities (rad/s, optional)
+            acceleration: Target joint accelerations (rad/s², optional)
+            torque_ff: Feedforward torques (Nm, optional)
+            timestamp: Setpoint time (s, optional)
+        """
+        self._setpoints.write(position, velocity, acceleration, torque_ff, timestamp)
+
+    def set_trajectory(self, trajectory: Iterable[TrajectoryPoint]) -> None:
+        """
+        Follow a trajectory, pulling one setpoint per control cycle.
+
+        Accepts a planned Trajectory or a streaming generator such as
+        TrajectoryPlanner.stream_waypoints. When the trajectory is
+        exhausted the last setpoint is held.
+
+        Safe to call from any thread: the trajectory is parked in a
+        pending slot and the loop adopts it, replacing any active one, at
+        the start of its next compute stage. Setpoints written before this
+        call are superseded by the trajectory; later ones cancel it.
+
+        A planned Trajectory's feedforward torque table is recomputed here,
+        outside the loop, if it is missing or was built with stale dynamics
+        parameters or payload; the loop then only indexes it.
+
+        Args:
+            trajectory: Iterable of trajectory points at the loop rate
+        """
+        if self._feedforward is not None and isinstance(trajectory, Trajectory):
+            self._feedforward.ensure_current(trajectory)
+        stream = iter(trajectory)
+        with self._trajectory_lock:
+            self._pending_trajectory = (stream, self._setpoints.sequence)
+
+    @property
+    def current_state(self) -> Optional[JointState]:
+        """Latest joint state, as views into the state history (None if none yet)."""
+        record = self.state_history.latest()
+        return None if record is None else JointState.from_record(record)
+
+    @current_state.setter
+    def current_state(self, state: JointState) -> None:
+        self.state_history.push(state.positions, state.velocities, state.torques,
+                                state.timestamp)
 
     def get_state(self) -> Optional[JointState]:
-        """Get current joint state."""
-        return self.current_state
+        """
+        Get current joint state, including loop timing statistics.
+
+        The arrays are zero-copy views into the state history and are
+        overwritten after StateHistory.capacity further cycles.
+        """
+        record = self.state_history.latest()
+        if record is None:
+            return None
+        return JointState.from_record(record, timing=self.timing.stats())
+
+    def get_recent_states(self, n: int) -> np.ndarray:
+        """
+        Get up to the last `n` joint states without copying.
+
+        Returns:
+            Structured array view (oldest first) with positions, velocities,
+            torques and timestamp fields; see StateHistory.last
+        """
+        return self.state_history.last(n)
+
+    def get_timing_stats(self) -> LoopTimingStats:
+        """Get loop period, compute time and overrun statistics."""
+        return self.timing.stats()
+
+    def get_stage_timing(self) -> Optional[StageTimingReport]:
+        """Get the latest per-stage timing report (None before the first export)."""
+        return self.stage_exporter.latest
 
     def _control_loop(self) -> None:
         """Main control loop running at configured frequency."""
         period_ns = int(1e9 / self.config.loop_frequency_hz)
+        scheduler = DeadlineScheduler(period_ns, int(self.config.busy_wait_us * 1000))
+        scheduler.start()
+        previous_start: Optional[int] = None
+        stages = self.stage_timer
+        history = self.state_history
 
         while self.running:
             loop_start = time.perf_counter_ns()
+            stages.begin(loop_start)
 
             try:
-                # 1. Read sensors
-                self._read_sensors()
+                # 1. Read sensors straight into the next history row
+                if self._read_sensors(history.begin()):
+                    history.commit()
+                stages.mark(0)
 
                 # 2. Safety check
                 if self.config.safety_check_enabled:
                     self._safety_check()
+                stages.mark(1)
 
                 # 3. Compute control
+                self._receive_setpoint()
+                if self._setpoint_stream is not None:
+                    self._advance_setpoint()
+
+                commands = None
                 if self._target_joints is not None:
                     commands = self._compute_control()
+                stages.mark(2)
 
-                    # 4. Send commands
+                # 4. Send commands
+                if commands is not None:
                     self._send_commands(commands)
+                stages.mark(3)
+                stages.end()
 
             except Exception as e:
                 # Log error and trigger safety stop
                 self._emergency_stop(str(e))
                 break
 
-            # Enforce cycle time
-            elapsed_ns = time.perf_counter_ns() - loop_start
-            if elapsed_ns < period_ns:
-                time.sleep((period_ns - elapsed_ns) / 1e9)
+            # Wait for the next absolute deadline, then log this cycle
+            compute_ns = time.perf_counter_ns() - loop_start
+            overrun = scheduler.wait()
+            period = loop_start - previous_start if previous_start is not None else None
+            self.timing.record(period, compute_ns, overrun)
+            self.timing.missed_deadlines = scheduler.missed_deadlines
+            previous_start = loop_start
 
-    def _read_sensors(self) -> None:
-        """Read sensor data from EtherCAT network."""
+    def _receive_setpoint(self) -> None:
+        """
+        Apply a trajectory or setpoint handed over since the last cycle.
+
+        Only the loop calls this, so only the loop changes the active
+        stream and its superseded mailbox sequence.
+        """
+        if self._pending_trajectory is not None:
+            self._adopt_trajectory()
+
+        mailbox = self._setpoints
+        if not mailbox.read() or mailbox.read_sequence <= self._stream_sequence:
+            return
+
+        # Views into the mailbox snapshot stay valid until the next new setpoint
+        setpoint = mailbox.snapshot
+        fields = int(setpoint["fields"])
+        self._setpoint_stream = None
+        self._target_joints = setpoint["position"]
+        self._target_velocity = setpoint["velocity"] if fields & HAS_VELOCITY else None
+        self._target_acceleration = (
+            setpoint["acceleration"] if fields & HAS_ACCELERATION else None
+        )
+        self._target_torque = setpoint["torque_ff"] if fields & HAS_TORQUE else None
+
+    def _adopt_trajectory(self) -> None:
+        """Make the pending trajectory the active stream."""
+        # Never wait on a caller thread; a contended handoff is retried next cycle
+        if not self._trajectory_lock.acquire(blocking=False):
+            return
+        try:
+            pending, self._pending_trajectory = self._pending_trajectory, None
+        finally:
+            self._trajectory_lock.release()
+        if pending is not None:
+            self._setpoint_stream, self._stream_sequence = pending
+
+    def _advance_setpoint(self) -> None:
+        """Pull the next setpoint from the active trajectory stream."""
+        try:
+            point = next(self._setpoint_stream)
+        except StopIteration:
+            # Hold the final setpoint at rest
+            self._setpoint_stream = None
+            self._target_velocity = None
+            self._target_acceleration = None
+            self._target_torque = None
+            return
+
+        self._target_joints = point.position
+        self._target_velocity = point.velocity
+        self._target_acceleration = point.acceleration
+        self._target_torque = point.torque
+
+    def _read_sensors(self, state: np.ndarray) -> bool:
+        """
+        Read sensor data from EtherCAT network.
+
+        Args:
+            state: StateHistory record to fill in place
+
+        Returns:
+            True if `state` was filled with a new sample
+        """
         # TODO: Implement EtherCAT sensor reading
-        pass
+        return False
 
     def _safety_check(self) -> None:
         """Perform safety checks on current state."""
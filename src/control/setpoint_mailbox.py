@@ -0,0 +1,169 @@
+"""
+Setpoint Mailbox
+
+Seqlock-protected hand-over of complete setpoints from planner/ML threads
+to the realtime control loop.
+"""
+
+import time
+import threading
+import numpy as np
+from typing import Optional
+
+
+# Bits of the `fields` member marking which optional parts were written
+HAS_VELOCITY = 1
+HAS_ACCELERATION = 2
+HAS_TORQUE = 4
+
+
+def setpoint_dtype(num_joints: int) -> np.dtype:
+    """
+    Structured dtype of one setpoint.
+
+    Args:
+        num_joints: Number of joints
+
+    Returns:
+        dtype with position, velocity, acceleration, torque_ff (num_joints,),
+        timestamp and a `fields` bitmask
+    """
+    return np.dtype([
+        ("position", np.float64, (num_joints,)),
+        ("velocity", np.float64, (num_joints,)),
+        ("acceleration", np.float64, (num_joints,)),
+        ("torque_ff", np.float64, (num_joints,)),
+        ("timestamp", np.float64),
+        ("fields", np.uint8),
+    ])
+
+
+class SetpointMailbox:
+    """
+    Single-reader, multi-writer setpoint exchange.
+
+    Writers serialize among themselves with a lock, bump a sequence number
+    to odd, copy the setpoint into a shared record and bump the sequence
+    back to even. The reader never takes the lock: it copies the record
+    and accepts the copy only if the sequence was even and unchanged
+    across the copy. After a bounded number of torn attempts it gives up
+    for this cycle and keeps the previous setpoint, so a writer can never
+    stall the control loop.
+
+    Accepted setpoints go into one of two reader-owned slots, alternating,
+    so views into `snapshot` stay valid until the next successful read.
+    """
+
+    def __init__(self, num_joints: int = 6, max_read_attempts: int = 4):
+        """
+        Initialize mailbox.
+
+        Args:
+            num_joints: Number of joints
+            max_read_attempts: Copies tried per read before giving up
+        """
+        self.num_joints = num_joints
+        self.max_read_attempts = max_read_attempts
+        self._record = np.zeros((), dtype=setpoint_dtype(num_joints))
+        self._sequence = 0
+        self._write_lock = threading.Lock()
+
+        self._slots = np.zeros(2, dtype=self._record.dtype)
+        self._current = 0
+        self.read_sequence = 0
+        self.contended_reads = 0
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last completed write (0 if none)."""
+        return self._sequence & ~1
+
+    @property
+    def snapshot(self) -> np.ndarray:
+        """The last setpoint accepted by read() (0-d structured array)."""
+        return self._slots[self._current, ...]
+
+    def write(
+        self,
+        position: np.ndarray,
+        velocity: Optional[np.ndarray] = None,
+        acceleration: Optional[np.ndarray] = None,
+        torque_ff: Optional[np.ndarray] = None,
+        timestamp: Optional[float] = None
+    ) -> int:
+        """
+        Publish a setpoint.
+
+        Args:
+            position: Target joint positions (rad)
+            velocity: Target joint velocities (rad/s, optional)
+            acceleration: Target joint accelerations (rad/s², optional)
+            torque_ff: Feedforward torques (Nm, optional)
+            timestamp: Setpoint time (s); defaults to time.monotonic()
+
+        Returns:
+            Sequence number of this setpoint
+
+        Raises:
+            ValueError: If an array does not have shape (num_joints,)
+        """
+        # Convert and check everything first; a failure while the sequence is odd
+        # would leave it odd and hide every later write from the reader
+        position = self._joint_array(position, "position")
+        fields = 0
+        if velocity is not None:
+            velocity = self._joint_array(velocity, "velocity")
+            fields |= HAS_VELOCITY
+        if acceleration is not None:
+            acceleration = self._joint_array(acceleration, "acceleration")
+            fields |= HAS_ACCELERATION
+        if torque_ff is not None:
+            torque_ff = self._joint_array(torque_ff, "torque_ff")
+            fields |= HAS_TORQUE
+        timestamp = time.monotonic() if timestamp is None else float(timestamp)
+
+        record = self._record
+        with self._write_lock:
+            sequence = self._sequence + 1
+            self._sequence = sequence
+            record["position"] = position
+            record["velocity"] = 0.0 if velocity is None else velocity
+            record["acceleration"] = 0.0 if acceleration is None else acceleration
+            record["torque_ff"] = 0.0 if torque_ff is None else torque_ff
+            record["timestamp"] = timestamp
+            record["fields"] = fields
+            self._sequence = sequence + 1
+        return sequence + 1
+
+    def _joint_array(self, values: np.ndarray, name: str) -> np.ndarray:
+        """Convert a setpoint part to a float array of shape (num_joints,)."""
+        array = np.asarray(values, dtype=float)
+        if array.shape != (self.num_joints,):
+            raise ValueError(
+                f"Setpoint {name} must have shape ({self.num_joints},), got {array.shape}"
+            )
+        return array
+
+    def read(self) -> bool:
+        """
+        Take the latest setpoint if a new one was written.
+
+        Called from the control loop only; never blocks.
+
+        Returns:
+            True if `snapshot` now holds a newer setpoint
+        """
+        slot = self._slots[1 - self._current, ...]
+        for _ in range(self.max_read_attempts):
+            sequence = self._sequence
+            if sequence == self.read_sequence:
+                return False
+            if sequence & 1:
+                continue
+            slot[...] = self._record
+            if self._sequence == sequence:
+                self._current = 1 - self._current
+                self.read_sequence = sequence
+                return True
+        self.contended_reads += 1
+        return False
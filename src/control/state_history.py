@@ -0,0 +1,126 @@
+"""
+State History
+
+Preallocated ring buffer of joint states written in place by the
+realtime control loop.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+def joint_state_dtype(num_joints: int) -> np.dtype:
+    """
+    Structured dtype of one joint state record.
+
+    Args:
+        num_joints: Number of joints
+
+    Returns:
+        dtype with positions, velocities, torques (num_joints,) and timestamp
+    """
+    return np.dtype([
+        ("positions", np.float64, (num_joints,)),
+        ("velocities", np.float64, (num_joints,)),
+        ("torques", np.float64, (num_joints,)),
+        ("timestamp", np.float64),
+    ])
+
+
+class StateHistory:
+    """
+    Fixed-size history of joint states.
+
+    The writer fills the row returned by begin() in place and publishes
+    it with commit(), so recording a state allocates nothing. Each row is
+    stored twice, at i and i + capacity, so the newest n rows always form
+    one contiguous slice and last(n) can return a view instead of a copy.
+
+    Views are read without locking and stay correct until the writer laps
+    them: a row read through last() is overwritten capacity cycles after
+    it was written. Copy anything that must live longer.
+    """
+
+    def __init__(self, num_joints: int = 6, capacity: int = 4096):
+        """
+        Initialize state history.
+
+        Args:
+            num_joints: Number of joints
+            capacity: Number of states kept
+        """
+        if capacity < 2:
+            raise ValueError("State history capacity must be at least 2")
+        self.num_joints = num_joints
+        self.capacity = capacity
+        self._buffer = np.zeros(2 * capacity, dtype=joint_state_dtype(num_joints))
+        self.count = 0
+
+    def begin(self) -> np.ndarray:
+        """
+        Row for the next state, to be filled in place before commit().
+
+        Returns:
+            0-d structured view into the buffer
+        """
+        return self._buffer[self.count % self.capacity, ...]
+
+    def commit(self) -> None:
+        """Publish the row returned by begin()."""
+        index = self.count % self.capacity
+        self._buffer[index + self.capacity] = self._buffer[index]
+        self.count += 1
+
+    def push(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        torques: np.ndarray,
+        timestamp: float
+    ) -> None:
+        """
+        Record a state from separate arrays.
+
+        Args:
+            positions: Joint positions (rad)
+            velocities: Joint velocities (rad/s)
+            torques: Joint torques (Nm)
+            timestamp: State time (s)
+        """
+        row = self.begin()
+        row["positions"] = positions
+        row["velocities"] = velocities
+        row["torques"] = torques
+        row["timestamp"] = timestamp
+        self.commit()
+
+    def reset(self) -> None:
+        """Discard all states."""
+        self.count = 0
+
+    def latest(self) -> Optional[np.ndarray]:
+        """
+        Most recent state.
+
+        Returns:
+            0-d structured view, or None if nothing was recorded
+        """
+        if self.count == 0:
+            return None
+        return self._buffer[(self.count - 1) % self.capacity + self.capacity, ...]
+
+    def last(self, n: int) -> np.ndarray:
+        """
+        The newest states, oldest first, without copying.
+
+        Args:
+            n: Number of states; limited to the states recorded and to
+               capacity - 1 (the row being written is never included)
+
+        Returns:
+            Structured view of shape (min(n, available),); fields are
+            accessed as e.g. `history.last(100)["positions"]`
+        """
+        n = max(0, min(n, self.count, self.capacity - 1))
+        end = (self.count - 1) % self.capacity + self.capacity + 1
+        return self._buffer[end - n:end]
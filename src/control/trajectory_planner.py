@@ -5,15 +5,36 @@ Generates smooth trajectories between waypoints with velocity and acceleration l
 """
 
 import numpy as np
-from typing import List, Optional, Tuple
+from scipy.interpolate import make_interp_spline
+from enum import Enum, auto
+from typing import Callable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
+from .feedforward import FeedforwardCompensator
+
+
+SAMPLE_TIME = 0.001  # 1ms control period
+
+
+class ProfileType(Enum):
+    """Time-scaling profiles for point-to-point motion."""
+    QUINTIC = auto()  # Quintic smooth-step over a heuristic duration
+    TRAPEZOIDAL = auto()  # Minimum-time, acceleration-limited
+    S_CURVE = auto()  # Minimum-time, jerk-limited (7-segment double S)
+
+
+class SplineType(Enum):
+    """Global spline fits for blended multi-waypoint motion."""
+    CUBIC = 3  # C2, zero velocity at the ends
+    QUINTIC = 5  # C4, zero velocity and acceleration at the ends
+
 
 @dataclass
 class TrajectoryLimits:
-    """Velocity and acceleration limits for trajectory generation."""
+    """Velocity, acceleration and jerk limits for trajectory generation."""
     max_velocity: np.ndarray  # rad/s per joint
     max_acceleration: np.ndarray  # rad/s² per joint
+    max_jerk: Optional[np.ndarray] = None  # rad/s³ per joint (S_CURVE only)
 
 
 @dataclass
@@ -23,6 +44,234 @@ class TrajectoryPoint:
     velocity: np.ndarray  # Joint velocities (rad/s)
     acceleration: np.ndarray  # Joint accelerations (rad/s²)
     time: float  # Time from trajectory start (s)
+    torque: Optional[np.ndarray] = None  # Precomputed feedforward torque (Nm)
+
+
+@dataclass
+class Trajectory:
+    """
+    Array-backed trajectory sampled at a fixed control period.
+
+    Stores every sample in contiguous arrays instead of one
+    TrajectoryPoint per millisecond. Behaves like a read-only sequence of
+    TrajectoryPoint (len, indexing, iteration) so existing callers keep
+    working; slicing returns a Trajectory that views the same memory.
+
+    `torque` optionally holds a feedforward torque table precomputed at
+    planning time (see FeedforwardCompensator.attach), stamped with the
+    compensator's cache key so stale tables can be detected.
+    """
+    time: np.ndarray  # (N,) time from trajectory start (s)
+    position: np.ndarray  # (N, num_joints) joint positions (rad)
+    velocity: np.ndarray  # (N, num_joints) joint velocities (rad/s)
+    acceleration: np.ndarray  # (N, num_joints) joint accelerations (rad/s²)
+    torque: Optional[np.ndarray] = None  # (N, num_joints) feedforward torque (Nm)
+    feedforward_key: Optional[tuple] = None  # Compensator state the torque was built with
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TrajectoryPoint, "Trajectory"]:
+        torque = self.torque[index] if self.torque is not None else None
+        if isinstance(index, slice):
+            return Trajectory(
+                time=self.time[index],
+                position=self.position[index],
+                velocity=self.velocity[index],
+                acceleration=self.acceleration[index],
+                torque=torque,
+                feedforward_key=self.feedforward_key,
+            )
+        return TrajectoryPoint(
+            position=self.position[index],
+            velocity=self.velocity[index],
+            acceleration=self.acceleration[index],
+            time=float(self.time[index]),
+            torque=torque,
+        )
+
+    def __iter__(self) -> Iterator[TrajectoryPoint]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def duration(self) -> float:
+        """Time of the last sample (s)."""
+        return float(self.time[-1]) if len(self.time) else 0.0
+
+    def to_points(self) -> List[TrajectoryPoint]:
+        """Materialize as a list of TrajectoryPoint (compatibility view)."""
+        return list(self)
+
+    @classmethod
+    def concatenate(cls, segments: List["Trajectory"]) -> "Trajectory":
+        """
+        Join segments end to end.
+
+        Each segment's time is shifted to start where the previous one
+        ended, and its first sample (the shared waypoint) is dropped.
+        Torque tables are kept only if every segment has one built with
+        the same compensator state.
+        """
+        times, parts = [], []
+        offset = 0.0
+        for i, segment in enumerate(segments):
+            part = segment if i == 0 else segment[1:]
+            times.append(part.time + offset)
+            parts.append(part)
+            offset += segment.duration
+
+        keys = {segment.feedforward_key for segment in segments}
+        has_torque = all(segment.torque is not None for segment in segments) and len(keys) == 1
+        return cls(
+            time=np.concatenate(times),
+            position=np.concatenate([p.position for p in parts]),
+            velocity=np.concatenate([p.velocity for p in parts]),
+            acceleration=np.concatenate([p.acceleration for p in parts]),
+            torque=np.concatenate([p.torque for p in parts]) if has_torque else None,
+            feedforward_key=keys.pop() if has_torque else None,
+        )
+
+
+@dataclass
+class MotionProfile:
+    """
+    Scalar motion built from constant-jerk segments.
+
+    Segment k starts at `t_start[k]` with state (position, velocity,
+    acceleration) and applies `jerk[k]` until the next segment. Evaluation
+    is closed form and vectorized over time.
+    """
+    t_start: np.ndarray  # (K,) segment start times (s)
+    position: np.ndarray  # (K,) position at segment start
+    velocity: np.ndarray  # (K,) velocity at segment start
+    acceleration: np.ndarray  # (K,) acceleration at segment start
+    jerk: np.ndarray  # (K,) constant jerk within segment
+    duration: float  # Total duration (s)
+
+    @classmethod
+    def from_segments(
+        cls,
+        durations: List[float],
+        jerks: List[float],
+        accelerations: Optional[List[float]] = None,
+        p0: float = 0.0,
+        v0: float = 0.0,
+        a0: float = 0.0
+    ) -> "MotionProfile":
+        """
+        Integrate segment start states from an initial state.
+
+        Args:
+            durations: Segment durations (s)
+            jerks: Constant jerk per segment
+            accelerations: Acceleration at each segment start. Lets
+                          acceleration step between segments (trapezoidal
+                          profiles); integrated from `a0` if None.
+            p0, v0, a0: Initial state
+        """
+        n = len(durations)
+        t_start = np.zeros(n)
+        position, velocity, acceleration = np.zeros(n), np.zeros(n), np.zeros(n)
+
+        t, p, v, a = 0.0, p0, v0, a0
+        for k, (T, j) in enumerate(zip(durations, jerks)):
+            if accelerations is not None:
+                a = accelerations[k]
+            t_start[k], position[k], velocity[k], acceleration[k] = t, p, v, a
+            p = p + v * T + a * T * T / 2 + j * T ** 3 / 6
+            v = v + a * T + j * T * T / 2
+            a = a + j * T
+            t += T
+
+        return cls(t_start, position, velocity, acceleration, np.asarray(jerks, float), t)
+
+    def evaluate(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate position, velocity and acceleration at times `t`.
+
+        Times outside [0, duration] are clamped to the end points.
+        """
+        t = np.clip(t, 0.0, self.duration)
+        k = np.clip(np.searchsorted(self.t_start, t, side="right") - 1, 0, len(self.t_start) - 1)
+        dt = t - self.t_start[k]
+        j, a, v = self.jerk[k], self.acceleration[k], self.velocity[k]
+        return (
+            self.position[k] + v * dt + a * dt * dt / 2 + j * dt ** 3 / 6,
+            v + a * dt + j * dt * dt / 2,
+            a + j * dt,
+        )
+
+    def time_scaled(self, factor: float) -> "MotionProfile":
+        """Stretch the profile in time by `factor` (> 1 slows it down)."""
+        return MotionProfile(
+            t_start=self.t_start * factor,
+            position=self.position,
+            velocity=self.velocity / factor,
+            acceleration=self.acceleration / factor ** 2,
+            jerk=self.jerk / factor ** 3,
+            duration=self.duration * factor,
+        )
+
+
+def trapezoidal_profile(distance: float, v_max: float, a_max: float) -> MotionProfile:
+    """
+    Minimum-time rest-to-rest profile under velocity/acceleration limits.
+
+    Args:
+        distance: Distance to travel (> 0)
+        v_max: Velocity limit
+        a_max: Acceleration limit
+    """
+    t_acc = v_max / a_max
+    if a_max * t_acc * t_acc > distance:
+        # Triangular: v_max is never reached
+        t_acc = np.sqrt(distance / a_max)
+        t_const = 0.0
+    else:
+        t_const = distance / v_max - t_acc
+
+    return MotionProfile.from_segments(
+        durations=[t_acc, t_const, t_acc],
+        jerks=[0.0, 0.0, 0.0],
+        accelerations=[a_max, 0.0, -a_max],
+    )
+
+
+def s_curve_profile(distance: float, v_max: float, a_max: float, j_max: float) -> MotionProfile:
+    """
+    Minimum-time rest-to-rest double-S profile under v/a/j limits.
+
+    Args:
+        distance: Distance to travel (> 0)
+        v_max: Velocity limit
+        a_max: Acceleration limit
+        j_max: Jerk limit
+    """
+    # Acceleration phase that reaches v_max
+    if v_max * j_max >= a_max * a_max:
+        t_jerk = a_max / j_max
+        t_acc = t_jerk + v_max / a_max
+    else:
+        t_jerk = np.sqrt(v_max / j_max)
+        t_acc = 2 * t_jerk
+    t_const = distance / v_max - t_acc
+
+    if t_const < 0:
+        # v_max not reached: the peak velocity is set by the distance
+        t_const = 0.0
+        t_jerk = a_max / j_max
+        t_acc = (t_jerk + np.sqrt(t_jerk * t_jerk + 4 * distance / a_max)) / 2
+        if t_acc < 2 * t_jerk:
+            # a_max not reached either
+            t_jerk = np.cbrt(distance / (2 * j_max))
+            t_acc = 2 * t_jerk
+
+    t_flat = t_acc - 2 * t_jerk
+    return MotionProfile.from_segments(
+        durations=[t_jerk, t_flat, t_jerk, t_const, t_jerk, t_flat, t_jerk],
+        jerks=[j_max, 0.0, -j_max, 0.0, -j_max, 0.0, j_max],
+    )
 
 
 class TrajectoryPlanner:
@@ -31,74 +280,84 @@ class TrajectoryPlanner:
 
     Supports:
     - Point-to-point motion with trapezoidal velocity profile
-    - Multi-waypoint trajectories
-    - Cubic and quintic spline interpolation
+    - Minimum-time, joint-synchronized trapezoidal and S-curve profiles
+    - Multi-waypoint trajectories (stop at each waypoint)
+    - Cubic and quintic spline interpolation (pass through waypoints)
+    - Feedforward torque tables precomputed with each planned trajectory
     """
 
-    def __init__(self, limits: TrajectoryLimits, num_joints: int = 6):
+    def __init__(
+        self,
+        limits: TrajectoryLimits,
+        num_joints: int = 6,
+        profile: ProfileType = ProfileType.QUINTIC,
+        feedforward: Optional[FeedforwardCompensator] = None
+    ):
         """
         Initialize trajectory planner.
 
         Args:
-            limits: Velocity and acceleration limits
+            limits: Velocity, acceleration (and jerk) limits
             num_joints: Number of robot joints
+            profile: Time-scaling profile used for point-to-point segments
+            feedforward: If given, planned trajectories carry a precomputed
+                        feedforward torque table
         """
         self.limits = limits
         self.num_joints = num_joints
+        self.profile = profile
+        self.feedforward = feedforward
+
+        if profile == ProfileType.S_CURVE and limits.max_jerk is None:
+            raise ValueError("S_CURVE profile requires limits.max_jerk")
 
     def plan_point_to_point(
         self,
         start: np.ndarray,
         end: np.ndarray,
         duration: Optional[float] = None
-    ) -> List[TrajectoryPoint]:
+    ) -> Trajectory:
         """
         Plan point-to-point trajectory with trapezoidal velocity profile.
 
         Args:
             start: Start joint positions (rad)
             end: End joint positions (rad)
-            duration: Desired duration (s). Auto-computed if None.
+            duration: Desired duration (s). Auto-computed if None. For the
+                     minimum-time profiles a longer duration slows the
+                     motion down; a shorter one is raised to the minimum.
 
         Returns:
-            List of trajectory points sampled at 1kHz
+            Trajectory sampled at 1kHz
         """
-        delta = end - start
+        return self._with_feedforward(self._sample_point_to_point(start, end, duration))
 
-        # Compute minimum time based on limits
-        if duration is None:
-            # Time for constant velocity phase
-            t_vel = np.abs(delta) / self.limits.max_velocity
-            # Time for acceleration/deceleration
-            t_acc = self.limits.max_velocity / self.limits.max_acceleration
-            duration = float(np.max(t_vel + t_acc))
+    def _sample_point_to_point(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        duration: Optional[float]
+    ) -> Trajectory:
+        """Sample one point-to-point segment at 1kHz."""
+        delta = end - start
+        scaling, num_points = self._time_scaling(delta, duration)
 
-        # Generate trajectory points at 1kHz
-        dt = 0.001  # 1ms
-        num_points = int(duration / dt) + 1
-        trajectory = []
-
-        for i in range(num_points):
-            t = i * dt
-            s = self._smooth_step(t / duration)  # Normalized position [0, 1]
-            s_dot = self._smooth_step_derivative(t / duration) / duration
-            s_ddot = self._smooth_step_second_derivative(t / duration) / (duration ** 2)
-
-            point = TrajectoryPoint(
-                position=start + s * delta,
-                velocity=s_dot * delta,
-                acceleration=s_ddot * delta,
-                time=t
-            )
-            trajectory.append(point)
+        # Generate trajectory samples at 1kHz in one vectorized pass
+        t = np.arange(num_points) * SAMPLE_TIME
+        s, s_dot, s_ddot = scaling(t)
 
-        return trajectory
+        return Trajectory(
+            time=t,
+            position=start + s[:, None] * delta,
+            velocity=s_dot[:, None] * delta,
+            acceleration=s_ddot[:, None] * delta,
+        )
 
     def plan_waypoints(
         self,
         waypoints: List[np.ndarray],
         segment_durations: Optional[List[float]] = None
-    ) -> List[TrajectoryPoint]:
+    ) -> Trajectory:
         """
         Plan trajectory through multiple waypoints.
 
@@ -107,44 +366,286 @@ class TrajectoryPlanner:
             segment_durations: Duration for each segment (auto if None)
 
         Returns:
-            List of trajectory points
+            Trajectory through all waypoints
         """
         if len(waypoints) < 2:
             raise ValueError("Need at least 2 waypoints")
 
-        trajectory = []
-        time_offset = 0.0
-
+        segments = []
         for i in range(len(waypoints) - 1):
             duration = segment_durations[i] if segment_durations else None
-            segment = self.plan_point_to_point(
+            segments.append(self._sample_point_to_point(
                 waypoints[i],
                 waypoints[i + 1],
                 duration
+            ))
+
+        # Shift timestamps and skip each segment's duplicate start point
+        return self._with_feedforward(Trajectory.concatenate(segments))
+
+    def plan_spline(
+        self,
+        waypoints: List[np.ndarray],
+        segment_durations: Optional[List[float]] = None,
+        spline: SplineType = SplineType.CUBIC,
+        refine_iterations: int = 10
+    ) -> Trajectory:
+        """
+        Plan a blended trajectory through waypoints with a global spline.
+
+        Unlike plan_waypoints, velocity stays continuous through interior
+        waypoints, so the arm only stops at the first and last one.
+        Segment durations are first rebalanced so each segment runs near
+        its own limit, then the whole spline is uniformly time-scaled until
+        the velocity, acceleration and, if set, jerk limits hold everywhere.
+
+        Blending saves time when joints keep their direction through the
+        waypoints. On paths where joints reverse at most waypoints,
+        stopping at each one is usually faster, and the quintic fit is
+        slower than the cubic one (see benchmark_trajectory).
+
+        Args:
+            waypoints: List of joint position arrays
+            segment_durations: Initial duration for each segment. Auto if
+                              None (slowest joint at max velocity).
+            spline: Spline order to fit
+            refine_iterations: Passes of per-segment duration rebalancing
+                              (0 keeps the initial durations' proportions)
+
+        Returns:
+            Trajectory sampled at 1kHz
+        """
+        if len(waypoints) < 2:
+            raise ValueError("Need at least 2 waypoints")
+
+        points = np.asarray(waypoints, dtype=float)
+        if segment_durations is None:
+            segment_durations = np.max(
+                np.abs(np.diff(points, axis=0)) / self.limits.max_velocity, axis=1
             )
+        durations = np.maximum(np.asarray(segment_durations, dtype=float), 10 * SAMPLE_TIME)
 
-            # Adjust timestamps and append
-            for point in segment:
-                point.time += time_offset
-                if i > 0 or point.time > 0:  # Skip duplicate start point
-                    trajectory.append(point)
+        # Rebalance segment durations towards each segment's local limit
+        # (ratio 1), then stretch the whole spline so every limit holds.
+        # Rebalancing can make a spline oscillate, so keep the durations
+        # whose stretched total is shortest.
+        best_total, best_durations = np.inf, durations
+        for iteration in range(refine_iterations + 1):
+            knots = np.concatenate([[0.0], np.cumsum(durations)])
+            ratio = self._spline_limit_ratio(self._fit_spline(knots, points, spline), knots)
+            total = knots[-1] * max(np.max(ratio), 1.0)
+            if total < best_total:
+                best_total, best_durations = total, durations
+            if iteration < refine_iterations:
+                durations = np.maximum(durations * np.clip(ratio, 0.5, 2.0), 10 * SAMPLE_TIME)
 
-            if segment:
-                time_offset = segment[-1].time
+        knots = np.concatenate([[0.0], np.cumsum(best_durations)])
+        curve = self._fit_spline(knots, points, spline)
+        ratio = np.max(self._spline_limit_ratio(curve, knots))
+        if ratio > 1.0:
+            # Small margin so resampling on the new grid stays within limits
+            knots = knots * ratio * 1.001
+            curve = self._fit_spline(knots, points, spline)
 
+        t = np.arange(int(np.ceil(knots[-1] / SAMPLE_TIME - 1e-9)) + 1) * SAMPLE_TIME
+        t_eval = np.minimum(t, knots[-1])
+        return self._with_feedforward(Trajectory(
+            time=t,
+            position=curve(t_eval),
+            velocity=curve(t_eval, 1),
+            acceleration=curve(t_eval, 2),
+        ))
+
+    def _with_feedforward(self, trajectory: Trajectory) -> Trajectory:
+        """Attach the feedforward torque table if a compensator is configured."""
+        if self.feedforward is not None:
+            self.feedforward.attach(trajectory)
         return trajectory
 
-    def _smooth_step(self, t: float) -> float:
+    def _spline_limit_ratio(self, curve, knots: np.ndarray) -> np.ndarray:
+        """
+        Per-segment time-scale factor needed to meet the limits.
+
+        A factor k stretches time so v ~ 1/k, a ~ 1/k² and j ~ 1/k³;
+        values below 1 mean the segment could run faster.
+        """
+        t = np.arange(int(np.ceil(knots[-1] / SAMPLE_TIME)) + 1) * SAMPLE_TIME
+        t = np.minimum(t, knots[-1])
+        ratio = np.maximum(
+            np.max(np.abs(curve(t, 1)) / self.limits.max_velocity, axis=1),
+            np.sqrt(np.max(np.abs(curve(t, 2)) / self.limits.max_acceleration, axis=1)),
+        )
+        if self.limits.max_jerk is not None:
+            ratio = np.maximum(
+                ratio, np.cbrt(np.max(np.abs(curve(t, 3)) / self.limits.max_jerk, axis=1))
+            )
+
+        segment = np.clip(np.searchsorted(knots, t, side="right") - 1, 0, len(knots) - 2)
+        per_segment = np.zeros(len(knots) - 1)
+        np.maximum.at(per_segment, segment, ratio)
+        return per_segment
+
+    def _fit_spline(self, knots: np.ndarray, points: np.ndarray, spline: SplineType):
+        """Interpolating spline that starts and ends at rest."""
+        if spline == SplineType.QUINTIC:
+            rest = [(1, np.zeros(points.shape[1])), (2, np.zeros(points.shape[1]))]
+            if len(points) < 3:
+                # Two points cannot carry 4 end conditions on a degree-5 spline;
+                # insert the midpoint so the fit is well posed
+                knots = np.array([knots[0], knots[-1] / 2, knots[-1]])
+                points = np.stack([points[0], points.mean(axis=0), points[-1]])
+        else:
+            rest = [(1, np.zeros(points.shape[1]))]
+        return make_interp_spline(knots, points, k=spline.value, bc_type=(rest, rest))
+
+    def stream_point_to_point(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        duration: Optional[float] = None
+    ) -> Iterator[TrajectoryPoint]:
+        """
+        Generate a point-to-point trajectory one control cycle at a time.
+
+        Yields the same samples as plan_point_to_point, but evaluates each
+        on demand so memory stays constant and the first setpoint is
+        available immediately.
+
+        Args:
+            start: Start joint positions (rad)
+            end: End joint positions (rad)
+            duration: Desired duration (s). Auto-computed if None.
+
+        Yields:
+            Trajectory points at 1kHz
+        """
+        return self.stream_waypoints([start, end], [duration])
+
+    def stream_waypoints(
+        self,
+        waypoints: List[np.ndarray],
+        segment_durations: Optional[List[float]] = None
+    ) -> Iterator[TrajectoryPoint]:
+        """
+        Generate a multi-waypoint trajectory one control cycle at a time.
+
+        Each segment is planned only when the previous one has been
+        consumed; timestamps are offset as they are produced.
+
+        Args:
+            waypoints: List of joint position arrays
+            segment_durations: Duration for each segment (auto if None)
+
+        Yields:
+            Trajectory points at 1kHz, matching plan_waypoints
+        """
+        if len(waypoints) < 2:
+            raise ValueError("Need at least 2 waypoints")
+
+        time_offset = 0.0
+        for i in range(len(waypoints) - 1):
+            start = np.asarray(waypoints[i], dtype=float)
+            delta = waypoints[i + 1] - start
+            duration = segment_durations[i] if segment_durations else None
+            scaling, num_points = self._time_scaling(delta, duration)
+
+            # Skip each later segment's duplicate start point
+            for k in range(0 if i == 0 else 1, num_points):
+                t = k * SAMPLE_TIME
+                s, s_dot, s_ddot = scaling(t)
+                yield TrajectoryPoint(
+                    position=start + s * delta,
+                    velocity=s_dot * delta,
+                    acceleration=s_ddot * delta,
+                    time=time_offset + t,
+                )
+            time_offset += (num_points - 1) * SAMPLE_TIME
+
+    def synchronized_profile(
+        self,
+        delta: np.ndarray,
+        duration: Optional[float] = None
+    ) -> Optional[MotionProfile]:
+        """
+        Minimum-time path-parameter profile s(t) in [0, 1] for a move.
+
+        All joints follow start + s(t) * delta. The limits on s are the
+        tightest per-joint limits divided by each joint's travel, so the
+        limiting joint runs at its bounds and every other joint is
+        time-scaled to finish with it.
+
+        Args:
+            delta: Joint displacement (rad)
+            duration: Optional longer duration to stretch the profile to
+
+        Returns:
+            Profile from 0 to 1, or None if there is no motion
+        """
+        distance = np.abs(delta)
+        moving = distance > 1e-12
+        if not np.any(moving):
+            return None
+
+        v_max = np.min(self.limits.max_velocity[moving] / distance[moving])
+        a_max = np.min(self.limits.max_acceleration[moving] / distance[moving])
+        if self.profile == ProfileType.S_CURVE:
+            j_max = np.min(self.limits.max_jerk[moving] / distance[moving])
+            profile = s_curve_profile(1.0, v_max, a_max, j_max)
+        else:
+            profile = trapezoidal_profile(1.0, v_max, a_max)
+
+        if duration is not None and duration > profile.duration:
+            profile = profile.time_scaled(duration / profile.duration)
+        return profile
+
+    def _time_scaling(
+        self,
+        delta: np.ndarray,
+        duration: Optional[float]
+    ) -> Tuple[Callable, int]:
+        """
+        Select the path-parameter function for a segment.
+
+        Returns:
+            Tuple of (scaling, num_points) where scaling(t) gives
+            (s, s_dot, s_ddot) for scalar or array t
+        """
+        if self.profile != ProfileType.QUINTIC:
+            profile = self.synchronized_profile(delta, duration)
+            if profile is None:
+                return (lambda t: (t * 0.0, t * 0.0, t * 0.0)), 1
+            # Round up to whole periods; samples past the end hold the target
+            return profile.evaluate, int(np.ceil(profile.duration / SAMPLE_TIME - 1e-9)) + 1
+
+        # Compute minimum time based on limits
+        if duration is None:
+            # Time for constant velocity phase
+            t_vel = np.abs(delta) / self.limits.max_velocity
+            # Time for acceleration/deceleration
+            t_acc = self.limits.max_velocity / self.limits.max_acceleration
+            duration = float(np.max(t_vel + t_acc))
+
+        def scaling(t):
+            u = t / duration  # Normalized time [0, 1]
+            return (
+                self._smooth_step(u),
+                self._smooth_step_derivative(u) / duration,
+                self._smooth_step_second_derivative(u) / (duration ** 2),
+            )
+
+        return scaling, int(duration / SAMPLE_TIME) + 1
+
+    def _smooth_step(self, t: np.ndarray) -> np.ndarray:
         """Smooth step function (quintic polynomial) for s-curve profile."""
         t = np.clip(t, 0, 1)
         return t * t * t * (t * (t * 6 - 15) + 10)
 
-    def _smooth_step_derivative(self, t: float) -> float:
+    def _smooth_step_derivative(self, t: np.ndarray) -> np.ndarray:
         """First derivative of smooth step."""
         t = np.clip(t, 0, 1)
         return 30 * t * t * (t * (t - 2) + 1)
 
-    def _smooth_step_second_derivative(self, t: float) -> float:
+    def _smooth_step_second_derivative(self, t: np.ndarray) -> np.ndarray:
         """Second derivative of smooth step."""
         t = np.clip(t, 0, 1)
         return 60 * t * (t * (2 * t - 3) + 1)
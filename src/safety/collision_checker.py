@@ -8,6 +8,8 @@ from typing import List, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
 
+from .link_capsules import CapsuleRobotModel, segment_box_distance, segment_point_distance
+
 
 @dataclass
 class BoundingBox:
@@ -33,12 +35,17 @@ class CollisionChecker:
     - Workspace boundaries
     - Static obstacles (bounding boxes, spheres)
     - Self-collision (simplified)
+
+    With a CapsuleRobotModel, check_configuration and
+    check_configurations test every link capsule against the same
+    obstacles and workspace, plus the model's self-collision pairs.
     """
 
     def __init__(
         self,
         workspace_min: np.ndarray,
-        workspace_max: np.ndarray
+        workspace_max: np.ndarray,
+        robot_model: Optional[CapsuleRobotModel] = None
     ):
         """
         Initialize collision checker.
@@ -46,11 +53,14 @@ class CollisionChecker:
         Args:
             workspace_min: Minimum workspace bounds [x, y, z] (mm)
             workspace_max: Maximum workspace bounds [x, y, z] (mm)
+            robot_model: Link capsule model for configuration checks
+                        (default Kuka model if None)
         """
         self.workspace_min = workspace_min
         self.workspace_max = workspace_max
         self.obstacles_boxes: List[BoundingBox] = []
         self.obstacles_spheres: List[Sphere] = []
+        self.robot_model = robot_model or CapsuleRobotModel()
 
     def add_box_obstacle(self, obstacle: BoundingBox) -> None:
         """Add a bounding box obstacle."""
@@ -143,3 +153,123 @@ class CollisionChecker:
         dist_min = np.min(position - self.workspace_min)
         dist_max = np.min(self.workspace_max - position)
         return min(dist_min, dist_max)
+
+    def check_configuration(
+        self,
+        joint_angles: np.ndarray,
+        margin: float = 0.0
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Check if every robot link is collision-free at one configuration.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (num_joints,)
+            margin: Extra clearance required (mm)
+
+        Returns:
+            Tuple of (is_safe, collision_description)
+        """
+        is_safe, _, description = self.check_configurations(
+            np.asarray(joint_angles, dtype=float)[None], margin
+        )
+        return is_safe, description
+
+    def check_configurations(
+        self,
+        joint_angles: np.ndarray,
+        margin: float = 0.0
+    ) -> Tuple[bool, Optional[int], Optional[str]]:
+        """
+        Check link collisions for a batch of configurations (e.g. a trajectory).
+
+        All configurations, capsules and obstacles are evaluated in one
+        vectorized pass.
+
+        Args:
+            joint_angles: Joint angles (rad), shape (N, num_joints)
+            margin: Extra clearance required (mm)
+
+        Returns:
+            Tuple of (is_safe, first_colliding_index, description)
+        """
+        segments = self.robot_model.segments(joint_angles)
+        clearances = self.link_clearances(segments)
+        colliding = np.zeros(len(segments), dtype=bool)
+        for clearance in clearances:
+            if clearance.size:
+                colliding |= clearance.reshape(len(segments), -1).min(axis=1) < margin
+
+        if not colliding.any():
+            return True, None, None
+        index = int(np.argmax(colliding))
+        return False, index, self._describe(clearances, index, margin)
+
+    def link_clearances(self, segments: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Clearances of the link capsules for a batch of configurations.
+
+        Args:
+            segments: Capsule endpoints from CapsuleRobotModel.segments, (N, C, 2, 3)
+
+        Returns:
+            Tuple of (workspace_min (N, M, 2, 3), workspace_max (N, M, 2, 3),
+            boxes (N, M, B), spheres (N, M, S), self-collision (N, P))
+            clearances in mm, where M are the moving capsules; negative
+            means collision
+        """
+        model = self.robot_model
+        moving = segments[:, model.moving]
+        radii = model.radii[model.moving]
+        p0, p1 = moving[:, :, None, 0], moving[:, :, None, 1]
+
+        # A capsule is inside the workspace iff both endpoints are, shrunk by its radius
+        radii_ws = radii[:, None, None]
+        lower = moving - self.workspace_min - radii_ws
+        upper = self.workspace_max - moving - radii_ws
+
+        box_min, box_max, centers, sphere_radii = self._obstacle_arrays()
+        if len(box_min):
+            boxes = segment_box_distance(p0, p1, box_min, box_max) - radii[:, None]
+        else:
+            boxes = np.zeros(moving.shape[:2] + (0,))
+        if len(centers):
+            spheres = segment_point_distance(p0, p1, centers) - radii[:, None] - sphere_radii
+        else:
+            spheres = np.zeros(moving.shape[:2] + (0,))
+
+        return lower, upper, boxes, spheres, model.self_clearance(segments)
+
+    def _obstacle_arrays(self) -> Tuple[np.ndarray, ...]:
+        """
+        Obstacle geometry stacked into arrays.
+
+        Rebuilt on every call from the public obstacle lists, so replaced
+        or edited obstacles are always seen, as in check_position. This
+        costs about as much as checking a cache key built from the
+        obstacle contents would.
+        """
+        return (
+            np.array([box.min_point for box in self.obstacles_boxes], dtype=float),
+            np.array([box.max_point for box in self.obstacles_boxes], dtype=float),
+            np.array([sphere.center for sphere in self.obstacles_spheres], dtype=float),
+            np.array([sphere.radius for sphere in self.obstacles_spheres], dtype=float),
+        )
+
+    def _describe(self, clearances: Tuple[np.ndarray, ...], index: int, margin: float) -> str:
+        """Describe the first collision found at configuration `index`."""
+        model = self.robot_model
+        names = [name for name, moving in zip(model.names, model.moving) if moving]
+        lower, upper, boxes, spheres, self_clear = (c[index] for c in clearances)
+
+        for bound, clearance in (("minimum", lower), ("maximum", upper)):
+            if np.any(clearance < margin):
+                link, _, axis = np.unravel_index(np.argmin(clearance), clearance.shape)
+                return f"Link {names[link]} outside workspace {bound} ({['x', 'y', 'z'][axis]})"
+        if np.any(boxes < margin):
+            link, box = np.unravel_index(np.argmin(boxes), boxes.shape)
+            return f"Link {names[link]} collision with {self.obstacles_boxes[box].name}"
+        if np.any(spheres < margin):
+            link, sphere = np.unravel_index(np.argmin(spheres), spheres.shape)
+            return f"Link {names[link]} collision with {self.obstacles_spheres[sphere].name}"
+        i, j = model.self_collision_pairs[int(np.argmin(self_clear))]
+        return f"Self-collision between {model.names[i]} and {model.names[j]}"
@@ -20,6 +20,27 @@ class JointLimits:
     jerk_max: float = 1000.0  # rad/s³
 
 
+@dataclass
+class LimitSummary:
+    """Violations of one limit type along a trajectory."""
+    type: str  # "position", "velocity", "acceleration", "jerk" or "torque"
+    count: int  # Samples with at least one joint over the limit
+    first_index: int  # First violating sample
+    joint_index: int  # Joint violating at first_index
+    worst_ratio: float  # Largest |value| / limit; for position, overshoot / joint range
+
+
+@dataclass
+class TrajectoryValidation:
+    """Result of LimitChecker.validate_trajectory."""
+    is_valid: bool
+    first_index: Optional[int]  # Earliest sample violating any limit
+    violations: List[LimitSummary]
+
+    def __bool__(self) -> bool:
+        return self.is_valid
+
+
 class LimitChecker:
     """
     Joint limit validation.
@@ -48,6 +69,7 @@ class LimitChecker:
         self.vel_max = np.array([j.velocity_max for j in joint_limits])
         self.acc_max = np.array([j.acceleration_max for j in joint_limits])
         self.torque_max = np.array([j.torque_max for j in joint_limits])
+        self.jerk_max = np.array([j.jerk_max for j in joint_limits])
 
     def check_position(self, position: np.ndarray) -> Tuple[bool, Optional[str]]:
         """
@@ -159,3 +181,77 @@ class LimitChecker:
         margin_min = position - self.pos_min
         margin_max = self.pos_max - position
         return np.minimum(margin_min, margin_max)
+
+    def validate_trajectory(
+        self,
+        position: np.ndarray,
+        velocity: Optional[np.ndarray] = None,
+        acceleration: Optional[np.ndarray] = None,
+        torque: Optional[np.ndarray] = None,
+        time: Optional[np.ndarray] = None,
+        dt: Optional[float] = None
+    ) -> TrajectoryValidation:
+        """
+        Check a whole planned motion against every limit in one pass.
+
+        Each limit is checked with one vectorized comparison over the
+        (N, num_joints) arrays. Jerk is the finite difference of
+        `acceleration`, so accelerations must come with `time` or `dt`.
+
+        Args:
+            position: (N, num_joints) joint positions (rad)
+            velocity: (N, num_joints) joint velocities (rad/s, optional)
+            acceleration: (N, num_joints) joint accelerations (rad/s², optional)
+            torque: (N, num_joints) joint torques (Nm, optional)
+            time: (N,) sample times (s, optional)
+            dt: Fixed sample period (s), used when `time` is None
+
+        Returns:
+            TrajectoryValidation with the first violating index and one
+            LimitSummary per violated limit type
+
+        Raises:
+            ValueError: If `acceleration` is given without `time` or `dt`
+        """
+        if acceleration is not None and time is None and dt is None:
+            raise ValueError("Checking jerk limits requires `time` or `dt` with accelerations")
+
+        position = np.asarray(position, dtype=float)
+        span = self.pos_max - self.pos_min
+        overshoot = np.maximum(self.pos_min - position, position - self.pos_max)
+        ratios = [("position", overshoot / span, 0.0)]
+
+        if velocity is not None:
+            ratios.append(("velocity", np.abs(velocity) / self.vel_max, 1.0))
+        if acceleration is not None:
+            acceleration = np.asarray(acceleration, dtype=float)
+            ratios.append(("acceleration", np.abs(acceleration) / self.acc_max, 1.0))
+            if len(acceleration) > 1:
+                steps = np.diff(time)[:, None] if time is not None else dt
+                jerk = np.diff(acceleration, axis=0) / steps
+                # Attribute a jerk violation to the sample it leads into
+                jerk_ratio = np.zeros_like(acceleration)
+                jerk_ratio[1:] = np.abs(jerk) / self.jerk_max
+                ratios.append(("jerk", jerk_ratio, 1.0))
+        if torque is not None:
+            ratios.append(("torque", np.abs(torque) / self.torque_max, 1.0))
+
+        violations = []
+        for kind, ratio, threshold in ratios:
+            over = ratio > threshold
+            samples = np.flatnonzero(over.any(axis=1))
+            if len(samples) == 0:
+                continue
+            first = int(samples[0])
+            violations.append(LimitSummary(
+                type=kind,
+                count=len(samples),
+                first_index=first,
+                joint_index=int(np.argmax(over[first])),
+                worst_ratio=float(ratio.max()),
+            ))
+
+        if not violations:
+            return TrajectoryValidation(True, None, [])
+        violations.sort(key=lambda v: v.first_index)
+        return TrajectoryValidation(False, violations[0].first_index, violations)
@@ -7,11 +7,14 @@ Implements ISO 13849-1 safety functions.
 
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass
-from enum import Enum, auto
+from enum import Enum, IntFlag, auto
 import numpy as np
 import threading
 import time
 
+from .limit_checker import JointLimits, LimitChecker, TrajectoryValidation
+from .violation_log import SafetyViolation, ViolationLog
+
 
 class SafetyState(Enum):
     """Safety system states."""
@@ -36,17 +39,27 @@ class SafetyLimits:
     # Workspace limits (mm)
     workspace_min: np.ndarray = None
     workspace_max: np.ndarray = None
+    # Jerk limits (rad/s³); JointLimits.jerk_max default if None
+    jerk_max: np.ndarray = None
+    # Guaranteed braking deceleration (rad/s²); acceleration_max if None
+    deceleration_max: np.ndarray = None
 
 
-@dataclass
-class SafetyViolation:
-    """Details of a safety violation."""
-    type: str
-    joint_index: Optional[int]
-    value: float
-    limit: float
-    timestamp: float
-    message: str
+class CommandViolation(IntFlag):
+    """Bitmask of limit types violated by a command."""
+    POSITION_MAX = 1
+    POSITION_MIN = 2
+    VELOCITY = 4
+    TORQUE = 8
+
+
+# Row of SafetyMonitor's check buffers -> (flag, violation type)
+_COMMAND_CHECKS = (
+    (CommandViolation.POSITION_MAX, "position_max"),
+    (CommandViolation.POSITION_MIN, "position_min"),
+    (CommandViolation.VELOCITY, "velocity"),
+    (CommandViolation.TORQUE, "torque"),
+)
 
 
 class SafetyMonitor:
@@ -70,19 +83,164 @@ class SafetyMonitor:
 
         Args:
             limits: Safety limits configuration
-            config: Additional configuration options
+            config: Additional configuration options:
+                violation_capacity: violations kept in history (default 1024)
+                callback_interval_s: minimum time between callbacks for the
+                    same violation type and joint (default 0.1); E-stops
+                    are always dispatched
+                position_margin: static WARNING margin to the joint limits
+                    (rad, default 0.05)
+                braking_reaction_s: delay before braking starts in the
+                    stopping-distance prediction (default 0.002)
+                braking_warning_ratio: fraction of the braking deceleration
+                    assumed for WARNING predictions (default 0.5)
+                workspace_deceleration: Cartesian braking deceleration for
+                    workspace predictions (mm/s², default 5000)
         """
         self.limits = limits
         self.config = config or {}
 
         self.state = SafetyState.SAFE
-        self.violations: List[SafetyViolation] = []
+        self.violations = ViolationLog(self.config.get("violation_capacity", 1024))
         self._callbacks: List[Callable] = []
         self._lock = threading.Lock()
 
+        # Callback rate limiting per (type, joint)
+        self._callback_interval_s = self.config.get("callback_interval_s", 0.1)
+        self._last_dispatch: Dict[tuple, float] = {}
+        self.suppressed_callbacks = 0
+
         # Response time requirement: <50ms
         self._max_response_time_ms = 50
 
+        # Runtime check parameters
+        self._position_margin = self.config.get("position_margin", 0.05)
+        self._reaction_s = self.config.get("braking_reaction_s", 0.002)
+        self._warning_ratio = self.config.get("braking_warning_ratio", 0.5)
+        self._workspace_deceleration = self.config.get("workspace_deceleration", 5000.0)
+
+        self.refresh_limits()
+
+    def refresh_limits(self) -> None:
+        """
+        Rebuild the preallocated arrays used by check_command.
+
+        Call after modifying `limits` in place.
+        """
+        num_joints = len(self.limits.joint_min)
+        # Rows: position (vs max), -position (vs -min), |velocity|, |torque|
+        self._command_limits = np.stack([
+            np.asarray(self.limits.joint_max, dtype=float),
+            -np.asarray(self.limits.joint_min, dtype=float),
+            np.asarray(self.limits.velocity_max, dtype=float),
+            np.asarray(self.limits.torque_max, dtype=float),
+        ])
+        self._command_values = np.zeros((4, num_joints))
+        self._command_flags = np.zeros((4, num_joints), dtype=bool)
+        self._command_rows = tuple(self._command_values)
+        # Signed velocity and torque commands, for reporting
+        self._command_signed = np.zeros((2, num_joints))
+
+        deceleration = self.limits.deceleration_max
+        if deceleration is None:
+            deceleration = self.limits.acceleration_max
+        self._braking_deceleration = np.asarray(deceleration, dtype=float)
+
+        jerk_max = self.limits.jerk_max
+        if jerk_max is None:
+            jerk_max = np.full(num_joints, JointLimits.jerk_max)
+        self._limit_checker = LimitChecker([
+            JointLimits(*values) for values in zip(
+                self.limits.joint_min, self.limits.joint_max, self.limits.velocity_max,
+                self.limits.acceleration_max, self.limits.torque_max, jerk_max
+            )
+        ])
+
+    def check_command(
+        self,
+        target_position: np.ndarray,
+        target_velocity: Optional[np.ndarray] = None,
+        target_torque: Optional[np.ndarray] = None
+    ) -> int:
+        """
+        Fast, allocation-free command check.
+
+        Compares the whole command against the limits in one vectorized
+        operation on preallocated buffers and does nothing else: no
+        violation objects, no state change. Use command_violations() to
+        describe a nonzero result. The buffers are shared, so a monitor's
+        fast path must only be used from one thread (the control loop).
+
+        Args:
+            target_position: Target joint positions (rad)
+            target_velocity: Target velocities (rad/s)
+            target_torque: Target torques (Nm)
+
+        Returns:
+            0 if the command is within limits, else a CommandViolation mask
+        """
+        position, negated, velocity, torque = self._command_rows
+        signed_velocity, signed_torque = self._command_signed
+        position[...] = target_position
+        np.negative(target_position, out=negated)
+        if target_velocity is None:
+            signed_velocity.fill(0.0)
+        else:
+            signed_velocity[...] = target_velocity
+        np.abs(signed_velocity, out=velocity)
+        if target_torque is None:
+            signed_torque.fill(0.0)
+        else:
+            signed_torque[...] = target_torque
+        np.abs(signed_torque, out=torque)
+
+        flags = np.greater(self._command_values, self._command_limits, out=self._command_flags)
+        if not np.count_nonzero(flags):
+            return 0
+
+        mask = CommandViolation(0)
+        for row, (flag, _) in enumerate(_COMMAND_CHECKS):
+            if flags[row].any():
+                mask |= flag
+        return mask
+
+    def command_violations(self) -> List[SafetyViolation]:
+        """
+        Describe the violations found by the last check_command call.
+
+        Returns:
+            One SafetyViolation per violated joint limit
+        """
+        violations = []
+        timestamp = time.time()
+        rows, joints = np.nonzero(self._command_flags)
+        for row, i in zip(rows.tolist(), joints.tolist()):
+            kind = _COMMAND_CHECKS[row][1]
+            if kind == "position_max":
+                value, limit = self._command_values[0, i], self.limits.joint_max[i]
+                message = (f"Joint {i} above maximum: {np.degrees(value):.2f}° > "
+                           f"{np.degrees(limit):.2f}°")
+            elif kind == "position_min":
+                value, limit = self._command_values[0, i], self.limits.joint_min[i]
+                message = (f"Joint {i} below minimum: {np.degrees(value):.2f}° < "
+                           f"{np.degrees(limit):.2f}°")
+            elif kind == "velocity":
+                value, limit = self._command_signed[0, i], self.limits.velocity_max[i]
+                message = (f"Joint {i} velocity exceeded: {np.degrees(value):.2f}°/s > "
+                           f"{np.degrees(limit):.2f}°/s")
+            else:
+                value, limit = self._command_signed[1, i], self.limits.torque_max[i]
+                message = f"Joint {i} torque exceeded: {value:.2f} Nm > {limit:.2f} Nm"
+            violations.append(SafetyViolation(
+                type=kind,
+                joint_index=i,
+                value=float(value),
+                limit=float(limit),
+                timestamp=timestamp,
+                message=message
+            ))
+        return violations
+
     def validate_command(
         self,
         target_position: np.ndarray,
@@ -100,110 +258,151 @@ class SafetyMonitor:
         Returns:
             Tuple of (is_valid, violations_list)
         """
-        violations = []
+        if not self.check_command(target_position, target_velocity, target_torque):
+            return True, []
+
+        violations = self.command_violations()
+        self._handle_violations(violations)
+        return False, violations
+
+    def validate_trajectory(
+        self,
+        position: np.ndarray,
+        velocity: Optional[np.ndarray] = None,
+        acceleration: Optional[np.ndarray] = None,
+        torque: Optional[np.ndarray] = None,
+        time: Optional[np.ndarray] = None,
+        dt: Optional[float] = None
+    ) -> TrajectoryValidation:
+        """
+        Validate a whole planned motion before execution.
+
+        Checks joint, velocity, acceleration, jerk and torque limits over
+        all samples at once (see LimitChecker.validate_trajectory). Does
+        not change the safety state; reject or re-plan on failure.
+
+        Args:
+            position: (N, num_joints) joint positions (rad)
+            velocity: (N, num_joints) joint velocities (rad/s, optional)
+            acceleration: (N, num_joints) joint accelerations (rad/s², optional)
+            torque: (N, num_joints) joint torques (Nm, optional)
+            time: (N,) sample times (s, optional)
+            dt: Fixed sample period (s), used when `time` is None
+
+        Returns:
+            TrajectoryValidation with the first violating index and a
+            per-limit summary
+
+        Raises:
+            ValueError: If `acceleration` is given without `time` or `dt`
+        """
+        return self._limit_checker.validate_trajectory(
+            position, velocity, acceleration, torque, time=time, dt=dt
+        )
 
-        # SF1: Position limit check
-        for i, (pos, min_val, max_val) in enumerate(
-            zip(target_position, self.limits.joint_min, self.limits.joint_max)
-        ):
-            if pos < min_val:
-                violations.append(SafetyViolation(
-                    type="position_min",
-                    joint_index=i,
-                    value=pos,
-                    limit=min_val,
-                    timestamp=time.time(),
-                    message=f"Joint {i} below minimum: {np.degrees(pos):.2f}° < {np.degrees(min_val):.2f}°"
-                ))
-            elif pos > max_val:
-                violations.append(SafetyViolation(
-                    type="position_max",
-                    joint_index=i,
-                    value=pos,
-                    limit=max_val,
-                    timestamp=time.time(),
-                    message=f"Joint {i} above maximum: {np.degrees(pos):.2f}° > {np.degrees(max_val):.2f}°"
-                ))
-
-        # SF2: Velocity limit check
-        if target_velocity is not None:
-            for i, (vel, max_vel) in enumerate(
-                zip(target_velocity, self.limits.velocity_max)
-            ):
-                if abs(vel) > max_vel:
-                    violations.append(SafetyViolation(
-                        type="velocity",
-                        joint_index=i,
-                        value=vel,
-                        limit=max_vel,
-                        timestamp=time.time(),
-                        message=f"Joint {i} velocity exceeded: {np.degrees(vel):.2f}°/s > {np.degrees(max_vel):.2f}°/s"
-                    ))
-
-        # SF3: Torque limit check
-        if target_torque is not None:
-            for i, (torque, max_torque) in enumerate(
-                zip(target_torque, self.limits.torque_max)
-            ):
-                if abs(torque) > max_torque:
-                    violations.append(SafetyViolation(
-                        type="torque",
-                        joint_index=i,
-                        value=torque,
-                        limit=max_torque,
-                        timestamp=time.time(),
-                        message=f"Joint {i} torque exceeded: {torque:.2f} Nm > {max_torque:.2f} Nm"
-                    ))
-
-        is_valid = len(violations) == 0
-
-        if not is_valid:
-            self._handle_violations(violations)
-
-        return is_valid, violations
+    def predict_stop(
+        self,
+        position: np.ndarray,
+        velocity: np.ndarray,
+        deceleration: np.ndarray,
+        reaction_s: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Where each axis comes to rest if braking starts now.
+
+        Assumes constant velocity for the reaction time, then constant
+        deceleration: p + v t_r + v |v| / (2 a).
+
+        Args:
+            position: Current positions
+            velocity: Current velocities
+            deceleration: Braking deceleration per axis (same units)
+            reaction_s: Delay before braking starts (s); configured default if None
+
+        Returns:
+            Predicted stop positions
+        """
+        if reaction_s is None:
+            reaction_s = self._reaction_s
+        return position + velocity * (reaction_s + np.abs(velocity) / (2.0 * deceleration))
 
     def check_runtime(
         self,
         current_position: np.ndarray,
         current_velocity: np.ndarray,
-        current_torque: np.ndarray
+        current_torque: np.ndarray,
+        tcp_position: Optional[np.ndarray] = None,
+        tcp_velocity: Optional[np.ndarray] = None
     ) -> SafetyState:
         """
         Runtime safety check of current robot state.
 
-        Called at 1kHz from control loop.
+        Called at 1kHz from control loop. Besides static margins, predicts
+        where each joint would stop when braking now: FAULT if it would
+        cross joint_min/joint_max even at the full braking deceleration,
+        WARNING if it would at braking_warning_ratio of it. The same is
+        done for the TCP against the workspace when a TCP state is given.
 
         Args:
             current_position: Current joint positions
             current_velocity: Current joint velocities
             current_torque: Current joint torques
+            tcp_position: Current TCP position [x, y, z] (mm, optional)
+            tcp_velocity: Current TCP velocity [x, y, z] (mm/s, optional)
 
         Returns:
             Current safety state
         """
+        limits = self.limits
+        deceleration = self._braking_deceleration
+        stop = self.predict_stop(current_position, current_velocity, deceleration)
+        stop_soft = self.predict_stop(
+            current_position, current_velocity, deceleration * self._warning_ratio
+        )
+        stop_beyond = np.any(stop < limits.joint_min) or np.any(stop > limits.joint_max)
+        soft_beyond = (np.any(stop_soft < limits.joint_min)
+                       or np.any(stop_soft > limits.joint_max))
+
+        if (tcp_position is not None and tcp_velocity is not None
+                and limits.workspace_min is not None and limits.workspace_max is not None):
+            tcp_stop = self.predict_stop(tcp_position, tcp_velocity, self._workspace_deceleration)
+            tcp_soft = self.predict_stop(
+                tcp_position, tcp_velocity, self._workspace_deceleration * self._warning_ratio
+            )
+            stop_beyond = stop_beyond or bool(
+                np.any(tcp_stop < limits.workspace_min) or np.any(tcp_stop > limits.workspace_max)
+            )
+            soft_beyond = soft_beyond or bool(
+                np.any(tcp_soft < limits.workspace_min) or np.any(tcp_soft > limits.workspace_max)
+            )
+
         with self._lock:
             # Quick checks for runtime performance
             # Position limits (with margin)
-            margin = 0.05  # rad (~3 degrees)
-            if np.any(current_position < self.limits.joint_min + margin):
+            margin = self._position_margin
+            if np.any(current_position < limits.joint_min + margin):
                 self.state = SafetyState.WARNING
-            elif np.any(current_position > self.limits.joint_max - margin):
+            elif np.any(current_position > limits.joint_max - margin):
                 self.state = SafetyState.WARNING
-            elif np.any(np.abs(current_velocity) > self.limits.velocity_max * 0.95):
+            elif soft_beyond:
                 self.state = SafetyState.WARNING
-            elif np.any(np.abs(current_torque) > self.limits.torque_max * 0.95):
+            elif np.any(np.abs(current_velocity) > limits.velocity_max * 0.95):
+                self.state = SafetyState.WARNING
+            elif np.any(np.abs(current_torque) > limits.torque_max * 0.95):
                 self.state = SafetyState.WARNING
             else:
                 self.state = SafetyState.SAFE
 
-            # Hard limit violations trigger fault
-            if np.any(current_position < self.limits.joint_min):
+            # Hard limit violations, or a stop that cannot end inside them, trigger fault
+            if np.any(current_position < limits.joint_min):
+                self.state = SafetyState.FAULT
+            elif np.any(current_position > limits.joint_max):
                 self.state = SafetyState.FAULT
-            elif np.any(current_position > self.limits.joint_max):
+            elif stop_beyond:
                 self.state = SafetyState.FAULT
-            elif np.any(np.abs(current_velocity) > self.limits.velocity_max):
+            elif np.any(np.abs(current_velocity) > limits.velocity_max):
                 self.state = SafetyState.FAULT
-            elif np.any(np.abs(current_torque) > self.limits.torque_max):
+            elif np.any(np.abs(current_torque) > limits.torque_max):
                 self.state = SafetyState.FAULT
 
             return self.state
@@ -249,7 +448,16 @@ class SafetyMonitor:
                 self._notify_callbacks(violation)
 
     def _notify_callbacks(self, violation: SafetyViolation) -> None:
-        """Notify registered callbacks of violation."""
+        """Notify registered callbacks of violation, rate-limited per type and joint."""
+        if violation.type != "estop":
+            key = (violation.type, violation.joint_index)
+            now = time.monotonic()
+            last = self._last_dispatch.get(key)
+            if last is not None and now - last < self._callback_interval_s:
+                self.suppressed_callbacks += 1
+                return
+            self._last_dispatch[key] = now
+
         for callback in self._callbacks:
             try:
                 callback(violation)
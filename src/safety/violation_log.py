@@ -0,0 +1,191 @@
+"""
+Violation Log
+
+Fixed-capacity, array-backed history of safety violations.
+"""
+
+from typing import Dict, Iterator, List, Optional, Union
+from dataclasses import dataclass
+import numpy as np
+import threading
+
+
+@dataclass
+class SafetyViolation:
+    """Details of a safety violation."""
+    type: str
+    joint_index: Optional[int]
+    value: float
+    limit: float
+    timestamp: float
+    message: str
+
+
+_RECORD_DTYPE = np.dtype([
+    ("type", np.int16),  # Index into ViolationLog's type table
+    ("joint", np.int16),  # -1 when the violation is not joint-specific
+    ("value", np.float64),
+    ("limit", np.float64),
+    ("timestamp", np.float64),
+])
+
+
+class ViolationLog:
+    """
+    Ring buffer of the most recent safety violations.
+
+    Numeric fields live in a preallocated structured array and messages
+    in a fixed-size list, so a sustained fault overwrites the oldest
+    entries instead of growing memory. Per-type counters keep the
+    all-time totals. The lock is held only to write one record or to copy
+    the array for a query; queries filter with vectorized masks and build
+    SafetyViolation objects only for the entries returned.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize violation log.
+
+        Args:
+            capacity: Number of violations kept
+        """
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=_RECORD_DTYPE)
+        self._messages: List[str] = [""] * capacity
+        self._types: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def append(self, violation: SafetyViolation) -> None:
+        """Record a violation, overwriting the oldest when full."""
+        with self._lock:
+            code = self._type_codes.get(violation.type)
+            if code is None:
+                code = len(self._types)
+                self._types.append(violation.type)
+                self._type_codes[violation.type] = code
+                self._counts[violation.type] = 0
+            self._counts[violation.type] += 1
+
+            index = self.total % self.capacity
+            record = self._records[index]
+            record["type"] = code
+            record["joint"] = -1 if violation.joint_index is None else violation.joint_index
+            record["value"] = violation.value
+            record["limit"] = violation.limit
+            record["timestamp"] = violation.timestamp
+            self._messages[index] = violation.message
+            self.total += 1
+
+    def extend(self, violations: List[SafetyViolation]) -> None:
+        """Record several violations."""
+        for violation in violations:
+            self.append(violation)
+
+    def clear(self) -> None:
+        """Discard stored violations and counters."""
+        with self._lock:
+            self.total = 0
+            self._counts = {name: 0 for name in self._types}
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """All-time number of violations per type."""
+        with self._lock:
+            return dict(self._counts)
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def __iter__(self) -> Iterator[SafetyViolation]:
+        return iter(self.query())
+
+    def __bool__(self) -> bool:
+        return self.total > 0
+
+    def __getitem__(
+        self,
+        index: Union[int, slice]
+    ) -> Union[SafetyViolation, List[SafetyViolation]]:
+        """
+        Stored violations by position, oldest first, as for a list.
+
+        Negative indices count back from the newest entry, so
+        `log[-1]` is the most recent violation.
+        """
+        if isinstance(index, slice):
+            return self.query()[index]
+        with self._lock:
+            size = min(self.total, self.capacity)
+            position = index + size if index < 0 else index
+            if not 0 <= position < size:
+                raise IndexError("violation log index out of range")
+            slot = (self.total - size + position) % self.capacity
+            record = self._records[slot].copy()
+            message = self._messages[slot]
+            type = self._types[record["type"]]
+        return _to_violation(record, type, message)
+
+    def last(self, n: int) -> List[SafetyViolation]:
+        """The `n` most recent violations, oldest first."""
+        return self.query(limit=n)
+
+    def query(
+        self,
+        type: Optional[str] = None,
+        joint_index: Optional[int] = None,
+        since: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[SafetyViolation]:
+        """
+        Stored violations matching all given filters, oldest first.
+
+        Args:
+            type: Violation type, e.g. "velocity"
+            joint_index: Joint index
+            since: Only violations with timestamp >= since
+            limit: Return at most this many of the newest matches
+
+        Returns:
+            List of SafetyViolation
+        """
+        with self._lock:
+            total = self.total
+            size = min(total, self.capacity)
+            order = (np.arange(total - size, total) % self.capacity)
+            records = self._records[order]
+            messages = self._messages
+            code = self._type_codes.get(type, -1) if type is not None else None
+            types = list(self._types)
+
+            keep = np.ones(size, dtype=bool)
+            if code is not None:
+                keep &= records["type"] == code
+            if joint_index is not None:
+                keep &= records["joint"] == joint_index
+            if since is not None:
+                keep &= records["timestamp"] >= since
+            selected = np.flatnonzero(keep)
+            if limit is not None:
+                selected = selected[len(selected) - min(limit, len(selected)):]
+            selected_messages = [messages[order[i]] for i in selected]
+
+        return [
+            _to_violation(records[i], types[records[i]["type"]], message)
+            for i, message in zip(selected, selected_messages)
+        ]
+
+
+def _to_violation(record: np.void, type: str, message: str) -> SafetyViolation:
+    """Build a SafetyViolation from one stored record."""
+    joint = int(record["joint"])
+    return SafetyViolation(
+        type=type,
+        joint_index=None if joint < 0 else joint,
+        value=float(record["value"]),
+        limit=float(record["limit"]),
+        timestamp=float(record["timestamp"]),
+        message=message,
+    )
@@ -0,0 +1,113 @@
+"""
+Control Loop Benchmarks
+
+Measures the per-tick cost of control-loop stages, starting with the
+per-joint PID loop against the vectorized PID controller, gain-schedule
+lookups and rigid-body inverse dynamics.
+
+Usage:
+    python -m tests.performance.benchmark_control_loop
+"""
+
+import time
+import numpy as np
+
+from src.control.dynamics import RigidBodyDynamics
+from src.control.gain_scheduling import GainScheduler, load_gain_schedule
+from src.control.pid_controller import PIDGains, MultiJointPIDController, VectorizedPIDController
+
+
+def _time_per_tick(fn, num_ticks: int) -> float:
+    """Return the mean wall time (s) of one tick over a run."""
+    start = time.perf_counter()
+    for _ in range(num_ticks):
+        fn()
+    return (time.perf_counter() - start) / num_ticks
+
+
+def benchmark_pid(num_ticks: int = 20000) -> dict:
+    """Benchmark MultiJointPIDController vs VectorizedPIDController per tick."""
+    gains_list = [PIDGains(kp=100.0, ki=10.0, kd=5.0, kff_vel=1.0, kff_acc=0.1) for _ in range(6)]
+    per_joint = MultiJointPIDController(gains_list)
+    vectorized = VectorizedPIDController(gains_list)
+    targets = np.array([0.1, -0.2, 0.3, 0.0, 0.2, 0.0])
+    actuals = np.zeros(6)
+    velocities = np.full(6, 0.5)
+    accelerations = np.full(6, 1.0)
+    out = np.empty(6)
+
+    per_joint_s = _time_per_tick(
+        lambda: per_joint.compute(targets, actuals, 0.001, velocities, accelerations), num_ticks
+    )
+    vectorized_s = _time_per_tick(
+        lambda: vectorized.compute(targets, actuals, 0.001, velocities, accelerations, out=out),
+        num_ticks
+    )
+
+    return {
+        "per_joint_us": per_joint_s * 1e6,
+        "vectorized_us": vectorized_s * 1e6,
+        "speedup": per_joint_s / vectorized_s,
+    }
+
+
+def benchmark_gain_schedule(num_ticks: int = 20000) -> dict:
+    """Benchmark a gain-schedule lookup applied to the vectorized controller."""
+    scheduler = GainScheduler(load_gain_schedule("config/control/gain_schedule.yaml"))
+    controller = VectorizedPIDController([PIDGains(kp=100.0, ki=10.0, kd=5.0) for _ in range(6)])
+    positions = np.array([0.1, -0.7, 0.4, 0.0, 0.2, 0.0])
+
+    lookup_s = _time_per_tick(lambda: scheduler.lookup(positions[1], positions[2], 80.0), num_ticks)
+    apply_s = _time_per_tick(lambda: scheduler.apply(controller, positions, 80.0), num_ticks)
+
+    return {
+        "lookup_us": lookup_s * 1e6,
+        "apply_us": apply_s * 1e6,
+    }
+
+
+def benchmark_inverse_dynamics(num_calls: int = 5000, num_samples: int = 10000) -> dict:
+    """Benchmark single-sample RNEA, the mass matrix and the batched variant."""
+    dynamics = RigidBodyDynamics()
+    q = np.array([0.3, -0.5, 0.8, 0.4, -0.6, 0.2])
+    qd = np.array([0.5, -0.3, 0.7, 1.0, -0.8, 0.4])
+    qdd = np.array([1.0, 2.0, -1.0, 0.5, 0.3, -2.0])
+    out = np.empty(6)
+    rng = np.random.default_rng(0)
+    batch = [rng.uniform(-2, 2, size=(num_samples, 6)) for _ in range(3)]
+
+    single_s = _time_per_tick(lambda: dynamics.inverse_dynamics(q, qd, qdd, out=out), num_calls)
+    mass_s = _time_per_tick(lambda: dynamics.mass_matrix(q), num_calls // 5)
+    start = time.perf_counter()
+    dynamics.inverse_dynamics_batch(*batch)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "single_us": single_s * 1e6,
+        "mass_matrix_us": mass_s * 1e6,
+        "num_samples": num_samples,
+        "batch_ms": batch_s * 1000,
+    }
+
+
+def main() -> None:
+    result = benchmark_pid()
+    print("PID per tick (6 joints)")
+    print(f"  per-joint:  {result['per_joint_us']:8.2f} us")
+    print(f"  vectorized: {result['vectorized_us']:8.2f} us")
+    print(f"  speedup:    {result['speedup']:8.1f}x")
+
+    result = benchmark_gain_schedule()
+    print("Gain schedule per tick")
+    print(f"  lookup:           {result['lookup_us']:8.2f} us")
+    print(f"  lookup + apply:   {result['apply_us']:8.2f} us")
+
+    result = benchmark_inverse_dynamics()
+    print("Inverse dynamics (RNEA)")
+    print(f"  single sample:             {result['single_us']:8.2f} us")
+    print(f"  mass matrix:               {result['mass_matrix_us']:8.2f} us")
+    print(f"  batch of {result['num_samples']} samples:   {result['batch_ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Kinematics Benchmarks
+
+Compares per-sample forward kinematics against the batched path, the
+analytic Jacobian against finite differences, and closed-form IK against
+the numerical solver, and batched LM IK against per-point calls.
+
+Usage:
+    python -m tests.performance.benchmark_kinematics
+"""
+
+import time
+import numpy as np
+
+from src.control.kinematics import ForwardKinematics, InverseKinematics
+
+
+def _time_call(fn, repeats: int = 3) -> float:
+    """Return the best wall time (s) over several runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_fk_batch(num_samples: int = 20000) -> dict:
+    """Benchmark ForwardKinematics.compute loop vs compute_batch."""
+    fk = ForwardKinematics()
+    rng = np.random.default_rng(0)
+    q = rng.uniform(-np.pi, np.pi, size=(num_samples, fk.num_joints))
+
+    loop_s = _time_call(lambda: [fk.compute(row) for row in q], repeats=1)
+    batch_s = _time_call(lambda: fk.compute_batch(q))
+
+    return {
+        "num_samples": num_samples,
+        "loop_ms": loop_s * 1000,
+        "batch_ms": batch_s * 1000,
+        "speedup": loop_s / batch_s,
+    }
+
+
+def _finite_difference_jacobian(fk: ForwardKinematics, q: np.ndarray) -> np.ndarray:
+    """Reference 3xN position Jacobian from 7 full FK chains."""
+    delta = 1e-6
+    base = fk.get_position(q)
+    J = np.zeros((3, len(q)))
+    for i in range(len(q)):
+        perturbed = q.copy()
+        perturbed[i] += delta
+        J[:, i] = (fk.get_position(perturbed) - base) / delta
+    return J
+
+
+def benchmark_jacobian(num_calls: int = 2000) -> dict:
+    """Benchmark finite-difference vs analytic Jacobian per call."""
+    fk = ForwardKinematics()
+    q = np.array([0.1, -0.2, 0.3, 0.0, 0.2, 0.0])
+
+    def run_fd():
+        for _ in range(num_calls):
+            _finite_difference_jacobian(fk, q)
+
+    def run_analytic():
+        for _ in range(num_calls):
+            fk.jacobian(q)
+
+    fd_s = _time_call(run_fd)
+    analytic_s = _time_call(run_analytic)
+
+    return {
+        "fd_us": fd_s / num_calls * 1e6,
+        "analytic_us": analytic_s / num_calls * 1e6,
+        "speedup": fd_s / analytic_s,
+    }
+
+
+def benchmark_ik(num_calls: int = 200) -> dict:
+    """Benchmark numerical vs closed-form full-pose IK per call."""
+    fk = ForwardKinematics()
+    numerical = InverseKinematics(use_analytic=False, tolerance=1e-3, learning_rate=0.5)
+    analytic = InverseKinematics()
+    q = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+    target = fk.compute(q)
+    seed = q + 0.05
+
+    def run(ik):
+        for _ in range(num_calls):
+            ik.compute(target, initial_guess=seed, position_only=False)
+
+    numerical_s = _time_call(lambda: run(numerical), repeats=1)
+    analytic_s = _time_call(lambda: run(analytic))
+
+    return {
+        "numerical_us": numerical_s / num_calls * 1e6,
+        "analytic_us": analytic_s / num_calls * 1e6,
+        "speedup": numerical_s / analytic_s,
+    }
+
+
+def benchmark_ik_batch(num_points: int = 500) -> dict:
+    """Benchmark per-point IK calls vs compute_batch along a smooth path."""
+    fk = ForwardKinematics()
+    ik = InverseKinematics(use_analytic=False)
+    t = np.linspace(0.0, 1.0, num_points)[:, None]
+    start = np.array([0.1, -0.3, 0.4, 0.0, 0.5, 0.0])
+    end = np.array([0.6, -0.1, 0.2, 0.3, 0.8, -0.4])
+    targets = fk.compute_batch(start + t * (end - start))
+
+    def run_loop():
+        q = start
+        for target in targets:
+            q, _ = ik.compute(target, initial_guess=q)
+
+    loop_s = _time_call(run_loop, repeats=1)
+    batch_s = _time_call(lambda: ik.compute_batch(targets, initial_guess=start))
+
+    return {
+        "num_points": num_points,
+        "loop_ms": loop_s * 1000,
+        "batch_ms": batch_s * 1000,
+        "speedup": loop_s / batch_s,
+    }
+
+
+def main() -> None:
+    result = benchmark_fk_batch()
+    print(f"FK over {result['num_samples']} samples")
+    print(f"  Python loop:   {result['loop_ms']:8.2f} ms")
+    print(f"  compute_batch: {result['batch_ms']:8.2f} ms")
+    print(f"  speedup:       {result['speedup']:8.1f}x")
+
+    result = benchmark_jacobian()
+    print("Jacobian per call")
+    print(f"  finite difference (3x6): {result['fd_us']:8.1f} us")
+    print(f"  analytic (6x6):          {result['analytic_us']:8.1f} us")
+    print(f"  speedup:                 {result['speedup']:8.1f}x")
+
+    result = benchmark_ik()
+    print("Full-pose IK per call")
+    print(f"  numerical:   {result['numerical_us']:8.1f} us")
+    print(f"  closed-form: {result['analytic_us']:8.1f} us")
+    print(f"  speedup:     {result['speedup']:8.1f}x")
+
+    result = benchmark_ik_batch()
+    print(f"IK over {result['num_points']} path points")
+    print(f"  per-point (position only):  {result['loop_ms']:8.2f} ms")
+    print(f"  compute_batch (full pose):  {result['batch_ms']:8.2f} ms")
+    print(f"  speedup:                    {result['speedup']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Safety Benchmarks
+
+Measures the per-command cost of SafetyMonitor checks that run inside the
+1 kHz control loop.
+
+Usage:
+    python -m tests.performance.benchmark_safety
+"""
+
+import time
+import numpy as np
+
+from src.safety.collision_checker import BoundingBox, CollisionChecker, Sphere
+from src.safety.safety_monitor import SafetyLimits, SafetyMonitor
+
+
+def _time_per_call(fn, num_calls: int) -> float:
+    """Return the mean wall time (s) of one call over a run."""
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - start) / num_calls
+
+
+def _limits() -> SafetyLimits:
+    """Limits from config/safety/safety_limits.yaml."""
+    return SafetyLimits(
+        joint_min=np.array([-3.0, -2.0, -2.0, -6.0, -2.0, -6.0]),
+        joint_max=np.array([3.0, 2.0, 2.0, 6.0, 2.0, 6.0]),
+        velocity_max=np.array([1.8, 1.5, 1.8, 3.2, 3.2, 5.0]),
+        acceleration_max=np.array([7.0, 5.5, 7.0, 11.0, 11.0, 15.0]),
+        torque_max=np.array([900, 900, 450, 270, 270, 90]),
+    )
+
+
+def benchmark_validate_command(num_calls: int = 100000) -> dict:
+    """Benchmark the all-OK command check."""
+    monitor = SafetyMonitor(_limits())
+    position = np.array([0.1, -0.2, 0.3, 0.0, 0.2, 0.0])
+    velocity = np.full(6, 0.5)
+    torque = np.full(6, 50.0)
+
+    check_s = _time_per_call(lambda: monitor.check_command(position, velocity, torque), num_calls)
+    validate_s = _time_per_call(
+        lambda: monitor.validate_command(position, velocity, torque), num_calls
+    )
+    return {"check_command_us": check_s * 1e6, "validate_command_us": validate_s * 1e6}
+
+
+def benchmark_validate_trajectory(duration_s: float = 60.0, num_runs: int = 10) -> dict:
+    """Benchmark whole-trajectory validation of a 1 kHz motion."""
+    monitor = SafetyMonitor(_limits())
+    t = np.arange(int(duration_s * 1000)) * 0.001
+    phase = t[:, None] * np.linspace(0.5, 1.5, 6)
+    position = 0.5 * np.sin(phase)
+    velocity = 0.5 * np.cos(phase)
+    acceleration = -0.5 * np.sin(phase)
+    torque = np.full_like(position, 50.0)
+
+    validate_s = _time_per_call(
+        lambda: monitor.validate_trajectory(position, velocity, acceleration, torque, time=t),
+        num_runs
+    )
+    return {"samples": len(t), "validate_trajectory_ms": validate_s * 1e3}
+
+
+def benchmark_link_collision(num_calls: int = 2000, num_samples: int = 10000) -> dict:
+    """Benchmark link capsule collision checks for one state and a planned path."""
+    checker = CollisionChecker(np.array([-2500.0, -2500, 0]), np.array([2500.0, 2500, 3000]))
+    checker.add_box_obstacle(BoundingBox(np.array([-3000.0, -3000, -100]),
+                                         np.array([3000.0, 3000, 0]), "floor"))
+    checker.add_sphere_obstacle(Sphere(np.zeros(3), 300.0, "base"))
+    q = np.array([0.0, -1.0, 0.0, 0.0, 0.0, 0.0])
+    path = np.tile(q, (num_samples, 1))
+    path[:, 0] = np.linspace(-1.0, 1.0, num_samples)
+
+    single_s = _time_per_call(lambda: checker.check_configuration(q), num_calls)
+    batch_s = _time_per_call(lambda: checker.check_configurations(path), 5)
+    return {
+        "num_capsules": len(checker.robot_model.capsules),
+        "samples": num_samples,
+        "single_us": single_s * 1e6,
+        "batch_ms": batch_s * 1e3,
+    }
+
+
+def main() -> None:
+    """Run all safety benchmarks and print a summary."""
+    results = benchmark_validate_command()
+    print("SafetyMonitor command check (all within limits)")
+    print(f"  check_command:    {results['check_command_us']:.2f} us")
+    print(f"  validate_command: {results['validate_command_us']:.2f} us")
+
+    results = benchmark_validate_trajectory()
+    print(f"SafetyMonitor.validate_trajectory ({results['samples']} samples)")
+    print(f"  {results['validate_trajectory_ms']:.1f} ms")
+
+    results = benchmark_link_collision()
+    print(f"CollisionChecker link capsules ({results['num_capsules']} capsules)")
+    print(f"  current state:        {results['single_us']:.1f} us")
+    print(f"  {results['samples']} samples batch: {results['batch_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Trajectory Benchmarks
+
+Measures online re-planning latency, which must fit inside one 1 ms
+control cycle, and compares the motion time of blended splines with
+stopping at every waypoint.
+
+Usage:
+    python -m tests.performance.benchmark_trajectory
+"""
+
+import time
+import numpy as np
+
+from src.control.online_trajectory import OnlineTrajectoryGenerator
+from src.control.trajectory_planner import (
+    ProfileType, SplineType, TrajectoryLimits, TrajectoryPlanner
+)
+
+
+LIMITS = TrajectoryLimits(
+    max_velocity=np.array([1.96, 1.57, 1.96, 3.49, 3.49, 5.24]),
+    max_acceleration=np.array([8.0, 6.0, 8.0, 12.0, 12.0, 16.0]),
+    max_jerk=np.array([40.0, 30.0, 40.0, 60.0, 60.0, 80.0]),
+)
+
+
+def _percentiles(latencies_s: list) -> dict:
+    """Summarize latencies in microseconds."""
+    us = np.array(latencies_s) * 1e6
+    return {
+        "p50_us": float(np.percentile(us, 50)),
+        "p99_us": float(np.percentile(us, 99)),
+        "max_us": float(np.max(us)),
+    }
+
+
+def benchmark_online_update(num_calls: int = 2000) -> dict:
+    """Latency of OnlineTrajectoryGenerator.update from random states."""
+    generator = OnlineTrajectoryGenerator(LIMITS)
+    rng = np.random.default_rng(0)
+    states = [
+        (
+            rng.uniform(-1, 1, 6),
+            rng.uniform(-1, 1, 6) * LIMITS.max_velocity,
+            rng.uniform(-1, 1, 6) * LIMITS.max_acceleration,
+            rng.uniform(-1, 1, 6),
+        )
+        for _ in range(num_calls)
+    ]
+
+    latencies = []
+    for state in states:
+        start = time.perf_counter()
+        generator.update(*state)
+        latencies.append(time.perf_counter() - start)
+    return _percentiles(latencies)
+
+
+def benchmark_online_evaluate(num_calls: int = 5000) -> dict:
+    """Latency of sampling one setpoint from an OnlineTrajectory."""
+    generator = OnlineTrajectoryGenerator(LIMITS)
+    trajectory = generator.update(np.zeros(6), np.zeros(6), np.zeros(6), np.ones(6))
+
+    latencies = []
+    for i in range(num_calls):
+        t = (i % 1000) * 0.001
+        start = time.perf_counter()
+        trajectory.evaluate(t)
+        latencies.append(time.perf_counter() - start)
+    return _percentiles(latencies)
+
+
+def _waypoint_paths(kind: str, num_paths: int, num_points: int, seed: int = 0):
+    """
+    Random 6-joint waypoint paths.
+
+    "reversing" draws every waypoint independently in [-1, 1] rad, so
+    joints change direction at most waypoints; "monotone" accumulates
+    steps whose sign is fixed per joint, so no joint reverses.
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(num_paths):
+        if kind == "reversing":
+            yield list(rng.uniform(-1.0, 1.0, (num_points, 6)))
+        else:
+            steps = rng.uniform(0.1, 0.4, (num_points - 1, 6)) * rng.choice([-1, 1], 6)
+            yield list(np.vstack([np.zeros(6), np.cumsum(steps, axis=0)]))
+
+
+def benchmark_spline_duration(num_paths: int = 20, num_points: int = 6) -> dict:
+    """Mean motion time (s) of blended splines vs. stopping at each waypoint."""
+    planners = {
+        "spline_cubic": lambda wps: TrajectoryPlanner(LIMITS).plan_spline(
+            wps, spline=SplineType.CUBIC),
+        "spline_quintic": lambda wps: TrajectoryPlanner(LIMITS).plan_spline(
+            wps, spline=SplineType.QUINTIC),
+        "stop_trapezoidal": lambda wps: TrajectoryPlanner(
+            LIMITS, profile=ProfileType.TRAPEZOIDAL).plan_waypoints(wps),
+        "stop_s_curve": lambda wps: TrajectoryPlanner(
+            LIMITS, profile=ProfileType.S_CURVE).plan_waypoints(wps),
+    }
+    results = {}
+    for kind in ("reversing", "monotone"):
+        durations = {name: [] for name in planners}
+        for waypoints in _waypoint_paths(kind, num_paths, num_points):
+            for name, plan in planners.items():
+                durations[name].append(plan(waypoints).duration)
+        results[kind] = {name: float(np.mean(d)) for name, d in durations.items()}
+    return results
+
+
+def main() -> None:
+    for name, result in (
+        ("OnlineTrajectoryGenerator.update", benchmark_online_update()),
+        ("OnlineTrajectory.evaluate", benchmark_online_evaluate()),
+    ):
+        print(name)
+        print(f"  p50: {result['p50_us']:8.1f} us")
+        print(f"  p99: {result['p99_us']:8.1f} us")
+        print(f"  max: {result['max_us']:8.1f} us")
+
+    for kind, durations in benchmark_spline_duration().items():
+        print(f"Waypoint motion time, {kind} paths (mean s)")
+        for name, duration in durations.items():
+            print(f"  {name + ':':18s}{duration:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Unit tests for rigid-body dynamics."""
+import pytest
+import numpy as np
+from src.control.dynamics import (
+    DEFAULT_LINK_INERTIAS, LinkInertia, RigidBodyDynamics, load_link_inertias,
+)
+from src.control.feedforward import DynamicsParams, FeedforwardCompensator
+from src.control.kinematics import DEFAULT_DH_PARAMS, DHParameters, ForwardKinematics
+
+@pytest.fixture
+def dynamics():
+    return RigidBodyDynamics()
+
+@pytest.fixture
+def state():
+    return (
+        np.array([0.3, -0.5, 0.8, 0.4, -0.6, 0.2]),
+        np.array([0.5, -0.3, 0.7, 1.0, -0.8, 0.4]),
+        np.array([1.0, 2.0, -1.0, 0.5, 0.3, -2.0]),
+    )
+
+def _link_poses(q):
+    """World COM position (m) and rotation of every link from forward kinematics."""
+    frames = ForwardKinematics().compute_frames(q)
+    return [
+        (frames[i + 1][:3, :3] @ link.com + frames[i + 1][:3, 3] / 1000.0, frames[i + 1][:3, :3])
+        for i, link in enumerate(DEFAULT_LINK_INERTIAS)
+    ]
+
+class TestRigidBodyDynamics:
+    def test_gravity_is_potential_gradient(self, dynamics, state):
+        q = state[0]
+
+        def potential(q):
+            return sum(link.mass * 9.81 * com[2]
+                       for link, (com, _) in zip(DEFAULT_LINK_INERTIAS, _link_poses(q)))
+        h = 1e-6
+        expected = [(potential(q + e * h) - potential(q - e * h)) / (2 * h) for e in np.eye(6)]
+        np.testing.assert_allclose(dynamics.gravity_torque(q), expected, atol=1e-4)
+
+    def test_mass_matrix_matches_jacobian_form(self, dynamics, state):
+        q, h = state[0], 1e-6
+        base = _link_poses(q)
+        plus = [_link_poses(q + e * h) for e in np.eye(6)]
+        minus = [_link_poses(q - e * h) for e in np.eye(6)]
+        expected = np.zeros((6, 6))
+        for i, link in enumerate(DEFAULT_LINK_INERTIAS):
+            jv = np.stack([(p[i][0] - m[i][0]) / (2 * h) for p, m in zip(plus, minus)], axis=1)
+            jw = []
+            for p, m in zip(plus, minus):
+                skew = (p[i][1] - m[i][1]) / (2 * h) @ base[i][1].T
+                jw.append([skew[2, 1], skew[0, 2], skew[1, 0]])
+            jw = np.array(jw).T
+            rotation = base[i][1]
+            expected += link.mass * jv.T @ jv + jw.T @ rotation @ link.inertia @ rotation.T @ jw
+        M = dynamics.mass_matrix(q)
+        np.testing.assert_allclose(M, expected, atol=1e-5)
+        np.testing.assert_allclose(M, M.T, atol=1e-9)
+        assert np.all(np.linalg.eigvalsh(M) > 0)
+
+    def test_decomposition(self, dynamics, state):
+        q, qd, qdd = state
+        expected = dynamics.mass_matrix(q) @ qdd + dynamics.coriolis_torque(q, qd) + \
+            dynamics.gravity_torque(q)
+        np.testing.assert_allclose(dynamics.inverse_dynamics(q, qd, qdd), expected, atol=1e-9)
+
+    def test_power_balance(self, dynamics, state):
+        q, qd, qdd = state
+
+        def kinetic(q, qd):
+            return 0.5 * qd @ dynamics.mass_matrix(q) @ qd
+        dt = 1e-6
+        ahead, behind = kinetic(q + qd * dt, qd + qdd * dt), kinetic(q - qd * dt, qd - qdd * dt)
+        rate = (ahead - behind) / (2 * dt)
+        power = qd @ dynamics.inverse_dynamics(q, qd, qdd, gravity=False)
+        assert power == pytest.approx(rate, rel=1e-5)
+
+    def test_out_buffer(self, dynamics, state):
+        out = np.empty(6)
+        assert dynamics.inverse_dynamics(*state, out=out) is out
+
+    def test_batch_matches_single(self, dynamics):
+        rng = np.random.default_rng(0)
+        q, qd, qdd = (rng.uniform(-2, 2, size=(50, 6)) for _ in range(3))
+        batch = dynamics.inverse_dynamics_batch(q, qd, qdd)
+        assert batch.shape == (50, 6)
+        for k in (0, 17, 49):
+            np.testing.assert_allclose(batch[k], dynamics.inverse_dynamics(q[k], qd[k], qdd[k]),
+                                       atol=1e-9)
+
+    def test_load_link_inertias(self, state):
+        links = load_link_inertias("config/robot/kuka_kr150.yaml")
+        assert len(links) == 6
+        loaded = RigidBodyDynamics(links=links)
+        np.testing.assert_allclose(loaded.inverse_dynamics(*state),
+                                   RigidBodyDynamics().inverse_dynamics(*state))
+
+    def test_payload(self, state):
+        q = state[0]
+        dynamics = RigidBodyDynamics()
+        version = dynamics.version
+        unloaded = dynamics.gravity_torque(q).copy()
+        dynamics.set_payload(150.0, np.array([0.0, 0.0, 0.2]))
+        assert dynamics.version > version
+        # Same as folding the payload into the last link by hand
+        flange = DEFAULT_LINK_INERTIAS[-1]
+        mass = flange.mass + 150.0
+        com = (flange.mass * flange.com + 150.0 * np.array([0.0, 0.0, 0.2])) / mass
+        offsets = [flange.com - com, np.array([0.0, 0.0, 0.2]) - com]
+        inertia = flange.inertia + sum(
+            m * (d @ d * np.eye(3) - np.outer(d, d)) for m, d in zip((flange.mass, 150.0), offsets)
+        )
+        links = DEFAULT_LINK_INERTIAS[:-1] + [LinkInertia(mass, com, inertia)]
+        np.testing.assert_allclose(dynamics.inverse_dynamics(*state),
+                                   RigidBodyDynamics(links=links).inverse_dynamics(*state))
+        dynamics.set_payload(0.0)
+        np.testing.assert_allclose(dynamics.gravity_torque(q), unloaded)
+
+    def test_link_count_mismatch(self):
+        with pytest.raises(ValueError):
+            RigidBodyDynamics(links=DEFAULT_LINK_INERTIAS[:5])
+
+    def test_dh_change_rebuilds_geometry(self, dynamics, state):
+        dh = list(DEFAULT_DH_PARAMS)
+        dh[1] = DHParameters(a=1300, d=0, alpha=0)
+        version = dynamics.version
+        dynamics.dh_params = dh
+        assert dynamics.version > version
+        np.testing.assert_allclose(dynamics.inverse_dynamics(*state),
+                                   RigidBodyDynamics(dh).inverse_dynamics(*state))
+
+class TestFeedforwardWithDynamics:
+    def test_uses_inverse_dynamics(self, dynamics, state):
+        params = DynamicsParams(inertia=np.ones(6), friction_coulomb=np.full(6, 2.0),
+                                friction_viscous=np.full(6, 0.5))
+        compensator = FeedforwardCompensator(params, dynamics=dynamics)
+        q, qd, qdd = state
+        expected = dynamics.inverse_dynamics(q, qd, qdd) + 2.0 * np.sign(qd) + 0.5 * qd
+        np.testing.assert_allclose(compensator.compute(q, qd, qdd), expected)
+
+    def test_gravity_compensation_flag(self, dynamics, state):
+        params = DynamicsParams(inertia=np.ones(6), friction_coulomb=np.zeros(6),
+                                friction_viscous=np.zeros(6), gravity_compensation=False)
+        compensator = FeedforwardCompensator(params, dynamics=dynamics)
+        q, qd, qdd = state
+        np.testing.assert_allclose(compensator.compute(q, qd, qdd),
+                                   dynamics.inverse_dynamics(q, qd, qdd, gravity=False))
+
+    def test_batch_gravity_matches_single(self, dynamics):
+        params = DynamicsParams(inertia=np.ones(6), friction_coulomb=np.zeros(6),
+                                friction_viscous=np.zeros(6))
+        compensator = FeedforwardCompensator(params, dynamics=dynamics)
+        positions = np.random.default_rng(3).uniform(-1.5, 1.5, size=(20, 6))
+        expected = [compensator._compute_gravity_torque(q) for q in positions]
+        np.testing.assert_allclose(compensator._compute_gravity_torque(positions), expected,
+                                   atol=1e-9)
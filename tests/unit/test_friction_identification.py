@@ -0,0 +1,96 @@
+"""Unit tests for friction identification."""
+import pytest
+import numpy as np
+from src.control.dynamics import RigidBodyDynamics
+from src.control.feedforward import DynamicsParams, friction_torque, load_dynamics_params
+from src.control.friction_identification import (
+    FrictionIdentifier, identify_friction, save_friction_to_config,
+)
+
+@pytest.fixture
+def true_params():
+    return DynamicsParams(
+        inertia=np.ones(6),
+        friction_coulomb=np.array([18.0, 22.0, 12.0, 4.0, 3.5, 1.5]),
+        friction_viscous=np.array([12.0, 15.0, 8.0, 2.0, 1.5, 0.6]),
+        friction_static=np.array([24.0, 30.0, 16.0, 5.5, 4.5, 2.0]),
+        stribeck_velocity=np.array([0.05, 0.04, 0.06, 0.08, 0.1, 0.12]),
+        friction_smoothing=0.01,
+    )
+
+def _log(params, dynamics=None, seed=0, duration=20.0):
+    """Slow-to-fast sinusoidal sweeps with measurement noise, sampled at 1kHz."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(0.0, duration, 0.001)
+    frequency = 0.05 + 0.5 * t / duration
+    phase = 2 * np.pi * np.cumsum(frequency) * 0.001
+    amplitude = np.linspace(0.4, 0.8, 6)
+    position = amplitude * np.sin(phase)[:, None]
+    velocity = amplitude * (2 * np.pi * frequency * np.cos(phase))[:, None]
+    torque = friction_torque(params, velocity) + rng.normal(scale=0.3, size=velocity.shape)
+    if dynamics is not None:
+        acceleration = np.gradient(velocity, t, axis=0)
+        torque += dynamics.inverse_dynamics_batch(position, velocity, acceleration)
+    return t, position, velocity, torque
+
+class TestFrictionIdentifier:
+    def test_recovers_parameters(self, true_params):
+        fit = identify_friction([_log(true_params)])
+        np.testing.assert_allclose(fit.coulomb, true_params.friction_coulomb, rtol=0.05, atol=0.1)
+        np.testing.assert_allclose(fit.static, true_params.friction_static, rtol=0.1, atol=0.2)
+        np.testing.assert_allclose(fit.viscous, true_params.friction_viscous, rtol=0.05, atol=0.05)
+        np.testing.assert_allclose(fit.stribeck_velocity, true_params.stribeck_velocity, rtol=0.3)
+        assert np.all(fit.rms_residual < 0.35)
+
+    def test_removes_rigid_body_torque(self, true_params):
+        dynamics = RigidBodyDynamics()
+        fit = identify_friction([_log(true_params, dynamics)], dynamics=dynamics)
+        np.testing.assert_allclose(fit.coulomb, true_params.friction_coulomb, rtol=0.1, atol=0.3)
+        np.testing.assert_allclose(fit.viscous, true_params.friction_viscous, rtol=0.1, atol=0.1)
+
+    def test_chunking_and_multiple_logs(self, true_params):
+        logs = [_log(true_params, seed=s, duration=5.0) for s in range(2)]
+        whole = FrictionIdentifier(chunk_size=1 << 20)
+        chunked = FrictionIdentifier(chunk_size=777)
+        for log in logs:
+            whole.add_log(*log)
+            chunked.add_log(*log)
+        a, b = whole.solve(), chunked.solve()
+        assert a.num_samples == b.num_samples == 10000
+        np.testing.assert_allclose(a.coulomb, b.coulomb, rtol=1e-9)
+        np.testing.assert_allclose(a.viscous, b.viscous, rtol=1e-9)
+
+    def test_solve_without_data(self):
+        with pytest.raises(RuntimeError):
+            FrictionIdentifier().solve()
+
+    def test_write_back(self, true_params, tmp_path):
+        path = tmp_path / "dynamics.yaml"
+        path.write_text(open("config/control/dynamics.yaml").read())
+        fit = identify_friction([_log(true_params, duration=5.0)])
+        save_friction_to_config(fit, str(path))
+        params = load_dynamics_params(str(path))
+        np.testing.assert_allclose(params.friction_coulomb, fit.coulomb, atol=1e-4)
+        np.testing.assert_allclose(params.stribeck_velocity, fit.stribeck_velocity, atol=1e-5)
+        assert params.friction_smoothing == fit.smoothing_velocity
+        np.testing.assert_allclose(params.inertia, load_dynamics_params(
+            "config/control/dynamics.yaml").inertia)
+
+class TestFrictionTorque:
+    def test_smooth_through_zero(self, true_params):
+        velocity = np.linspace(-1e-3, 1e-3, 101)[:, None] * np.ones(6)
+        torque = friction_torque(true_params, velocity)
+        assert np.all(np.abs(np.diff(torque, axis=0)) < 1.0)
+        np.testing.assert_allclose(torque[50], 0.0)
+
+    def test_legacy_model(self):
+        params = DynamicsParams(np.ones(2), np.array([2.0, 3.0]), np.array([0.5, 1.0]))
+        velocity = np.array([-0.4, 0.2])
+        expected = params.friction_coulomb * np.sign(velocity) + params.friction_viscous * velocity
+        np.testing.assert_allclose(friction_torque(params, velocity), expected)
+
+    def test_apply_fit(self, true_params):
+        fit = identify_friction([_log(true_params, duration=5.0)])
+        params = fit.apply(DynamicsParams(np.ones(6), np.zeros(6), np.zeros(6)))
+        assert params.friction_smoothing == fit.smoothing_velocity
+        np.testing.assert_array_equal(params.friction_static, fit.static)
@@ -0,0 +1,70 @@
+"""Unit tests for gain scheduling."""
+import pytest
+import numpy as np
+from src.control.gain_scheduling import GainSchedule, GainScheduler, GridAxis, load_gain_schedule
+from src.control.pid_controller import (
+    AntiWindup, MultiJointPIDController, PIDGains, VectorizedPIDController, load_pid_gains,
+)
+
+@pytest.fixture
+def schedule():
+    rng = np.random.default_rng(0)
+    return GainSchedule(
+        joint_2=GridAxis(-2.0, 2.0, 5),
+        joint_3=GridAxis(-1.0, 1.0, 3),
+        payload=GridAxis(0.0, 150.0, 2),
+        gains=rng.uniform(1.0, 100.0, size=(5, 3, 2, 3, 6)),
+    )
+
+class TestGainScheduler:
+    def test_grid_points_exact(self, schedule):
+        scheduler = GainScheduler(schedule)
+        np.testing.assert_allclose(scheduler.lookup(-1.0, 0.0, 150.0), schedule.gains[1, 1, 1])
+        np.testing.assert_allclose(scheduler.lookup(2.0, 1.0, 0.0), schedule.gains[4, 2, 0])
+
+    def test_trilinear_midpoint(self, schedule):
+        scheduler = GainScheduler(schedule)
+        expected = schedule.gains[1:3, 0:2, 0:2].mean(axis=(0, 1, 2))
+        np.testing.assert_allclose(scheduler.lookup(-0.5, -0.5, 75.0), expected)
+
+    def test_linear_along_payload(self, schedule):
+        scheduler = GainScheduler(schedule)
+        low, high = schedule.gains[2, 1, 0], schedule.gains[2, 1, 1]
+        np.testing.assert_allclose(scheduler.lookup(0.0, 0.0, 30.0), 0.8 * low + 0.2 * high)
+
+    def test_clamped_outside_table(self, schedule):
+        scheduler = GainScheduler(schedule)
+        np.testing.assert_allclose(scheduler.lookup(-5.0, 3.0, 400.0), schedule.gains[0, 2, 1])
+
+    def test_shape_validation(self):
+        with pytest.raises(ValueError):
+            GainSchedule(GridAxis(0, 1, 2), GridAxis(0, 1, 2), GridAxis(0, 1, 2),
+                         np.zeros((2, 2, 3, 3, 6)))
+
+    def test_apply_to_controllers(self, schedule):
+        gains_list = [PIDGains(kp=1.0, ki=1.0, kd=1.0, anti_windup=AntiWindup.BACK_CALCULATION)
+                      for _ in range(6)]
+        per_joint = MultiJointPIDController(gains_list)
+        vectorized = VectorizedPIDController(gains_list)
+        scheduler = GainScheduler(schedule)
+        positions = np.array([0.0, 0.7, -0.3, 0.0, 0.0, 0.0])
+        scheduler.apply(per_joint, positions, 40.0)
+        scheduler.apply(vectorized, positions, 40.0)
+        np.testing.assert_allclose(vectorized.kp, scheduler.lookup(0.7, -0.3, 40.0)[0])
+        targets, actuals = np.full(6, 2.0), np.zeros(6)
+        for _ in range(20):
+            np.testing.assert_array_equal(
+                vectorized.compute(targets, actuals, 0.001),
+                per_joint.compute(targets, actuals, 0.001),
+            )
+
+    def test_load_config(self):
+        schedule = load_gain_schedule("config/control/gain_schedule.yaml")
+        assert schedule.gains.shape == (3, 3, 2, 3, 6)
+        assert np.all(schedule.gains > 0)
+        # The shipped table is an untuned placeholder that reproduces pid_gains.yaml
+        base = load_pid_gains("config/control/pid_gains.yaml")
+        scheduler = GainScheduler(schedule)
+        np.testing.assert_allclose(scheduler.lookup(0.7, -1.2, 60.0),
+                                   [[g.kp for g in base], [g.ki for g in base],
+                                    [g.kd for g in base]])
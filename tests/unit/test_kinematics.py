@@ -1,7 +1,9 @@
 """Unit tests for kinematics module."""
 import pytest
 import numpy as np
-from src.control.kinematics import ForwardKinematics, InverseKinematics
+from src.control.kinematics import (
+    DEFAULT_DH_PARAMS, DHParameters, ForwardKinematics, IKCache, InverseKinematics
+)
 
 class TestForwardKinematics:
     def test_init(self):
@@ -35,3 +37,212 @@ class TestInverseKinematics:
         # Should converge close to original
         if success:
             assert np.allclose(fk.get_position(result), target[:3, 3], atol=1.0)
+
+class TestForwardKinematicsBatch:
+    def test_matches_single(self):
+        fk = ForwardKinematics()
+        rng = np.random.default_rng(0)
+        q = rng.uniform(-np.pi, np.pi, size=(50, 6))
+        T = fk.compute_batch(q)
+        assert T.shape == (50, 4, 4)
+        for i in range(len(q)):
+            assert np.allclose(T[i], fk.compute(q[i]))
+
+    def test_bad_shape(self):
+        fk = ForwardKinematics()
+        with pytest.raises(ValueError):
+            fk.compute_batch(np.zeros((10, 5)))
+
+class TestJacobian:
+    def test_matches_finite_difference(self, sample_joint_positions):
+        fk = ForwardKinematics()
+        J = fk.jacobian(sample_joint_positions)
+        assert J.shape == (6, 6)
+
+        delta = 1e-6
+        base = fk.compute(sample_joint_positions)
+        for i in range(6):
+            q = sample_joint_positions.copy()
+            q[i] += delta
+            T = fk.compute(q)
+            assert np.allclose(J[:3, i], (T[:3, 3] - base[:3, 3]) / delta, atol=1e-2)
+            # Angular column: skew part of dR R^T
+            dR = (T[:3, :3] - base[:3, :3]) / delta @ base[:3, :3].T
+            omega = np.array([dR[2, 1], dR[0, 2], dR[1, 0]])
+            assert np.allclose(J[3:, i], omega, atol=1e-4)
+
+    def test_full_pose_ik(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics(tolerance=1e-3, orientation_tolerance=1e-5, learning_rate=0.5)
+
+        original = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+        target = fk.compute(original)
+
+        result, success = ik.compute(
+            target, initial_guess=original + 0.05, position_only=False
+        )
+        assert success
+        assert np.allclose(fk.compute(result), target, atol=1e-2)
+
+class TestAnalyticInverseKinematics:
+    def test_default_params_have_spherical_wrist(self):
+        assert InverseKinematics().has_spherical_wrist
+
+    def test_all_branches_reach_target(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics()
+        target = fk.compute(np.array([0.3, -0.4, 0.6, 0.5, 0.7, -0.2]))
+
+        branches = ik.compute_all_branches(target)
+        assert len(branches) == 8
+        for q in branches:
+            assert np.allclose(fk.compute(q), target, atol=1e-6)
+
+    def test_nearest_branch_to_seed(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics()
+        original = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+
+        result, success = ik.compute(
+            fk.compute(original), initial_guess=original + 0.05, position_only=False
+        )
+        assert success
+        assert np.allclose(result, original, atol=1e-6)
+
+    def test_unreachable(self):
+        ik = InverseKinematics()
+        target = np.eye(4)
+        target[:3, 3] = [10000.0, 0.0, 0.0]
+        result, success = ik.compute_analytic(target)
+        assert not success
+
+    def test_numerical_fallback(self):
+        dh = list(DEFAULT_DH_PARAMS)
+        dh[4] = DHParameters(a=15, d=0, alpha=-np.pi / 2)
+        ik = InverseKinematics(dh, tolerance=1e-3, learning_rate=0.5)
+        assert not ik.has_spherical_wrist
+        with pytest.raises(ValueError):
+            ik.compute_all_branches(np.eye(4))
+
+        original = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+        target = ik.fk.compute(original)
+        result, success = ik.compute(
+            target, initial_guess=original + 0.05, position_only=False
+        )
+        assert success
+        assert np.allclose(ik.fk.compute(result), target, atol=1e-2)
+
+class TestBatchInverseKinematics:
+    @pytest.fixture
+    def path(self):
+        t = np.linspace(0.0, 1.0, 600)[:, None]
+        start = np.array([0.1, -0.3, 0.4, 0.0, 0.5, 0.0])
+        end = np.array([0.6, -0.1, 0.2, 0.3, 0.8, -0.4])
+        return start + t * (end - start)
+
+    def test_full_pose_path(self, path):
+        fk = ForwardKinematics()
+        ik = InverseKinematics()
+        targets = fk.compute_batch(path)
+
+        q, converged, iterations = ik.compute_batch(targets, initial_guess=path[0], block_size=100)
+        assert q.shape == path.shape
+        assert converged.all()
+        assert np.all(iterations < ik.max_iterations)
+        assert np.allclose(fk.compute_batch(q), targets, atol=1e-4)
+
+    def test_position_only(self, path):
+        fk = ForwardKinematics()
+        ik = InverseKinematics()
+        targets = fk.compute_batch(path[:50])
+
+        q, converged, _ = ik.compute_batch(targets, initial_guess=path[0], position_only=True)
+        assert converged.all()
+        assert np.allclose(fk.compute_batch(q)[:, :3, 3], targets[:, :3, 3], atol=1e-4)
+
+    def test_unreachable_point_flagged(self, path):
+        fk = ForwardKinematics()
+        ik = InverseKinematics(max_iterations=20)
+        targets = fk.compute_batch(path[:10])
+        targets[5, :3, 3] = [10000.0, 0.0, 0.0]
+
+        _, converged, iterations = ik.compute_batch(targets, initial_guess=path[0])
+        assert not converged[5]
+        assert iterations[5] == 20
+        assert converged[np.arange(10) != 5].all()
+
+class TestIKCache:
+    def test_branches_are_distinct(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics()
+        target = fk.compute(np.array([0.3, -0.4, 0.6, 0.5, 0.7, -0.2]))
+        branches = ik.compute_all_branches(target)
+        assert len({ik.configuration_branch(q) for q in branches}) == 8
+
+    def test_hit_and_miss(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics(cache=IKCache(max_size=8))
+        original = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+        target = fk.compute(original)
+
+        first, success = ik.compute(target, initial_guess=original, position_only=False)
+        assert success
+        second, success = ik.compute(target, initial_guess=original, position_only=False)
+        assert success
+        assert np.allclose(first, second)
+        assert ik.cache.hits == 1
+        assert ik.cache.misses == 1
+
+    def test_hit_wrapped_to_seed(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics(cache=IKCache())
+        original = np.array([0.1, -0.2, 0.3, 0.4, 0.4, 3.1])
+        target = fk.compute(original)
+        ik.compute(target, initial_guess=original, position_only=False)
+
+        # Same branch and pose, but the wrist joints are a full turn away
+        seed = original - [0, 0, 0, 2 * np.pi, 0, 2 * np.pi + 0.1]
+        cached, success = ik.compute(target, initial_guess=seed, position_only=False)
+        assert success
+        assert ik.cache.hits == 1
+        uncached, _ = InverseKinematics().compute(target, initial_guess=seed, position_only=False)
+        np.testing.assert_allclose(cached, uncached, atol=1e-9)
+        assert cached[3] == pytest.approx(0.4 - 2 * np.pi)
+
+    def test_eviction(self):
+        cache = IKCache(max_size=2)
+        for i in range(3):
+            pose = np.eye(4)
+            pose[0, 3] = i
+            cache.put(cache.make_key(pose, 0, False), np.zeros(6))
+        assert len(cache) == 2
+        assert cache.evictions == 1
+
+    def test_invalidated_on_dh_change(self):
+        fk = ForwardKinematics()
+        ik = InverseKinematics(cache=IKCache())
+        original = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+        ik.compute(fk.compute(original), initial_guess=original, position_only=False)
+        assert len(ik.cache) == 1
+
+        dh = list(DEFAULT_DH_PARAMS)
+        dh[1] = DHParameters(a=1251, d=0, alpha=0)
+        ik.fk.dh_params = dh
+        ik.compute(fk.compute(original), initial_guess=original, position_only=False)
+        assert ik.cache.misses == 2
+        assert len(ik.cache) == 1
+
+    def test_dh_params_only_change_through_setter(self):
+        fk = ForwardKinematics()
+        with pytest.raises(AttributeError):
+            fk.dh_params[1].a = 1300
+        with pytest.raises(TypeError):
+            fk.dh_params[1] = DHParameters(a=1300, d=0, alpha=0)
+
+        version = fk.dh_version
+        dh = list(DEFAULT_DH_PARAMS)
+        dh[1] = DHParameters(a=1300, d=0, alpha=0)
+        fk.dh_params = dh
+        assert fk.dh_version == version + 1
+        q = np.array([0.1, -0.2, 0.3, 0.2, 0.4, -0.1])
+        np.testing.assert_allclose(fk.compute_batch(q[None])[0], fk.compute(q), atol=1e-9)
@@ -0,0 +1,96 @@
+"""Unit tests for link capsule collision model."""
+import pytest
+import numpy as np
+from src.control.kinematics import DHParameters
+from src.safety.collision_checker import BoundingBox, CollisionChecker, Sphere
+from src.safety.link_capsules import (
+    CapsuleRobotModel, segment_box_distance, segment_point_distance, segment_segment_distance
+)
+
+class TestDistances:
+    def test_segment_box(self):
+        lo, hi = np.zeros(3), np.ones(3)
+        assert segment_box_distance(np.array([2.0, 0, 0]), np.array([2.0, 2, 0]), lo, hi) == \
+            pytest.approx(1.0)
+        assert segment_box_distance(np.array([-1.0, .5, .5]), np.array([2.0, .5, .5]), lo, hi) \
+            == 0.0
+        # Closest to the box edge at x = y = 1
+        d = segment_box_distance(np.array([3.0, 0, 0.5]), np.array([0.0, 3, 0.5]), lo, hi)
+        assert d == pytest.approx(1 / np.sqrt(2))
+
+    def test_segment_point_and_segment(self):
+        p0, p1 = np.zeros(3), np.array([1.0, 0, 0])
+        assert segment_point_distance(p0, p1, np.array([2.0, 1, 0])) == pytest.approx(np.sqrt(2))
+        crossing = segment_segment_distance(p0, p1, np.array([0.5, -1, 1]), np.array([0.5, 1, 1]))
+        assert crossing == pytest.approx(1.0)
+        parallel = segment_segment_distance(p0, p1, np.array([0.5, 2, 0]), np.array([3.0, 2, 0]))
+        assert parallel == pytest.approx(2.0)
+        point = segment_segment_distance(p0, p1, np.array([-1.0, 0, 0]), np.array([-1.0, 0, 0]))
+        assert point == pytest.approx(1.0)
+
+    def test_broadcasts(self):
+        p0 = np.zeros((4, 1, 3))
+        p1 = np.tile([1.0, 0, 0], (4, 1, 1))
+        lo = np.array([[2.0, 0, 0], [0.0, 3, 0]])
+        assert segment_box_distance(p0, p1, lo, lo + 1).shape == (4, 2)
+
+class TestCollisionChecker:
+    @pytest.fixture
+    def checker(self):
+        checker = CollisionChecker(np.array([-2500.0, -2500, 0]), np.array([2500.0, 2500, 3000]))
+        checker.add_box_obstacle(BoundingBox(np.array([-3000.0, -3000, -100]),
+                                             np.array([3000.0, 3000, 0]), "floor"))
+        checker.add_sphere_obstacle(Sphere(np.zeros(3), 300.0, "base"))
+        return checker
+
+    def test_model_follows_dh_chain(self):
+        model = CapsuleRobotModel()
+        segments = model.segments(np.zeros(6))
+        assert segments.shape == (1, len(model.capsules), 2, 3)
+        # Upper arm runs from the shoulder along x at zero angles
+        upper_arm = model.names.index("link_2_a")
+        np.testing.assert_allclose(segments[0, upper_arm], [[350, 0, 750], [1600, 0, 750]],
+                                   atol=1e-9)
+        assert not model.moving[0]
+
+    def test_model_follows_dh_change(self):
+        model = CapsuleRobotModel()
+        dh = list(model.kinematics.dh_params)
+        dh[1] = DHParameters(a=1300, d=0, alpha=0)
+        model.kinematics.dh_params = dh
+        upper_arm = model.names.index("link_2_a")
+        np.testing.assert_allclose(model.segments(np.zeros(6))[0, upper_arm],
+                                   [[350, 0, 750], [1650, 0, 750]], atol=1e-9)
+
+    def test_links_checked_not_just_tool(self, checker):
+        q = np.array([0, -1.0, 0, 0, 0, 0])
+        assert checker.check_configuration(q) == (True, None)
+        # An obstacle at the middle of the upper arm, far from the tool
+        middle = checker.robot_model.segments(q)[0, 2].mean(axis=0)
+        checker.add_sphere_obstacle(Sphere(middle + [0, 200, 0], 100.0, "fixture"))
+        assert checker.check_configuration(q) == (False, "Link link_2_a collision with fixture")
+
+    def test_obstacle_edits_are_seen(self, checker):
+        q = np.array([0, -1.0, 0, 0, 0, 0])
+        assert checker.check_configuration(q)[0]
+        middle = checker.robot_model.segments(q)[0, 2].mean(axis=0)
+        checker.obstacles_spheres[0] = Sphere(middle, 100.0, "moved")
+        assert checker.check_configuration(q) == (False, "Link link_2_a collision with moved")
+        checker.obstacles_spheres[0].center[:] = [0.0, 0.0, -1000.0]
+        assert checker.check_configuration(q)[0]
+
+    def test_self_collision(self):
+        checker = CollisionChecker(np.full(3, -1e5), np.full(3, 1e5))
+        is_safe, description = checker.check_configuration(np.array([0, -1.57, 2.0, 0, 0, 0]))
+        assert not is_safe
+        assert description.startswith("Self-collision between link_1")
+        assert checker.check_configuration(np.array([0, -1.57, 1.2, 0, 0, 0]))[0]
+
+    def test_batch_reports_first_collision(self, checker):
+        path = np.zeros((50, 6))
+        path[:, 1] = -0.7
+        path[:, 2] = np.linspace(0.0, -1.2, 50)
+        is_safe, index, description = checker.check_configurations(path)
+        assert not is_safe
+        assert checker.check_configurations(path[:index])[0]
+        assert "workspace maximum" in description
@@ -0,0 +1,128 @@
+"""Unit tests for control-loop timing."""
+import time
+import pytest
+import numpy as np
+from src.control.loop_timing import (
+    DeadlineScheduler, LatencyHistogram, LoopTimingMonitor, StageTimer, StageTimingExporter
+)
+from src.control.realtime_controller import (
+    CONTROL_STAGES, ControllerConfig, JointState, RealtimeController
+)
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        histogram = LatencyHistogram(bin_width_ns=1000, max_ns=100_000)
+        for us in range(1, 101):
+            histogram.record(us * 1000 - 500)
+        assert histogram.count == 100
+        np.testing.assert_allclose(histogram.percentiles([50, 99, 100]), [50_000, 99_000, 99_500])
+        assert histogram.max_ns == 99_500
+
+    def test_overflow_bin(self):
+        histogram = LatencyHistogram(bin_width_ns=1000, max_ns=10_000)
+        histogram.record(5_000_000)
+        histogram.record(2_000)
+        assert histogram.count == 2
+        assert histogram.percentiles([100])[0] == 5_000_000
+
+    def test_empty(self):
+        assert np.all(LatencyHistogram().percentiles([50, 99]) == 0)
+
+class TestDeadlineScheduler:
+    def test_no_drift(self):
+        period_ns = 1_000_000
+        scheduler = DeadlineScheduler(period_ns)
+        first = scheduler.start()
+        for k in range(100):
+            # Uneven work below the period must not shift later deadlines
+            busy_until = time.perf_counter_ns() + (k % 5) * 100_000
+            while time.perf_counter_ns() < busy_until:
+                pass
+            scheduler.wait()
+        periods = 100 + scheduler.missed_deadlines
+        assert scheduler.next_deadline - first == periods * period_ns
+
+    def test_overrun_skips_missed_periods(self):
+        scheduler = DeadlineScheduler(1_000_000)
+        deadline = scheduler.start()
+        time.sleep(0.0035)
+        assert scheduler.wait()
+        assert scheduler.missed_deadlines >= 2
+        assert (scheduler.next_deadline - deadline) % 1_000_000 == 0
+        assert scheduler.next_deadline > time.perf_counter_ns()
+
+class TestLoopTimingMonitor:
+    def test_stats(self):
+        monitor = LoopTimingMonitor()
+        monitor.record(None, 100_000, False)
+        for _ in range(99):
+            monitor.record(1_000_000, 100_000, False)
+        monitor.record(1_500_000, 1_200_000, True)
+        stats = monitor.stats()
+        assert stats.cycles == 101
+        assert stats.overruns == 1
+        assert stats.period_p50_us == pytest.approx(1001.0)
+        assert stats.period_max_us == pytest.approx(1500.0)
+        assert stats.compute_max_us == pytest.approx(1200.0)
+
+class TestControllerTiming:
+    def test_running_loop_records_timing(self):
+        controller = RealtimeController()
+        controller.start()
+        time.sleep(0.1)
+        controller.stop()
+        stats = controller.get_timing_stats()
+        assert stats.cycles > 50
+        assert 900 < stats.period_p50_us < 1100
+
+    def test_get_state_includes_timing(self):
+        controller = RealtimeController()
+        controller.timing.record(1_000_000, 50_000, False)
+        assert controller.get_state() is None
+        controller.current_state = JointState(np.zeros(6), np.zeros(6), np.zeros(6), 0.0)
+        state = controller.get_state()
+        assert state.timing.cycles == 1
+        assert controller.current_state.timing is None
+
+class TestStageTiming:
+    @pytest.fixture
+    def timer(self):
+        timer = StageTimer(("a", "b"), capacity=8)
+        for k in range(6):
+            start = k * 1_000_000
+            timer.begin(start)
+            timer._row[1] = start + 100_000
+            timer._row[2] = start + 100_000 + 10_000 * (k + 1)
+            timer.end()
+        return timer
+
+    def test_durations(self, timer):
+        durations, cycle = timer.durations()
+        assert cycle == 6
+        # Only the newest half of the ring is read
+        np.testing.assert_array_equal(durations[:, 0], [100_000] * 4)
+        np.testing.assert_array_equal(durations[:, 1], [30_000, 40_000, 50_000, 60_000])
+        assert len(timer.durations(cycle)[0]) == 0
+
+    def test_exporter_flags_over_budget(self, timer):
+        reports = []
+        exporter = StageTimingExporter(timer, 1_000_000, budget_share=0.08,
+                                       callback=reports.append)
+        report = exporter.export()
+        assert reports == [report]
+        assert report.cycles == 4
+        assert report.stages["a"].max_us == pytest.approx(100.0)
+        assert report.stages["b"].p50_us == pytest.approx(45.0)
+        assert report.flagged == ["a"]
+        assert exporter.export() is None
+
+    def test_controller_exports_stages(self):
+        controller = RealtimeController(ControllerConfig(timing_export_interval_s=0.05))
+        controller.set_target(np.zeros(6))
+        controller.start()
+        time.sleep(0.12)
+        controller.stop()
+        report = controller.get_stage_timing()
+        assert set(report.stages) == set(CONTROL_STAGES)
+        assert report.cycles > 0
+        assert report.flagged == []
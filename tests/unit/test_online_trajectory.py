@@ -0,0 +1,61 @@
+"""Unit tests for online trajectory generation."""
+import pytest
+import numpy as np
+from src.control.online_trajectory import OnlineTrajectoryGenerator
+from src.control.trajectory_planner import TrajectoryLimits
+
+@pytest.fixture
+def limits():
+    return TrajectoryLimits(
+        max_velocity=np.array([1.96, 1.57, 1.96, 3.49, 3.49, 5.24]),
+        max_acceleration=np.array([8.0, 6.0, 8.0, 12.0, 12.0, 16.0]),
+        max_jerk=np.array([40.0, 30.0, 40.0, 60.0, 60.0, 80.0]),
+    )
+
+def _sample(trajectory, dt=0.001):
+    points = [trajectory.evaluate(t) for t in np.arange(0.0, trajectory.duration + dt, dt)]
+    return (
+        np.array([p.position for p in points]),
+        np.array([p.velocity for p in points]),
+        np.array([p.acceleration for p in points]),
+    )
+
+class TestOnlineTrajectoryGenerator:
+    def test_requires_jerk_limit(self):
+        with pytest.raises(ValueError):
+            OnlineTrajectoryGenerator(TrajectoryLimits(np.ones(6), np.ones(6)))
+
+    def test_from_rest(self, limits):
+        generator = OnlineTrajectoryGenerator(limits)
+        target = np.array([1.0, -0.5, 0.2, 2.0, 0.0, -1.0])
+        traj = generator.update(np.zeros(6), np.zeros(6), np.zeros(6), target)
+
+        position, velocity, acceleration = _sample(traj)
+        assert np.allclose(position[-1], target)
+        assert np.allclose(velocity[-1], 0.0)
+        assert np.all(np.abs(velocity) <= limits.max_velocity + 1e-9)
+        assert np.all(np.abs(acceleration) <= limits.max_acceleration + 1e-9)
+
+    def test_continues_from_moving_state(self, limits):
+        generator = OnlineTrajectoryGenerator(limits)
+        position0 = np.array([0.2, 0.1, -0.3, 0.0, 0.5, 0.0])
+        velocity0 = np.array([1.0, -0.8, 0.5, 2.0, -1.0, 3.0])
+        acceleration0 = np.array([4.0, -3.0, 2.0, -6.0, 5.0, 0.0])
+        # Target behind the current motion forces a reversal
+        target = position0 - 0.1
+
+        traj = generator.update(position0, velocity0, acceleration0, target)
+        position, velocity, acceleration = _sample(traj)
+
+        assert np.allclose(position[0], position0)
+        assert np.allclose(velocity[0], velocity0)
+        assert np.allclose(acceleration[0], acceleration0)
+        assert np.allclose(position[-1], target)
+        jerk = np.abs(np.diff(acceleration, axis=0)) / 0.001
+        assert np.all(jerk <= limits.max_jerk * (1 + 1e-6))
+
+    def test_zero_motion(self, limits):
+        generator = OnlineTrajectoryGenerator(limits)
+        traj = generator.update(np.ones(6), np.zeros(6), np.zeros(6), np.ones(6))
+        assert traj.duration == pytest.approx(0.0, abs=1e-6)
+        assert np.allclose(traj.evaluate(0.0).position, 1.0)
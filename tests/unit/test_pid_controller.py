@@ -0,0 +1,114 @@
+"""Unit tests for PID controllers."""
+import pytest
+import numpy as np
+from src.control.pid_controller import (
+    AntiWindup, DerivativeFilter, MultiJointPIDController, PIDController, PIDGains,
+    VectorizedPIDController, load_pid_gains,
+)
+
+@pytest.fixture
+def gains_list():
+    return [
+        PIDGains(kp=100.0 + 10 * i, ki=10.0, kd=5.0 + i, kff_vel=1.0, kff_acc=0.1,
+                 integral_limit=0.5, output_limit=50.0 + 20 * i)
+        for i in range(6)
+    ]
+
+class TestVectorizedPIDController:
+    def test_matches_per_joint(self, gains_list):
+        reference = MultiJointPIDController(gains_list)
+        vectorized = VectorizedPIDController(gains_list)
+        rng = np.random.default_rng(0)
+        out = np.empty(6)
+        for _ in range(500):
+            targets, actuals = rng.normal(size=6), rng.normal(size=6)
+            vel, acc = rng.normal(size=6), rng.normal(size=6)
+            expected = reference.compute(targets, actuals, 0.001, vel, acc)
+            result = vectorized.compute(targets, actuals, 0.001, vel, acc, out=out)
+            assert result is out
+            np.testing.assert_array_equal(result, expected)
+
+    def test_matches_without_feedforward(self, gains_list):
+        reference = MultiJointPIDController(gains_list)
+        vectorized = VectorizedPIDController(gains_list)
+        targets, actuals = np.full(6, 0.2), np.zeros(6)
+        for _ in range(50):
+            np.testing.assert_array_equal(
+                vectorized.compute(targets, actuals, 0.004),
+                reference.compute(targets, actuals, 0.004),
+            )
+
+    def test_reset(self, gains_list):
+        controller = VectorizedPIDController(gains_list)
+        targets, actuals = np.ones(6), np.zeros(6)
+        first = controller.compute(targets, actuals, 0.001).copy()
+        controller.compute(targets, actuals, 0.001)
+        controller.reset()
+        np.testing.assert_array_equal(controller.compute(targets, actuals, 0.001), first)
+
+    def test_set_gains_length(self, gains_list):
+        controller = VectorizedPIDController(gains_list)
+        with pytest.raises(ValueError):
+            controller.set_gains(gains_list[:3])
+
+class TestDerivativeAndAntiWindup:
+    def test_mixed_modes_match_per_joint(self, gains_list):
+        gains_list[0].derivative_on_measurement = True
+        gains_list[1].derivative_filter = DerivativeFilter.FIRST_ORDER
+        gains_list[2].derivative_filter = DerivativeFilter.BIQUAD
+        gains_list[2].derivative_on_measurement = True
+        gains_list[3].anti_windup = AntiWindup.BACK_CALCULATION
+        gains_list[4].anti_windup = AntiWindup.BACK_CALCULATION
+        gains_list[4].tracking_gain = 20.0
+        gains_list[4].derivative_filter = DerivativeFilter.BIQUAD
+        reference = MultiJointPIDController(gains_list)
+        vectorized = VectorizedPIDController(gains_list)
+        rng = np.random.default_rng(1)
+        out = np.empty(6)
+        for _ in range(500):
+            targets, actuals = rng.normal(size=6), rng.normal(size=6)
+            expected = reference.compute(targets, actuals, 0.001)
+            np.testing.assert_array_equal(
+                vectorized.compute(targets, actuals, 0.001, out=out), expected
+            )
+
+    def test_measurement_mode_has_no_setpoint_kick(self):
+        controller = PIDController(PIDGains(kp=0.0, ki=0.0, kd=1.0, derivative_on_measurement=True))
+        controller.compute(0.0, 0.0, 0.001)
+        assert controller.compute(1.0, 0.0, 0.001) == 0.0
+
+    @pytest.mark.parametrize("kind", [DerivativeFilter.FIRST_ORDER, DerivativeFilter.BIQUAD])
+    def test_filter_attenuates_noise(self, kind):
+        raw = PIDController(PIDGains(kp=0.0, ki=0.0, kd=1.0))
+        filtered = PIDController(PIDGains(kp=0.0, ki=0.0, kd=1.0, derivative_filter=kind,
+                                          derivative_cutoff_hz=50.0))
+        noise = np.random.default_rng(2).normal(scale=1e-4, size=2000)
+        raw_out = [raw.compute(0.0, n, 0.001) for n in noise]
+        filtered_out = [filtered.compute(0.0, n, 0.001) for n in noise]
+        assert np.std(filtered_out[100:]) < 0.5 * np.std(raw_out[100:])
+
+    def test_filter_passes_constant_rate(self):
+        controller = PIDController(PIDGains(kp=0.0, ki=0.0, kd=1.0,
+                                            derivative_filter=DerivativeFilter.BIQUAD,
+                                            derivative_cutoff_hz=50.0))
+        outputs = [controller.compute(0.5 * k * 0.001, 0.0, 0.001) for k in range(1, 500)]
+        assert outputs[-1] == pytest.approx(0.5, rel=1e-6)
+
+    def test_back_calculation_recovers_faster(self):
+        def first_output_after_reversal(anti_windup):
+            controller = PIDController(PIDGains(kp=10.0, ki=50.0, kd=0.0, integral_limit=1e9,
+                                                output_limit=1.0, anti_windup=anti_windup))
+            for _ in range(2000):
+                controller.compute(1.0, 0.0, 0.001)
+            # After the error reverses, a wound-up integral holds the output saturated
+            return controller.compute(-0.05, 0.0, 0.001)
+        assert first_output_after_reversal(AntiWindup.CLAMP) == 1.0
+        assert first_output_after_reversal(AntiWindup.BACK_CALCULATION) < 0.6
+
+    def test_load_pid_gains(self):
+        gains_list = load_pid_gains("config/control/pid_gains.yaml")
+        assert len(gains_list) == 6
+        assert gains_list[0].derivative_filter == DerivativeFilter.NONE
+        assert gains_list[0].anti_windup == AntiWindup.CLAMP
+        assert not gains_list[0].derivative_on_measurement
+        VectorizedPIDController(gains_list).compute(np.ones(6), np.zeros(6), 0.001)
@@ -0,0 +1,81 @@
+"""Unit tests for realtime controller module."""
+import numpy as np
+from src.control.dynamics import RigidBodyDynamics
+from src.control.feedforward import DynamicsParams, FeedforwardCompensator
+from src.control.realtime_controller import RealtimeController
+from src.control.trajectory_planner import TrajectoryLimits, TrajectoryPlanner
+
+class TestSetpointStream:
+    def test_pulls_one_point_per_tick(self):
+        planner = TrajectoryPlanner(TrajectoryLimits(np.ones(6), np.ones(6)))
+        controller = RealtimeController()
+        controller.set_trajectory(
+            planner.stream_point_to_point(np.zeros(6), np.full(6, 0.1), duration=0.002)
+        )
+
+        positions = []
+        for _ in range(5):
+            controller._receive_setpoint()
+            if controller._setpoint_stream is not None:
+                controller._advance_setpoint()
+            positions.append(controller._target_joints.copy())
+
+        assert np.allclose(positions[0], 0.0)
+        assert np.allclose(positions[2], 0.1)
+        # Final setpoint is held once the stream is exhausted
+        assert np.allclose(positions[-1], 0.1)
+        assert controller._target_velocity is None
+
+    def test_set_target_cancels_stream(self):
+        planner = TrajectoryPlanner(TrajectoryLimits(np.ones(6), np.ones(6)))
+        controller = RealtimeController()
+        controller.set_trajectory(planner.plan_point_to_point(np.zeros(6), np.ones(6)))
+        controller.set_target(np.full(6, 0.5))
+        controller._receive_setpoint()
+        assert controller._setpoint_stream is None
+        assert np.allclose(controller._target_joints, 0.5)
+
+    def test_earlier_target_does_not_cancel_stream(self):
+        planner = TrajectoryPlanner(TrajectoryLimits(np.ones(6), np.ones(6)))
+        controller = RealtimeController()
+        controller.set_target(np.full(6, 0.5))
+        controller.set_trajectory(planner.plan_point_to_point(np.zeros(6), np.ones(6)))
+        controller._receive_setpoint()
+        assert controller._setpoint_stream is not None
+
+    def test_loop_adopts_new_trajectory(self):
+        planner = TrajectoryPlanner(TrajectoryLimits(np.ones(6), np.ones(6)))
+        controller = RealtimeController()
+        controller.set_trajectory(planner.plan_point_to_point(np.zeros(6), np.ones(6)))
+        # The caller only parks the trajectory; the loop switches streams
+        assert controller._setpoint_stream is None
+        controller._receive_setpoint()
+        controller._advance_setpoint()
+        first = controller._setpoint_stream
+
+        controller.set_trajectory(planner.plan_point_to_point(np.full(6, 2.0), np.full(6, 2.5)))
+        assert controller._setpoint_stream is first
+        controller._receive_setpoint()
+        controller._advance_setpoint()
+        assert controller._setpoint_stream is not first
+        assert np.allclose(controller._target_joints, 2.0)
+        assert controller._pending_trajectory is None
+
+    def test_indexes_precomputed_torque(self):
+        params = DynamicsParams(np.ones(6), np.zeros(6), np.zeros(6))
+        compensator = FeedforwardCompensator(params, dynamics=RigidBodyDynamics())
+        limits = TrajectoryLimits(np.ones(6), np.ones(6))
+        planner = TrajectoryPlanner(limits, feedforward=compensator)
+        trajectory = planner.plan_point_to_point(np.zeros(6), np.full(6, 0.2))
+
+        # A payload change after planning makes the table stale
+        compensator.set_payload(100.0)
+        controller = RealtimeController(feedforward=compensator)
+        controller.set_trajectory(trajectory)
+        assert trajectory.feedforward_key == compensator.cache_key
+
+        controller._receive_setpoint()
+        controller._advance_setpoint()
+        expected = compensator.compute(trajectory.position[0], trajectory.velocity[0],
+                                       trajectory.acceleration[0])
+        np.testing.assert_allclose(controller._target_torque, expected)
@@ -1,7 +1,9 @@
 """Unit tests for safety module."""
 import pytest
 import numpy as np
-from src.safety.safety_monitor import SafetyMonitor, SafetyLimits, SafetyState
+from src.safety.safety_monitor import (
+    CommandViolation, SafetyMonitor, SafetyLimits, SafetyState
+)
 from src.safety.limit_checker import LimitChecker, JointLimits
 
 class TestSafetyMonitor:
@@ -29,6 +31,95 @@ class TestSafetyMonitor:
         assert not is_valid
         assert len(violations) > 0
 
+    def test_check_command_bitmask(self, safety_limits):
+        monitor = SafetyMonitor(safety_limits)
+        assert monitor.check_command(np.zeros(6), np.zeros(6), np.zeros(6)) == 0
+        mask = monitor.check_command(
+            np.array([0, -3.0, 0, 0, 0, 0]),
+            target_torque=np.array([0, 0, 0, 0, 0, -150.0])
+        )
+        assert mask == CommandViolation.POSITION_MIN | CommandViolation.TORQUE
+        # The fast path never changes state
+        assert monitor.state == SafetyState.SAFE
+        violations = monitor.command_violations()
+        assert [(v.type, v.joint_index) for v in violations] == [("position_min", 1), ("torque", 5)]
+        # Reported values keep the sign of the command
+        assert violations[1].value == -150.0
+
+    def test_validate_command_reports_each_limit(self, safety_limits):
+        monitor = SafetyMonitor(safety_limits)
+        is_valid, violations = monitor.validate_command(
+            np.array([3.5, 0, 0, 0, 0, 0]), target_velocity=np.array([0, 0, 2.5, 0, 0, 0])
+        )
+        assert not is_valid
+        assert {v.type for v in violations} == {"position_max", "velocity"}
+        assert monitor.state == SafetyState.FAULT
+        assert "above maximum" in violations[0].message
+        monitor.validate_command(np.zeros(6), target_velocity=np.array([0, -2.0, 0, 0, 0, 0]))
+        assert monitor.command_violations()[0].value == -2.0
+
+    def test_validate_trajectory_first_violation(self, safety_limits):
+        monitor = SafetyMonitor(safety_limits)
+        n = 1000
+        position = np.zeros((n, 6))
+        velocity = np.zeros((n, 6))
+        acceleration = np.zeros((n, 6))
+        assert monitor.validate_trajectory(position, velocity, acceleration, dt=0.001)
+
+        velocity[600:650, 2] = 2.5
+        position[700:, 0] = 3.5
+        result = monitor.validate_trajectory(position, velocity, acceleration, dt=0.001)
+        assert not result.is_valid
+        assert result.first_index == 600
+        assert [v.type for v in result.violations] == ["velocity", "position"]
+        velocity_summary = result.violations[0]
+        assert (velocity_summary.count, velocity_summary.joint_index) == (50, 2)
+        assert velocity_summary.worst_ratio == pytest.approx(2.5 / 1.96)
+        # Validation does not fault the monitor
+        assert monitor.state == SafetyState.SAFE
+
+    def test_validate_trajectory_jerk(self, safety_limits):
+        monitor = SafetyMonitor(safety_limits)
+        time = np.arange(100) * 0.001
+        acceleration = np.zeros((100, 6))
+        acceleration[50:, 4] = 2.0  # Step of 2 rad/s² in 1 ms = 2000 rad/s³
+        result = monitor.validate_trajectory(np.zeros((100, 6)), acceleration=acceleration,
+                                             time=time)
+        assert result.first_index == 50
+        assert result.violations[0].type == "jerk"
+        assert result.violations[0].joint_index == 4
+        # Accelerations without timing would leave jerk unchecked
+        with pytest.raises(ValueError):
+            monitor.validate_trajectory(np.zeros((100, 6)), acceleration=acceleration)
+
+    def test_predictive_braking(self, safety_limits):
+        monitor = SafetyMonitor(safety_limits)
+        velocity = np.array([1.8, 0, 0, 0, 0, 0])
+        torque = np.zeros(6)
+        position = np.zeros(6)
+        # Joint 0 brakes at 8 rad/s²: stops ~0.21 rad later, ~0.41 rad at half decel
+        position[0] = 2.5
+        assert monitor.check_runtime(position, velocity, torque) == SafetyState.SAFE
+        position[0] = 2.8
+        assert monitor.check_runtime(position, velocity, torque) == SafetyState.WARNING
+        position[0] = 3.0
+        assert monitor.check_runtime(position, velocity, torque) == SafetyState.FAULT
+        # Moving away from the limit is fine
+        assert monitor.check_runtime(position, -velocity, torque) == SafetyState.SAFE
+
+    def test_predictive_braking_workspace(self, safety_limits):
+        safety_limits.workspace_min = np.array([-2500.0, -2500.0, 0.0])
+        safety_limits.workspace_max = np.array([2500.0, 2500.0, 3000.0])
+        monitor = SafetyMonitor(safety_limits, {"workspace_deceleration": 5000.0})
+        zeros = np.zeros(6)
+        tcp = np.array([1500.0, 0.0, 1000.0])
+        tcp_velocity = np.array([2000.0, 0.0, 0.0])  # Stops 400 mm later
+        state = monitor.check_runtime(zeros, zeros, zeros, tcp, tcp_velocity)
+        assert state == SafetyState.SAFE
+        tcp[0] = 2300.0
+        state = monitor.check_runtime(zeros, zeros, zeros, tcp, tcp_velocity)
+        assert state == SafetyState.FAULT
+
     def test_estop_trigger(self, safety_limits):
         monitor = SafetyMonitor(safety_limits)
         monitor.trigger_estop("Test")
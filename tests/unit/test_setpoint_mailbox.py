@@ -0,0 +1,83 @@
+"""Unit tests for setpoint mailbox module."""
+import threading
+import pytest
+import numpy as np
+from src.control.realtime_controller import RealtimeController
+from src.control.setpoint_mailbox import HAS_TORQUE, HAS_VELOCITY, SetpointMailbox
+
+class TestSetpointMailbox:
+    def test_read_returns_latest_once(self):
+        mailbox = SetpointMailbox()
+        assert not mailbox.read()
+        mailbox.write(np.ones(6), velocity=np.full(6, 2.0), timestamp=1.5)
+        mailbox.write(np.full(6, 3.0), torque_ff=np.full(6, 4.0), timestamp=2.5)
+        assert mailbox.read()
+        snapshot = mailbox.snapshot
+        np.testing.assert_array_equal(snapshot["position"], 3.0)
+        np.testing.assert_array_equal(snapshot["velocity"], 0.0)
+        np.testing.assert_array_equal(snapshot["torque_ff"], 4.0)
+        assert snapshot["timestamp"] == 2.5
+        assert snapshot["fields"] == HAS_TORQUE
+        assert not mailbox.read()
+
+    def test_bad_shape_does_not_block_later_writes(self):
+        mailbox = SetpointMailbox(num_joints=6)
+        with pytest.raises(ValueError):
+            mailbox.write(np.zeros(5))
+        with pytest.raises(ValueError):
+            mailbox.write(np.zeros(6), torque_ff=np.zeros(7))
+        assert mailbox.sequence == 0
+        assert mailbox.write(np.ones(6)) == 2
+        assert mailbox.read()
+        np.testing.assert_array_equal(mailbox.snapshot["position"], 1.0)
+
+    def test_snapshot_views_survive_next_write(self):
+        mailbox = SetpointMailbox()
+        mailbox.write(np.ones(6), velocity=np.ones(6))
+        mailbox.read()
+        position = mailbox.snapshot["position"]
+        assert mailbox.snapshot["fields"] == HAS_VELOCITY
+        mailbox.write(np.full(6, 7.0))
+        np.testing.assert_array_equal(position, 1.0)
+
+    def test_fast_writer_never_tears(self):
+        mailbox = SetpointMailbox()
+        stop = threading.Event()
+
+        def writer():
+            k = 0
+            while not stop.is_set():
+                k += 1
+                value = np.full(6, float(k))
+                mailbox.write(value, value, value, value, timestamp=float(k))
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        accepted = 0
+        last = 0.0
+        try:
+            for _ in range(20000):
+                if mailbox.read():
+                    accepted += 1
+                    s = mailbox.snapshot
+                    k = s["timestamp"]
+                    # Every part of a setpoint comes from the same write
+                    for name in ("position", "velocity", "acceleration", "torque_ff"):
+                        np.testing.assert_array_equal(s[name], k)
+                    assert k > last
+                    last = k
+        finally:
+            stop.set()
+            thread.join()
+        assert accepted > 0
+
+class TestControllerSetpoints:
+    def test_set_setpoint_reaches_loop(self):
+        controller = RealtimeController()
+        controller.set_setpoint(np.ones(6), velocity=np.full(6, 0.5),
+                                torque_ff=np.full(6, 3.0))
+        controller._receive_setpoint()
+        np.testing.assert_array_equal(controller._target_joints, 1.0)
+        np.testing.assert_array_equal(controller._target_velocity, 0.5)
+        assert controller._target_acceleration is None
+        np.testing.assert_array_equal(controller._target_torque, 3.0)
@@ -0,0 +1,46 @@
+"""Unit tests for state history module."""
+import pytest
+import numpy as np
+from src.control.realtime_controller import RealtimeController
+from src.control.state_history import StateHistory
+
+@pytest.fixture
+def history():
+    history = StateHistory(num_joints=2, capacity=4)
+    for k in range(6):
+        history.push(np.full(2, k), np.full(2, -k), np.zeros(2), timestamp=0.001 * k)
+    return history
+
+class TestStateHistory:
+    def test_latest(self, history):
+        assert history.latest()["positions"][0] == 5
+        assert StateHistory().latest() is None
+
+    def test_last_is_contiguous_view_across_wrap(self, history):
+        recent = history.last(3)
+        np.testing.assert_array_equal(recent["positions"][:, 0], [3, 4, 5])
+        np.testing.assert_allclose(recent["timestamp"], [0.003, 0.004, 0.005])
+        assert np.shares_memory(recent, history._buffer)
+        # Never more than capacity - 1 rows
+        assert len(history.last(10)) == 3
+
+    def test_begin_commit_in_place(self, history):
+        row = history.begin()
+        row["positions"] = 9.0
+        assert history.latest()["positions"][0] == 5
+        history.commit()
+        assert history.latest()["positions"][0] == 9
+        np.testing.assert_array_equal(history.last(2)["positions"][:, 1], [5, 9])
+
+class TestControllerStates:
+    def test_get_state_returns_views(self):
+        controller = RealtimeController()
+        row = controller.state_history.begin()
+        row["positions"] = np.arange(6)
+        row["timestamp"] = 1.0
+        controller.state_history.commit()
+        state = controller.get_state()
+        np.testing.assert_array_equal(state.positions, np.arange(6))
+        assert state.timestamp == 1.0
+        assert np.shares_memory(state.positions, controller.state_history._buffer)
+        assert len(controller.get_recent_states(10)) == 1
@@ -0,0 +1,223 @@
+"""Unit tests for trajectory planner module."""
+import pytest
+import numpy as np
+from src.control.dynamics import RigidBodyDynamics
+from src.control.feedforward import DynamicsParams, FeedforwardCompensator
+from src.control.trajectory_planner import (
+    ProfileType, SplineType, Trajectory, TrajectoryLimits, TrajectoryPlanner, TrajectoryPoint
+)
+
+@pytest.fixture
+def limits():
+    return TrajectoryLimits(
+        max_velocity=np.array([1.96, 1.57, 1.96, 3.49, 3.49, 5.24]),
+        max_acceleration=np.array([8.0, 6.0, 8.0, 12.0, 12.0, 16.0]),
+        max_jerk=np.array([40.0, 30.0, 40.0, 60.0, 60.0, 80.0]),
+    )
+
+@pytest.fixture
+def planner(limits):
+    return TrajectoryPlanner(limits)
+
+class TestTrajectory:
+    def test_point_to_point_arrays(self, planner, sample_joint_positions):
+        traj = planner.plan_point_to_point(np.zeros(6), sample_joint_positions)
+        assert isinstance(traj, Trajectory)
+        assert traj.position.shape == (len(traj), 6)
+        assert np.allclose(traj.position[0], 0.0)
+        assert np.allclose(traj.time[1] - traj.time[0], 0.001)
+
+    def test_sequence_compatibility(self, planner, sample_joint_positions):
+        traj = planner.plan_point_to_point(np.zeros(6), sample_joint_positions, duration=0.5)
+        assert len(traj) == 501
+        point = traj[10]
+        assert isinstance(point, TrajectoryPoint)
+        assert point.time == pytest.approx(0.01)
+        assert np.allclose(point.position, traj.position[10])
+
+        points = traj.to_points()
+        assert len(points) == len(traj)
+        assert all(isinstance(p, TrajectoryPoint) for p in traj)
+
+    def test_slice_is_view(self, planner, sample_joint_positions):
+        traj = planner.plan_point_to_point(np.zeros(6), sample_joint_positions, duration=0.5)
+        part = traj[100:200]
+        assert isinstance(part, Trajectory)
+        assert len(part) == 100
+        assert np.shares_memory(part.position, traj.position)
+
+    def test_waypoints_concatenate(self, planner):
+        waypoints = [np.zeros(6), np.full(6, 0.1), np.full(6, 0.3)]
+        traj = planner.plan_waypoints(waypoints, segment_durations=[0.2, 0.3])
+        assert len(traj) == 201 + 300
+        assert np.all(np.diff(traj.time) > 0)
+        assert traj.duration == pytest.approx(0.5)
+        assert np.allclose(traj.position[0], waypoints[0])
+        assert np.allclose(traj.position[-1], waypoints[-1])
+
+class TestTimeOptimalProfiles:
+    @pytest.fixture
+    def end(self):
+        return np.array([2.0, -1.0, 0.6, 4.0, 0.2, -2.0])
+
+    def _ratios(self, traj, limits):
+        vel = np.max(np.abs(traj.velocity) / limits.max_velocity)
+        acc = np.max(np.abs(traj.acceleration) / limits.max_acceleration)
+        jerk = np.max(np.abs(np.diff(traj.acceleration, axis=0)) / 0.001 / limits.max_jerk)
+        return vel, acc, jerk
+
+    def test_trapezoidal_reaches_limits(self, limits, end):
+        planner = TrajectoryPlanner(limits, profile=ProfileType.TRAPEZOIDAL)
+        traj = planner.plan_point_to_point(np.zeros(6), end)
+        vel, acc, _ = self._ratios(traj, limits)
+        assert vel == pytest.approx(1.0, abs=1e-6)
+        assert acc == pytest.approx(1.0, abs=1e-6)
+        assert np.allclose(traj.position[-1], end)
+        assert np.allclose(traj.velocity[-1], 0.0)
+
+    def test_s_curve_respects_jerk(self, limits, end):
+        planner = TrajectoryPlanner(limits, profile=ProfileType.S_CURVE)
+        traj = planner.plan_point_to_point(np.zeros(6), end)
+        vel, acc, jerk = self._ratios(traj, limits)
+        assert vel <= 1.0 + 1e-6
+        assert acc <= 1.0 + 1e-6
+        assert jerk <= 1.0 + 1e-6
+        assert np.allclose(traj.position[-1], end)
+
+    def test_short_move(self, limits):
+        planner = TrajectoryPlanner(limits, profile=ProfileType.S_CURVE)
+        end = np.full(6, 0.01)
+        traj = planner.plan_point_to_point(np.zeros(6), end)
+        _, _, jerk = self._ratios(traj, limits)
+        assert jerk <= 1.0 + 1e-6
+        assert np.allclose(traj.position[-1], end)
+
+    def test_longer_duration_stretches(self, limits, end):
+        planner = TrajectoryPlanner(limits, profile=ProfileType.S_CURVE)
+        fastest = planner.plan_point_to_point(np.zeros(6), end)
+        slower = planner.plan_point_to_point(np.zeros(6), end, duration=2 * fastest.duration)
+        assert slower.duration >= 2 * fastest.duration - 0.001
+        assert np.allclose(slower.position[-1], end)
+
+    def test_s_curve_requires_jerk_limit(self):
+        limits = TrajectoryLimits(np.ones(6), np.ones(6))
+        with pytest.raises(ValueError):
+            TrajectoryPlanner(limits, profile=ProfileType.S_CURVE)
+
+    def test_no_motion(self, limits):
+        planner = TrajectoryPlanner(limits, profile=ProfileType.TRAPEZOIDAL)
+        traj = planner.plan_point_to_point(np.ones(6), np.ones(6))
+        assert len(traj) == 1
+
+class TestStreaming:
+    @pytest.mark.parametrize("profile", list(ProfileType))
+    def test_stream_matches_plan(self, limits, profile):
+        planner = TrajectoryPlanner(limits, profile=profile)
+        waypoints = [np.zeros(6), np.full(6, 0.2), np.array([0.3, 0.1, -0.2, 0.5, 0.0, 0.4])]
+
+        planned = planner.plan_waypoints(waypoints)
+        streamed = list(planner.stream_waypoints(waypoints))
+        assert len(streamed) == len(planned)
+        assert np.allclose([p.time for p in streamed], planned.time)
+        assert np.allclose([p.position for p in streamed], planned.position)
+        assert np.allclose([p.velocity for p in streamed], planned.velocity)
+        assert np.allclose([p.acceleration for p in streamed], planned.acceleration)
+
+    def test_first_setpoint_is_lazy(self, planner):
+        stream = planner.stream_point_to_point(np.zeros(6), np.full(6, 100.0))
+        first = next(stream)
+        assert first.time == 0.0
+        assert np.allclose(first.position, 0.0)
+
+class TestSplineBlending:
+    @pytest.fixture
+    def waypoints(self):
+        return [
+            np.zeros(6),
+            np.array([0.5, 0.2, -0.3, 1.0, 0.2, 0.5]),
+            np.array([1.0, 0.5, -0.1, 1.5, 0.1, 0.9]),
+            np.array([1.2, 0.2, 0.3, 1.0, 0.0, 0.0]),
+        ]
+
+    @pytest.mark.parametrize("spline", list(SplineType))
+    def test_passes_through_waypoints_within_limits(self, limits, waypoints, spline):
+        planner = TrajectoryPlanner(limits)
+        traj = planner.plan_spline(waypoints, spline=spline)
+
+        for wp in waypoints:
+            assert np.min(np.linalg.norm(traj.position - wp, axis=1)) < 0.01
+        assert np.allclose(traj.position[-1], waypoints[-1])
+        assert np.allclose(traj.velocity[[0, -1]], 0.0)
+        assert np.all(np.abs(traj.velocity) <= limits.max_velocity + 1e-9)
+        assert np.all(np.abs(traj.acceleration) <= limits.max_acceleration + 1e-9)
+
+    def test_does_not_stop_at_interior_waypoints(self, limits, waypoints):
+        planner = TrajectoryPlanner(limits)
+        traj = planner.plan_spline(waypoints)
+        speed = np.linalg.norm(traj.velocity, axis=1)
+        assert np.all(speed[1:-1] > 0)
+
+    def test_rebalancing_never_worse_than_initial(self, limits):
+        # Reversing path on which rebalancing made the quintic fit oscillate
+        waypoints = list(np.array([
+            [-0.98, -0.27, -0.84, 0.31, -0.45, 0.41],
+            [0.89, -0.75, 0.73, -0.88, -0.24, -0.14],
+            [-0.02, 0.95, 0.55, -0.38, -0.46, 0.73],
+            [0.76, 0.02, -0.31, 0.99, -0.37, -0.63],
+            [0.76, 0.62, 0.34, 0.92, 0.85, 0.5],
+        ]))
+        planner = TrajectoryPlanner(limits)
+        refined = planner.plan_spline(waypoints, spline=SplineType.QUINTIC)
+        initial = planner.plan_spline(waypoints, spline=SplineType.QUINTIC, refine_iterations=0)
+        assert refined.duration <= initial.duration
+        assert refined.duration < 10.0
+
+    def test_faster_than_stopping(self, limits, waypoints):
+        blended = TrajectoryPlanner(limits).plan_spline(waypoints, spline=SplineType.QUINTIC)
+        stopping = TrajectoryPlanner(limits, profile=ProfileType.S_CURVE).plan_waypoints(waypoints)
+        assert blended.duration < stopping.duration
+
+@pytest.fixture
+def compensator():
+    params = DynamicsParams(inertia=np.ones(6), friction_coulomb=np.full(6, 5.0),
+                            friction_viscous=np.full(6, 2.0))
+    return FeedforwardCompensator(params, dynamics=RigidBodyDynamics())
+
+class TestFeedforwardTables:
+    def test_point_to_point_table(self, limits, compensator):
+        planner = TrajectoryPlanner(limits, profile=ProfileType.S_CURVE, feedforward=compensator)
+        trajectory = planner.plan_point_to_point(np.zeros(6), np.full(6, 0.5))
+        assert trajectory.torque.shape == trajectory.position.shape
+        assert trajectory.feedforward_key == compensator.cache_key
+        for k in (0, len(trajectory) // 3, len(trajectory) - 1):
+            point = trajectory[k]
+            expected = compensator.compute(point.position, point.velocity, point.acceleration)
+            np.testing.assert_allclose(point.torque, expected)
+
+    def test_waypoints_and_spline_tables(self, limits, compensator):
+        planner = TrajectoryPlanner(limits, feedforward=compensator)
+        waypoints = [np.zeros(6), np.full(6, 0.3), np.full(6, -0.2)]
+        for trajectory in (planner.plan_waypoints(waypoints), planner.plan_spline(waypoints)):
+            assert trajectory.torque.shape == trajectory.position.shape
+            assert trajectory[5:20].torque.shape == (15, 6)
+
+    def test_no_table_without_compensator(self, planner):
+        trajectory = planner.plan_point_to_point(np.zeros(6), np.ones(6))
+        assert trajectory.torque is None
+        assert trajectory[0].torque is None
+
+    def test_invalidation(self, limits, compensator):
+        planner = TrajectoryPlanner(limits, feedforward=compensator)
+        trajectory = planner.plan_point_to_point(np.zeros(6), np.full(6, 0.5))
+        assert not compensator.ensure_current(trajectory)
+
+        before = trajectory.torque.copy()
+        compensator.set_payload(150.0, np.array([0.0, 0.0, 0.2]))
+        assert compensator.ensure_current(trajectory)
+        assert not np.allclose(trajectory.torque, before)
+        assert not compensator.ensure_current(trajectory)
+
+        compensator.params = DynamicsParams(np.ones(6), np.zeros(6), np.zeros(6))
+        assert compensator.ensure_current(trajectory)
+        compensator.invalidate()
+        assert compensator.ensure_current(trajectory)
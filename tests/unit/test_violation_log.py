@@ -0,0 +1,63 @@
+"""Unit tests for violation log module."""
+import pytest
+import numpy as np
+from src.safety.safety_monitor import SafetyLimits, SafetyMonitor
+from src.safety.violation_log import SafetyViolation, ViolationLog
+
+def _violation(kind, joint, timestamp):
+    return SafetyViolation(kind, joint, 1.0, 0.5, timestamp, f"{kind} on {joint}")
+
+class TestViolationLog:
+    def test_bounded_with_all_time_counts(self):
+        log = ViolationLog(capacity=4)
+        for k in range(10):
+            log.append(_violation("velocity" if k % 2 else "torque", k % 3, float(k)))
+        assert len(log) == 4
+        assert log.total == 10
+        assert log.counts == {"torque": 5, "velocity": 5}
+        assert [v.timestamp for v in log] == [6.0, 7.0, 8.0, 9.0]
+        assert log.last(1)[0].message == "velocity on 0"
+
+    def test_indexing_like_a_list(self):
+        log = ViolationLog(capacity=4)
+        for k in range(6):
+            log.append(_violation("torque", k, float(k)))
+        assert log[-1].timestamp == 5.0
+        assert log[0].timestamp == 2.0
+        assert [v.joint_index for v in log[-2:]] == [4, 5]
+        with pytest.raises(IndexError):
+            log[4]
+        with pytest.raises(IndexError):
+            ViolationLog()[-1]
+
+    def test_query_filters(self):
+        log = ViolationLog(capacity=16)
+        log.append(_violation("torque", 1, 1.0))
+        log.append(_violation("velocity", 1, 2.0))
+        log.append(_violation("velocity", 2, 3.0))
+        log.append(_violation("estop", None, 4.0))
+        assert [v.timestamp for v in log.query(type="velocity")] == [2.0, 3.0]
+        assert [v.timestamp for v in log.query(joint_index=1)] == [1.0, 2.0]
+        assert [v.type for v in log.query(since=3.0)] == ["velocity", "estop"]
+        assert log.query(type="velocity", joint_index=1, since=2.5) == []
+        assert log.query(type="position_max") == []
+        assert log.query(limit=1)[0].joint_index is None
+
+class TestMonitorHistory:
+    def test_sustained_fault_is_bounded_and_rate_limited(self):
+        limits = SafetyLimits(np.full(6, -1.0), np.full(6, 1.0), np.ones(6), np.ones(6),
+                              np.ones(6))
+        monitor = SafetyMonitor(limits, {"violation_capacity": 100, "callback_interval_s": 10.0})
+        received = []
+        monitor.register_callback(received.append)
+        command = np.array([2.0, 0, 0, 0, 0, 0])
+        for _ in range(1000):
+            monitor.validate_command(command)
+        assert len(monitor.violations) == 100
+        assert monitor.violations.counts["position_max"] == 1000
+        assert len(received) == 1
+        assert monitor.suppressed_callbacks == 999
+        # E-stops are never suppressed
+        monitor.trigger_estop("a")
+        monitor.trigger_estop("b")
+        assert [v.type for v in received[1:]] == ["estop", "estop"]